@@ -0,0 +1,289 @@
+"""
+Module admission - Contrôle d'admission et contre-pression
+
+En surcharge, un serveur qui accepte toutes les requêtes les met en file sans
+limite : la latence de tous les clients explose. Ce module borne le travail
+accepté pour que les requêtes admises gardent une latence maîtrisée :
+
+    ConcurrencyLimiter       - Au plus max_concurrent évaluations simultanées
+                               (threads) ; les suivantes attendent dans une file
+                               bornée (max_queue) pendant au plus queue_timeout
+    AsyncConcurrencyLimiter  - Même politique pour les coroutines (asgi.py)
+    TokenBuckets             - Limite de débit par client (seau à jetons)
+
+Le rejet est rapide : une requête est refusée dès son arrivée (sans
+attendre) si la file est pleine ou si l'attente estimée, d'après la durée
+moyenne des évaluations récentes, dépasse queue_timeout. Chaque rejet porte
+le statut HTTP à renvoyer (503, ou 429 pour la limite de débit) et un délai
+Retry-After en secondes.
+
+asyncio n'est importé que par AsyncConcurrencyLimiter.acquire() : app.py
+importe ce module, et asyncio allongerait le démarrage de chaque processus
+qui n'utilise pas le serveur ASGI.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class Rejected(Exception):
+    """
+    Requête refusée par le contrôle d'admission.
+
+    Attributs:
+        status (int): Statut HTTP à renvoyer (503 ou 429)
+        retry_after (int): Délai conseillé avant un nouvel essai, en secondes
+    """
+
+    def __init__(self, message, status=503, retry_after=1.0):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class _Limiter:
+    """Base commune des limiteurs : compteurs et estimation de l'attente."""
+
+    # Poids d'une nouvelle mesure dans la moyenne mobile de la durée de service
+    SMOOTHING = 0.2
+
+    def __init__(self, max_concurrent, max_queue, queue_timeout, clock):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self._active = 0
+        self._waiting = 0
+        self._service_time = 0.0
+        self.admitted = 0
+        self.queued = 0
+        self.shed_queue_full = 0
+        self.shed_overload = 0
+        self.timeouts = 0
+
+    def _shed(self):
+        """
+        Rejet immédiat d'une requête qui devrait attendre, si la file est
+        pleine ou si l'attente estimée dépasse queue_timeout (état verrouillé).
+        """
+        if self._waiting >= self.max_queue:
+            self.shed_queue_full += 1
+            raise Rejected("server overloaded: queue full", 503, self._estimate(self._waiting))
+        estimate = self._estimate(self._waiting + 1)
+        if estimate > self.queue_timeout:
+            self.shed_overload += 1
+            raise Rejected("server overloaded: expected wait too long", 503, estimate)
+
+    def _estimate(self, position):
+        """Attente estimée (secondes) de la position-ième requête de la file."""
+        return position * self._service_time / self.max_concurrent
+
+    def _finished(self, start):
+        """Met à jour la durée de service moyenne (état verrouillé)."""
+        self._active -= 1
+        elapsed = self._clock() - start
+        self._service_time += self.SMOOTHING * (elapsed - self._service_time)
+
+    def _timed_out(self):
+        self.timeouts += 1
+        return Rejected("server overloaded: queue timeout", 503, self.queue_timeout)
+
+    def stats(self):
+        """
+        Sorties:
+            dict: Occupation, limites et compteurs d'admission et de rejet
+        """
+        return {
+            'active': self._active,
+            'waiting': self._waiting,
+            'max_concurrent': self.max_concurrent,
+            'max_queue': self.max_queue,
+            'queue_timeout': self.queue_timeout,
+            'service_time': self._service_time,
+            'admitted': self.admitted,
+            'queued': self.queued,
+            'shed_queue_full': self.shed_queue_full,
+            'shed_overload': self.shed_overload,
+            'timeouts': self.timeouts,
+        }
+
+
+class ConcurrencyLimiter(_Limiter):
+    """
+    Limiteur de concurrence pour des threads, avec file d'attente bornée.
+
+    Attributs:
+        max_concurrent (int): Nombre maximal d'évaluations simultanées
+        max_queue (int): Nombre maximal de requêtes en attente
+        queue_timeout (float): Attente maximale dans la file, en secondes
+    """
+
+    def __init__(self, max_concurrent=8, max_queue=32, queue_timeout=0.25, clock=time.monotonic):
+        super().__init__(max_concurrent, max_queue, queue_timeout, clock)
+        self._condition = threading.Condition(threading.Lock())
+
+    def acquire(self):
+        """
+        Réserve une place d'évaluation, en attendant au plus queue_timeout.
+
+        Sorties:
+            float: Instant d'admission, à rendre à release()
+
+        Lève:
+            Rejected: Si la file est pleine, l'attente estimée trop longue ou
+                      le délai d'attente écoulé (503)
+        """
+        with self._condition:
+            if self._active >= self.max_concurrent:
+                self._shed()
+                self._waiting += 1
+                self.queued += 1
+                deadline = self._clock() + self.queue_timeout
+                try:
+                    while self._active >= self.max_concurrent:
+                        remaining = deadline - self._clock()
+                        if remaining <= 0:
+                            raise self._timed_out()
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._active += 1
+            self.admitted += 1
+            return self._clock()
+
+    def release(self, start):
+        """Libère la place réservée par acquire() et réveille une requête en attente."""
+        with self._condition:
+            self._finished(start)
+            self._condition.notify()
+
+    def stats(self):
+        with self._condition:
+            return super().stats()
+
+
+class AsyncConcurrencyLimiter(_Limiter):
+    """
+    Limiteur de concurrence pour les coroutines d'une boucle d'événements.
+
+    Même politique que ConcurrencyLimiter ; les requêtes en attente n'occupent
+    aucun thread. Les places libérées sont transmises dans l'ordre d'arrivée.
+    """
+
+    def __init__(self, max_concurrent=8, max_queue=32, queue_timeout=0.25, clock=time.monotonic):
+        super().__init__(max_concurrent, max_queue, queue_timeout, clock)
+        self._waiters = deque()
+
+    async def acquire(self):
+        """
+        Réserve une place d'évaluation (voir ConcurrencyLimiter.acquire()).
+
+        Sorties:
+            float: Instant d'admission, à rendre à release()
+
+        Lève:
+            Rejected: Mêmes cas que ConcurrencyLimiter.acquire()
+        """
+        if self._active < self.max_concurrent:
+            self._active += 1
+            self.admitted += 1
+            return self._clock()
+
+        import asyncio
+
+        self._shed()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._waiting += 1
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            # La place a pu être transmise au moment même de l'expiration
+            if not waiter.done() or waiter.cancelled():
+                raise self._timed_out()
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Place transmise à une requête annulée : elle passe à la suivante
+                self._active -= 1
+                self._wake()
+            raise
+        finally:
+            self._waiting -= 1
+        # release() a transmis sa place : _active est déjà compté
+        self.admitted += 1
+        return self._clock()
+
+    def release(self, start):
+        """Libère la place, ou la transmet à la première requête en attente."""
+        self._finished(start)
+        self._wake()
+
+    def _wake(self):
+        """Transmet une place libre à la première requête encore en attente."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._active += 1
+                waiter.set_result(None)
+                return
+
+
+class TokenBuckets:
+    """
+    Limite de débit par client : un seau de burst jetons par client, rempli
+    de rate jetons par seconde ; chaque requête consomme un jeton.
+
+    Le nombre de clients suivis est borné (max_clients) : au-delà, le seau du
+    client le moins récemment vu est oublié (il repartira plein).
+
+    Attributs:
+        rate (float): Jetons ajoutés par seconde
+        burst (float): Capacité du seau (rafale maximale)
+        limited (int): Nombre de requêtes refusées
+    """
+
+    def __init__(self, rate, burst=None, max_clients=10000, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.max_clients = max_clients
+        self._clock = clock
+        # Client -> [jetons, instant de la dernière mise à jour]
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.limited = 0
+
+    def take(self, client):
+        """
+        Consomme un jeton du seau du client.
+
+        Lève:
+            Rejected: Si le seau est vide (429), avec le délai avant le
+                      prochain jeton
+        """
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [self.burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] < 1.0:
+                self.limited += 1
+                raise Rejected("rate limit exceeded", 429, (1.0 - bucket[0]) / self.rate)
+            bucket[0] -= 1.0
+
+    def stats(self):
+        """
+        Sorties:
+            dict: Paramètres, nombre de clients suivis et de requêtes refusées
+        """
+        with self._lock:
+            return {'rate': self.rate, 'burst': self.burst, 'clients': len(self._buckets),
+                    'limited': self.limited}
@@ -6,6 +6,13 @@ des expressions arithmétiques avec un seul opérateur (+, -, *, /).
 
 Routes:
     / (GET, POST) - Affiche le formulaire de la calculatrice et traite les calculs
+    /api/calculate (POST) - Évalue une expression (JSON), pour le mode client
+    /api/batch (POST) - Évalue un lot d'expressions (JSON ou NDJSON)
+    /api/binary (POST) - Calculs en enregistrements binaires (voir protocol.py)
+    /api/session (POST, DELETE) - Calcul incrémental sur un accumulateur de session
+    /api/stats (GET) - Compteurs internes (cache des résultats)
+    /metrics (GET) - Métriques au format Prometheus (si METRICS_ENABLED)
+    /api/profile (GET) - Piles du profileur par échantillonnage (si PROFILING_ENABLED)
 
 Fonctionnalités:
     - Interface web avec boutons cliquables pour saisir les expressions
@@ -14,11 +21,200 @@ Fonctionnalités:
     - Support des quatre opérations de base (voir operators.py)
 """
 
-from flask import Flask, request, render_template
+import json
+import math
+import mimetypes
+import os
+import re
+import sys
+from functools import partial
+from time import perf_counter
+
+from flask import (Flask, Response, g, request, render_template, jsonify, make_response,
+                   send_from_directory)
+from jinja2 import FileSystemBytecodeCache
 from operators import add, subtract, multiply, divide
+from cache import ResultCache, normalize
+from rendering import PageRenderer
+from backends import make_backends
+from guard import ResultTooLarge, budget_scope, check_budget
+from metrics import Registry
+from profiler import SamplingProfiler
+from precompute import PrecomputedTable
+from singleflight import SingleFlight
+from sessions import SessionExpired, SessionStore
+from admission import ConcurrencyLimiter, Rejected, TokenBuckets
+from assets import IMMUTABLE_MAX_AGE, StaticAssets, gzip_compress, gzip_constant, negotiate
+from protocol import (MIMETYPE as BINARY_MIMETYPE, REQUEST as BINARY_REQUEST, ProtocolError,
+                      evaluate_records)
 
 app = Flask(__name__)
 
+# Limites de l'API de traitement par lots (modifiables via app.config)
+app.config.setdefault('BATCH_MAX_ITEMS', 10000)
+app.config.setdefault('BATCH_MAX_BYTES', 1024 * 1024)
+
+# Cache des résultats placé devant calculate() (voir cache.py)
+app.config.setdefault('RESULT_CACHE_ENABLED', True)
+app.config.setdefault('RESULT_CACHE_SIZE', 1024)
+app.config.setdefault('RESULT_CACHE_TTL', 300.0)
+
+result_cache = ResultCache(
+    maxsize=app.config['RESULT_CACHE_SIZE'],
+    ttl=app.config['RESULT_CACHE_TTL'],
+)
+
+# Regroupement des calculs identiques simultanés (voir singleflight.py) :
+# les requêtes qui arrivent pendant le calcul d'une même expression normalisée
+# attendent son résultat au lieu de le refaire
+app.config.setdefault('SINGLE_FLIGHT_ENABLED', True)
+
+single_flight = SingleFlight()
+
+# Mode session (route /api/session, voir sessions.py) : accumulateur par
+# client conservé côté serveur, identifié par le cookie SESSION_COOKIE.
+# Le magasin est borné en nombre de sessions et en durée d'inactivité.
+app.config.setdefault('SESSION_MAX_COUNT', 10000)
+app.config.setdefault('SESSION_IDLE_TTL', 1800.0)
+app.config.setdefault('SESSION_COOKIE', 'calc_session')
+
+session_store = SessionStore(
+    max_sessions=app.config['SESSION_MAX_COUNT'],
+    idle_ttl=app.config['SESSION_IDLE_TTL'],
+)
+
+# Mode de rendu de index.html :
+# - 'static' : coquille pré-rendue une fois, résultat inséré (voir rendering.py)
+# - 'jinja'  : rendu Jinja2 complet à chaque requête
+# En mode debug, le rendu Jinja2 est toujours utilisé pour refléter les
+# modifications du template.
+app.config.setdefault('RENDER_MODE', 'static')
+
+page_renderer = PageRenderer('index.html')
+
+# Transfert des ressources (voir assets.py) :
+# - STATIC_VERSIONING : url_for('static', ...) ajoute l'empreinte du contenu
+#   (?v=...) ; une URL versionnée est servie avec Cache-Control immutable
+#   (un an), le navigateur ne la redemande plus entre deux calculs.
+# - Les variantes précompressées (.br, .gz) produites par "python assets.py"
+#   sont servies aux clients qui les acceptent.
+# - COMPRESS_HTML : les pages de index() d'au moins COMPRESS_MIN_SIZE octets
+#   sont compressées en gzip (niveau COMPRESS_LEVEL) si le client l'accepte.
+app.config.setdefault('STATIC_VERSIONING', True)
+app.config.setdefault('COMPRESS_HTML', True)
+app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+app.config.setdefault('COMPRESS_LEVEL', 6)
+
+static_assets = StaticAssets(app.static_folder)
+
+# Démarrage rapide :
+# - TEMPLATE_BYTECODE_CACHE : répertoire où Jinja2 conserve le bytecode
+#   compilé des templates ; les workers suivants le relisent au lieu de
+#   recompiler index.html (variable d'environnement CALC_TEMPLATE_CACHE).
+# - WARMUP_ON_IMPORT : exécute warm_up() dès l'import du module, pour les
+#   serveurs qui importent app.py sans passer par serve.py ni asgi.py
+#   (variable d'environnement CALC_WARMUP=1).
+app.config.setdefault('TEMPLATE_BYTECODE_CACHE', os.environ.get('CALC_TEMPLATE_CACHE'))
+app.config.setdefault('WARMUP_ON_IMPORT', os.environ.get('CALC_WARMUP') == '1')
+
+# Table précalculée des expressions "a op b" à petits opérandes entiers
+# (voir precompute.py), lue par mmap dans index() ; None pour la désactiver
+# (variable d'environnement CALC_PRECOMPUTED).
+app.config.setdefault('PRECOMPUTED_TABLE', os.environ.get('CALC_PRECOMPUTED'))
+
+if app.config['TEMPLATE_BYTECODE_CACHE']:
+    os.makedirs(app.config['TEMPLATE_BYTECODE_CACHE'], exist_ok=True)
+    # L'environnement Jinja2 est créé au premier rendu avec ces options
+    app.jinja_options = {
+        **app.jinja_options,
+        'bytecode_cache': FileSystemBytecodeCache(app.config['TEMPLATE_BYTECODE_CACHE']),
+    }
+
+# Moteur d'évaluation des routes :
+# - 'single' : calculate(), un seul opérateur par expression
+# - 'full'   : engine.py, expressions à plusieurs opérateurs avec priorités
+app.config.setdefault('EXPRESSION_ENGINE', 'single')
+
+# Mode d'évaluation côté client (opt-in) : la page évalue les expressions
+# simples dans le navigateur (static/calculator.js) et n'interroge
+# /api/calculate qu'en cas de besoin, sans recharger la page.
+app.config.setdefault('CLIENT_EVAL', False)
+
+# Représentation numérique des opérandes (voir backends.py) : 'float',
+# 'decimal' ou 'fraction'. Le backend peut aussi être choisi par requête.
+app.config.setdefault('NUMERIC_BACKEND', 'float')
+app.config.setdefault('DECIMAL_PRECISION', 28)
+
+# Garde-fous (voir guard.py) :
+# - POWER_MAX_BITS : taille maximale (en bits) d'une puissance exacte,
+#   estimée avant le calcul, et des opérandes et résultats du backend exact.
+#   La valeur par défaut reste sous la limite de conversion des entiers en
+#   texte de Python (4300 chiffres), pour que tout résultat accepté puisse
+#   être affiché.
+# - EVAL_CPU_BUDGET : temps CPU (secondes) accordé à une requête d'évaluation
+#   longue (lot, expression à plusieurs opérateurs) ; None pour aucun budget.
+app.config.setdefault('POWER_MAX_BITS', 14000)
+app.config.setdefault('EVAL_CPU_BUDGET', 2.0)
+
+# Instrumentation (voir metrics.py), exposée sur /metrics au format
+# Prometheus. Désactivée, elle n'ajoute qu'un test de configuration par
+# évaluation et par requête.
+app.config.setdefault('METRICS_ENABLED', False)
+
+metrics_registry = Registry()
+PARSE_SECONDS = metrics_registry.histogram(
+    'calculator_parse_seconds', "Durée de l'analyse d'une expression (parse_expression)")
+EVAL_SECONDS = metrics_registry.histogram(
+    'calculator_eval_seconds', "Durée de l'application d'un opérateur", labels=('op',))
+RENDER_SECONDS = metrics_registry.histogram(
+    'calculator_render_seconds', "Durée du rendu de index.html", labels=('mode',))
+REQUEST_SECONDS = metrics_registry.histogram(
+    'calculator_request_seconds', "Latence des requêtes HTTP", labels=('endpoint', 'method'))
+ERRORS = metrics_registry.counter(
+    'calculator_errors_total', "Erreurs d'évaluation par type et message", labels=('type', 'message'))
+
+# Profilage par échantillonnage (voir profiler.py), désactivé par défaut.
+# Une requête est profilée si elle porte l'en-tête PROFILE_HEADER ou si elle
+# est tirée au sort (proportion PROFILE_SAMPLE_RATE, ex: 0.01 pour 1 %).
+# Les piles agrégées sont exposées par /api/profile.
+app.config.setdefault('PROFILING_ENABLED', False)
+app.config.setdefault('PROFILE_SAMPLE_RATE', 0.0)
+app.config.setdefault('PROFILE_HEADER', 'X-Profile')
+app.config.setdefault('PROFILE_INTERVAL', 0.001)
+
+profiler = SamplingProfiler(app.config['PROFILE_INTERVAL'])
+
+# Contrôle d'admission des évaluations (voir admission.py), désactivé par
+# défaut. Les requêtes POST des routes d'évaluation (ADMISSION_ENDPOINTS)
+# passent par :
+# - une limite de débit par client (seau à jetons de RATE_LIMIT_RATE jetons
+#   par seconde et RATE_LIMIT_BURST jetons au plus ; 0 la désactive), 429 ;
+# - une limite de concurrence (ADMISSION_MAX_CONCURRENT), avec une file
+#   bornée (ADMISSION_MAX_QUEUE) et une attente maximale
+#   (ADMISSION_QUEUE_TIMEOUT, secondes) au-delà desquelles la requête est
+#   refusée aussitôt, 503.
+# Les refus portent un en-tête Retry-After. Les limites sont lues à l'import.
+app.config.setdefault('ADMISSION_ENABLED', False)
+app.config.setdefault('ADMISSION_MAX_CONCURRENT', 8)
+app.config.setdefault('ADMISSION_MAX_QUEUE', 32)
+app.config.setdefault('ADMISSION_QUEUE_TIMEOUT', 0.25)
+app.config.setdefault('RATE_LIMIT_RATE', 0)
+app.config.setdefault('RATE_LIMIT_BURST', None)
+app.config.setdefault('RATE_LIMIT_MAX_CLIENTS', 10000)
+
+ADMISSION_ENDPOINTS = frozenset({'index', 'api_calculate', 'batch', 'binary', 'session_calculate'})
+
+admission_limiter = ConcurrencyLimiter(
+    max_concurrent=app.config['ADMISSION_MAX_CONCURRENT'],
+    max_queue=app.config['ADMISSION_MAX_QUEUE'],
+    queue_timeout=app.config['ADMISSION_QUEUE_TIMEOUT'],
+)
+rate_limiter = TokenBuckets(
+    rate=app.config['RATE_LIMIT_RATE'],
+    burst=app.config['RATE_LIMIT_BURST'],
+    max_clients=app.config['RATE_LIMIT_MAX_CLIENTS'],
+) if app.config['RATE_LIMIT_RATE'] else None
+
 # Dictionnaire mappant les symboles d'opérateurs aux fonctions correspondantes
 # Permet de résoudre dynamiquement l'opération à effectuer
 OPS = {
@@ -28,7 +224,112 @@ OPS = {
     '/': divide,
 }
 
-def calculate(expr: str):
+# Codes numériques compacts des opérateurs, utilisés par les représentations
+# en colonnes (voir vectorized.py). L'ordre suit celui de OPS.
+OP_CODES = {op: code for code, op in enumerate(OPS)}
+OP_SYMBOLS = tuple(OPS)
+OP_FUNCS = tuple(OPS.values())
+
+# Automates précompilés utilisés par parse_expression() :
+# - _OPERATOR_RE repère un symbole d'opérateur
+# - _EXPRESSION_RE reconnaît en une passe "[signe]opérande opérateur opérande"
+_OPERATOR_RE = re.compile(r'[-+*/]')
+_EXPRESSION_RE = re.compile(r'([-+]?[^-+*/]+)([-+*/])([^-+*/]+)')
+
+def _split_slow(s):
+    """
+    Chemin lent du découpage : localise les opérateurs de s (sans espaces)
+    pour produire le bon message d'erreur, ou accepter une forme que
+    l'automate _EXPRESSION_RE ne couvre pas.
+
+    Sorties:
+        tuple: (left, op_char, right)
+    """
+    # Un signe + ou - au tout début de l'expression fait partie du premier
+    # opérande. Exemple : "-5+10" -> on ignore le '-' d'indice 0
+    start = 1 if len(s) > 1 and s[0] in '+-' else 0
+    found = _OPERATOR_RE.search(s, start)
+    if found is None:
+        raise ValueError("invalid expression format")
+    op_pos = found.start()
+    if _OPERATOR_RE.search(s, op_pos + 1) is not None:
+        raise ValueError("only one operator is allowed")
+
+    # L'opérateur ne peut pas être le premier caractère (après éventuel signe) ni le dernier
+    if op_pos == 0 or op_pos == len(s) - 1:
+        raise ValueError("invalid expression format")
+
+    return s[:op_pos], s[op_pos], s[op_pos+1:]
+
+def split_expression(expr: str):
+    """
+    Découpe une expression arithmétique simple en opérandes et opérateur.
+
+    Entrées:
+        expr (str): L'expression arithmétique à découper (ex: "10+5")
+
+    Sorties:
+        tuple: (left, op_char, right) où left et right sont les textes des
+               opérandes (sans espaces) et op_char le symbole de l'opérateur
+
+    Lève:
+        ValueError: Si l'expression est vide, contient plus d'un opérateur
+                   ou a un format invalide
+    """
+    if not expr or not isinstance(expr, str):
+        raise ValueError("empty expression")
+    s = expr.replace(" ", "")
+    match = _EXPRESSION_RE.fullmatch(s)
+    if match is not None:
+        return match.groups()
+    return _split_slow(s)
+
+def parse_expression(expr: str, number=float):
+    """
+    Analyse une expression arithmétique simple sans l'évaluer.
+
+    Entrées:
+        expr (str): L'expression arithmétique à analyser (ex: "10+5")
+        number (callable): Conversion des opérandes (float par défaut, ou
+                           la méthode parse d'un backend de backends.py)
+
+    Sorties:
+        tuple: (a, op_char, b) où a et b sont les opérandes convertis
+               et op_char le symbole de l'opérateur
+
+    Lève:
+        ValueError: Si l'expression est vide, contient plus d'un opérateur,
+                   a un format invalide, ou contient des opérandes non numériques
+    """
+    # Même découpage que split_expression(), répété ici pour éviter un appel
+    # de fonction supplémentaire sur le chemin le plus sollicité
+    if not expr or not isinstance(expr, str):
+        raise ValueError("empty expression")
+
+    # On enlève les espaces (str.replace retourne la chaîne d'origine, sans
+    # copie, lorsqu'elle n'en contient pas)
+    s = expr.replace(" ", "")
+
+    # Chemin rapide : une seule passe de l'automate compilé sur l'expression
+    # valide la forme complète et isole les deux opérandes et l'opérateur.
+    match = _EXPRESSION_RE.fullmatch(s)
+    if match is not None:
+        left, op_char, right = match.groups()
+    else:
+        left, op_char, right = _split_slow(s)
+
+    try:
+        a = number(left)
+        b = number(right)
+    except ResultTooLarge:
+        # Opérande refusé par le modèle de coût d'un backend (voir guard.py)
+        raise
+    except ValueError:
+        raise ValueError("operands must be numbers")
+
+    return a, op_char, b
+
+def calculate(expr: str, backend=None):
     """
     Évalue une expression arithmétique simple avec un seul opérateur.
     
@@ -37,49 +338,198 @@ def calculate(expr: str):
     
     Entrées:
         expr (str): L'expression arithmétique à évaluer (ex: "10+5", "20*3")
+        backend (Backend): Représentation numérique à utiliser (voir
+                           backends.py) ; None pour le calcul en float
     
     Sorties:
-        float: Le résultat du calcul
+        float: Le résultat du calcul (ou le type numérique du backend)
     
     Lève:
         ValueError: Si l'expression est vide, contient plus d'un opérateur,
                    a un format invalide, ou contient des opérandes non numériques
     """
-    if not expr or not isinstance(expr, str):
-        raise ValueError("empty expression")
-
-    # On enlève les espaces
-    s = expr.replace(" ", "")
+    if backend is None:
+        a, op_char, b = parse_expression(expr)
+        return OPS[op_char](a, b)
+    a, op_char, b = parse_expression(expr, backend.parse)
+    return backend.apply(op_char, a, b)
 
-    op_pos = -1
-    op_char = None
+def calculate_full(expr: str):
+    """
+    Évalue une expression pouvant contenir plusieurs opérateurs (voir engine.py).
 
-    for i, ch in enumerate(s):
-        if ch in OPS:
-            # Ignorer un signe + ou - au tout début de l'expression
-            # Exemple : "-5+10" -> on ignore le '-' d'indice 0
-            if i == 0 and ch in ['+', '-'] and len(s) > 1:
-                continue
+    Entrées:
+        expr (str): L'expression arithmétique à évaluer (ex: "1+2*3")
 
-            if op_pos != -1:
-                raise ValueError("only one operator is allowed")
-            op_pos = i
-            op_char = ch
+    Sorties:
+        float: Le résultat du calcul, avec les fonctions de OPS
+    """
+    # Import différé : engine.py n'est chargé que si le moteur 'full' est utilisé
+    from engine import evaluate_expression
+    return evaluate_expression(expr, OPS)
 
-    # L'opérateur ne peut pas être le premier caractère (après éventuel signe) ni le dernier
-    if op_pos <= 0 or op_pos >= len(s) - 1:
-        raise ValueError("invalid expression format")
+# Fonction de calcul de chaque backend. Ces objets sont stables : ils servent
+# aussi de clé au cache des résultats, qui ne mélange donc pas les backends.
+# Le backend 'float' utilise directement calculate() (chemin le plus rapide).
+BACKENDS = make_backends(app.config['DECIMAL_PRECISION'], app.config['POWER_MAX_BITS'])
+CALCULATORS = {name: partial(calculate, backend=backend) for name, backend in BACKENDS.items()}
+CALCULATORS['float'] = calculate
 
-    left = s[:op_pos]
-    right = s[op_pos+1:]
+def calculate_observed(expr: str, backend=None):
+    """
+    Variante instrumentée de calculate(), utilisée lorsque METRICS_ENABLED
+    est actif : mesure séparément l'analyse et l'application de l'opérateur.
 
+    Entrées et sorties identiques à calculate().
+    """
+    start = perf_counter()
+    if backend is None:
+        a, op_char, b = parse_expression(expr)
+        apply = OPS[op_char]
+    else:
+        a, op_char, b = parse_expression(expr, backend.parse)
+        apply = partial(backend.apply, op_char)
+    parsed = perf_counter()
+    PARSE_SECONDS.observe(parsed - start)
     try:
-        a = float(left)
-        b = float(right)
-    except ValueError:
-        raise ValueError("operands must be numbers")
+        return apply(a, b)
+    finally:
+        EVAL_SECONDS.observe(perf_counter() - parsed, op_char)
+
+OBSERVED_CALCULATORS = {name: partial(calculate_observed, backend=backend) for name, backend in BACKENDS.items()}
+OBSERVED_CALCULATORS['float'] = calculate_observed
+
+def evaluate(expr, backend=None):
+    """
+    Évalue une expression pour les routes, en passant par le cache des résultats.
 
-    return OPS[op_char](a, b)
+    Le moteur utilisé dépend de EXPRESSION_ENGINE : calculate() ('single')
+    ou calculate_full() ('full'). Le backend numérique est celui demandé, ou
+    NUMERIC_BACKEND par défaut ; le moteur 'full' ne calcule qu'en float.
+    Le moteur 'full' s'exécute dans le budget CPU EVAL_CPU_BUDGET.
+
+    Entrées:
+        expr (str): L'expression arithmétique à évaluer
+        backend (str): Nom du backend numérique (voir backends.py), ou None
+
+    Sorties:
+        float: Le résultat de calculate(expr) (ou le type numérique du backend)
+
+    Lève:
+        Les mêmes exceptions que calculate()
+        ValueError: Si le backend est inconnu ou non supporté par le moteur
+    """
+    if app.config['METRICS_ENABLED']:
+        try:
+            return _evaluate(expr, backend, OBSERVED_CALCULATORS)
+        except Exception as e:
+            ERRORS.inc(type(e).__name__, str(e))
+            raise
+    return _evaluate(expr, backend, CALCULATORS)
+
+def _evaluate(expr, backend, calculators):
+    """Corps de evaluate() : choix du moteur et du backend, puis cache."""
+    name = backend or app.config['NUMERIC_BACKEND']
+    func = calculators.get(name)
+    if func is None:
+        raise ValueError(f"unknown backend: {name}")
+    if app.config['EXPRESSION_ENGINE'] == 'full':
+        if name != 'float':
+            raise ValueError(f"backend {name} is not supported by the full engine")
+        with budget_scope(app.config['EVAL_CPU_BUDGET']):
+            return _compute(expr, calculate_full)
+    return _compute(expr, func)
+
+def _compute(expr, func):
+    """Calcule func(expr) via le cache des résultats et le regroupement des calculs."""
+    flight = single_flight if app.config['SINGLE_FLIGHT_ENABLED'] else None
+    if app.config['RESULT_CACHE_ENABLED']:
+        return result_cache.get_or_compute(expr, func, flight)
+    if flight is None or not isinstance(expr, str):
+        return func(expr)
+    return flight.do((func, normalize(expr)), func, expr)
+
+def evaluate_batch(expressions, backend=None):
+    """
+    Évalue une liste d'expressions avec calculate(), dans l'ordre.
+
+    Une erreur sur une expression n'interrompt pas le lot : elle est
+    rapportée à la position correspondante. Chaque expression passe par
+    evaluate(), et donc par le cache des résultats.
+
+    Le lot entier partage le budget CPU EVAL_CPU_BUDGET : une fois épuisé,
+    les expressions restantes sont rapportées en erreur
+    ("evaluation budget exceeded") sans être évaluées.
+
+    Entrées:
+        expressions (iterable): Les expressions à évaluer
+        backend (str): Nom du backend numérique (voir evaluate())
+
+    Sorties:
+        list: Une liste de tuples (résultat, erreur) dans l'ordre d'entrée,
+              où exactement un des deux éléments vaut None
+    """
+    results = []
+    append = results.append
+    with budget_scope(app.config['EVAL_CPU_BUDGET']):
+        for expr in expressions:
+            try:
+                check_budget()
+                append((evaluate(expr, backend), None))
+            except Exception as e:
+                append((None, str(e)))
+    return results
+
+def _serialize_result(value):
+    """
+    Convertit un résultat de calcul en valeur sérialisable en JSON.
+
+    Les entiers et les flottants finis sont conservés tels quels ; les
+    autres valeurs (infini, NaN, nombres complexes issus d'une puissance,
+    Decimal, Fraction) sont converties en chaîne, comme elles seraient
+    affichées dans la page.
+
+    Lève:
+        ValueError: Si un entier (ou une fraction) dépasse la limite de
+                    conversion en texte de Python (sys.get_int_max_str_digits)
+    """
+    if value.__class__ is int:
+        if _INT_STR_BITS and value.bit_length() > _INT_STR_BITS:
+            # Lève ValueError au-delà de la limite ; sans ce test, l'erreur
+            # surviendrait à l'encodage JSON de la réponse entière
+            str(value)
+        return value
+    if value.__class__ is float and math.isfinite(value):
+        return value
+    return str(value)
+
+# Taille (bits) en deçà de laquelle tout entier peut être converti en texte
+# (3 bits par chiffre, moins que log2(10)) ; 0 si la limite est désactivée
+_INT_STR_BITS = sys.get_int_max_str_digits() * 3
+
+def _batch_item(result, error):
+    """Construit l'objet JSON rapporté pour un élément d'un lot."""
+    if error is None:
+        try:
+            return {'result': _serialize_result(result)}
+        except ValueError as e:
+            error = str(e)
+    return {'error': error}
+
+
+def _read_limited_body(max_bytes):
+    """
+    Lit le corps de la requête sans dépasser max_bytes.
+
+    Sorties:
+        bytes | None: Le corps de la requête, ou None s'il est trop volumineux
+    """
+    if request.content_length is not None and request.content_length > max_bytes:
+        return None
+    data = request.stream.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        return None
+    return data
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
@@ -88,20 +538,539 @@ def index():
     
     Gère les requêtes GET (affichage initial) et POST (calcul d'expressions).
     En GET, affiche un formulaire vide. En POST, récupère l'expression
-    depuis le champ 'display', la calcule et affiche le résultat.
+    depuis le champ 'display', la calcule et affiche le résultat. Le
+    résultat est lu dans la table précalculée (PRECOMPUTED_TABLE) lorsque
+    l'expression en fait partie.
     
+    Le HTML est produit selon RENDER_MODE : à partir d'une coquille
+    pré-rendue (voir rendering.py) ou par un rendu Jinja2 complet. En GET, la
+    réponse porte un ETag et peut être une réponse 304 Not Modified.
+
     Sorties:
-        str: Le HTML rendu du template index.html avec le résultat du calcul
-             (chaîne vide en GET, résultat ou message d'erreur en POST)
+        Response: Le HTML rendu du template index.html avec le résultat du calcul
+                  (chaîne vide en GET, résultat ou message d'erreur en POST)
     """
     result = ""
     if request.method == 'POST':
         expression = request.form.get('display', '')
+        backend = request.form.get('backend')
+        # Table précalculée d'abord (sans copie, partagée entre les workers),
+        # puis évaluation normale en cas d'absence
+        result = lookup_precomputed(expression, backend)
+        if result is None:
+            try:
+                # Conversion en texte dans le try : un entier trop long pour
+                # être affiché (ValueError) devient un message d'erreur
+                result = str(evaluate(expression, backend))
+            except Exception as e:
+                result = f"Error: {e}"
+
+    if app.config['RENDER_MODE'] != 'static' or app.debug:
+        response = make_response(_render('jinja', render_template, 'index.html', result=result))
+        if request.method == 'GET':
+            response.add_etag()
+            return _compress_page(response).make_conditional(request)
+        return _compress_page(response)
+
+    shell = page_renderer.shell(page_variant(request.script_root))
+    if request.method == 'POST':
+        return _compress_page(make_response(_render('static', shell.render, result)))
+
+    # GET : la page vide est constante, on peut répondre 304 Not Modified
+    response = make_response(shell.empty_page)
+    response.set_etag(shell.etag)
+    response.last_modified = shell.last_modified
+    return _compress_page(response, constant=True).make_conditional(request)
+
+def page_variant(script_root):
+    """
+    Clé de la coquille pré-rendue de index.html : tout ce dont dépend le
+    rendu en dehors du résultat (préfixe d'URL, mode client, et moteur et
+    backend, inscrits dans la page pour calculator.js).
+    """
+    config = app.config
+    return (script_root, config['CLIENT_EVAL'], config['EXPRESSION_ENGINE'], config['NUMERIC_BACKEND'])
+
+def _compress_page(response, constant=False):
+    """
+    Compresse une page HTML en gzip si COMPRESS_HTML est actif, si elle fait
+    au moins COMPRESS_MIN_SIZE octets et si le client accepte gzip.
+
+    Entrées:
+        response (Response): La réponse de index()
+        constant (bool): La page ne dépend pas de la requête (page vide) :
+                         sa version compressée est mémorisée
+
+    Sorties:
+        Response: La même réponse ; compressée, son ETag reçoit le suffixe
+                  '-gzip' pour rester distinct de celui de la page d'origine
+    """
+    if not app.config['COMPRESS_HTML']:
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if (len(data) < app.config['COMPRESS_MIN_SIZE']
+            or negotiate(request.headers.get('Accept-Encoding'), ('gzip',)) is None):
+        return response
+    compress = gzip_constant if constant else gzip_compress
+    response.set_data(compress(data, app.config['COMPRESS_LEVEL']))
+    response.headers['Content-Encoding'] = 'gzip'
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + '-gzip', weak)
+    return response
+
+@app.url_defaults
+def _version_static_url(endpoint, values):
+    """Ajoute l'empreinte du fichier aux URL de url_for('static', ...) (STATIC_VERSIONING)."""
+    if endpoint == 'static' and app.config['STATIC_VERSIONING'] and 'v' not in values:
+        version = static_assets.version(values.get('filename', ''))
+        if version is not None:
+            values['v'] = version
+
+@app.endpoint('static')
+def static_file(filename):
+    """
+    Sert un fichier statique, ou sa variante précompressée (.br, .gz) si le
+    client l'accepte.
+
+    Une URL dont le paramètre v est l'empreinte actuelle du fichier est mise
+    en cache un an (immutable) ; sinon le navigateur revalide le fichier.
+    """
+    served, encoding, has_variants = static_assets.variant(
+        filename, request.headers.get('Accept-Encoding'))
+    mimetype = None
+    if encoding is not None:
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = send_from_directory(app.static_folder, served, mimetype=mimetype,
+                                   download_name=os.path.basename(filename))
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    if has_variants:
+        response.vary.add('Accept-Encoding')
+    version = request.args.get('v')
+    if version is not None and version == static_assets.version(filename):
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        response.cache_control.no_cache = None
+    return response
+
+def _render(mode, render, *args, **kwargs):
+    """Appelle render(*args, **kwargs) en mesurant sa durée si les métriques sont actives."""
+    if not app.config['METRICS_ENABLED']:
+        return render(*args, **kwargs)
+    start = perf_counter()
+    try:
+        return render(*args, **kwargs)
+    finally:
+        RENDER_SECONDS.observe(perf_counter() - start, mode)
+
+@app.route('/api/calculate', methods=['POST'])
+def api_calculate():
+    """
+    Évalue une seule expression envoyée en JSON ({"expression": "..."}).
+    Un champ facultatif "backend" choisit la représentation numérique
+    ('float', 'decimal' ou 'fraction', voir backends.py).
+
+    Point d'accès léger utilisé par le mode d'évaluation côté client lorsque
+    le navigateur ne peut pas garantir un résultat identique au serveur.
+
+    Sorties:
+        Response: JSON {"result": ..., "display": "..."} ou
+                  {"error": "...", "display": "Error: ..."}, où display est
+                  exactement la valeur qu'afficherait la page
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        payload = {}
+    expression = payload.get('expression', '')
+    try:
+        result = evaluate(expression, payload.get('backend'))
+        # Conversions dans le try : un entier trop long pour être affiché
+        # (ValueError) devient une erreur de calcul
+        return jsonify(result=_serialize_result(result), display=str(result))
+    except Exception as e:
+        return jsonify(error=str(e), display=f"Error: {e}")
+
+@app.route('/api/binary', methods=['POST'])
+def binary():
+    """
+    Évalue des calculs envoyés en enregistrements binaires (voir protocol.py).
+
+    Chaque enregistrement de la requête porte un code d'opérateur (OP_CODES)
+    et deux opérandes float64 ; la réponse contient un résultat float64 et un
+    code de statut par enregistrement, dans le même ordre. Ni formulaire, ni
+    JSON, ni analyse d'expression : les fonctions de OPS sont appelées
+    directement sur les opérandes décodés.
+
+    Sorties:
+        Response: 200 application/octet-stream, 400 si la taille du corps
+                  n'est pas un multiple de 24 octets, 413 si le corps dépasse
+                  BATCH_MAX_BYTES ou BATCH_MAX_ITEMS enregistrements
+    """
+    status, content_type, content = _evaluate_binary(_read_limited_body(app.config['BATCH_MAX_BYTES']))
+    return Response(content, status, content_type=content_type)
+
+def _evaluate_binary(body):
+    """
+    Corps de la route /api/binary, partagé avec le serveur ASGI.
+
+    Entrées:
+        body (bytes | None): Le corps de la requête (None s'il est trop volumineux)
+
+    Sorties:
+        tuple: (statut HTTP, type de contenu, contenu en bytes)
+    """
+    if body is None or len(body) > app.config['BATCH_MAX_BYTES']:
+        return 413, 'application/json', b'{"error": "request body too large"}'
+    if len(body) // BINARY_REQUEST.size > app.config['BATCH_MAX_ITEMS']:
+        return 413, 'application/json', b'{"error": "too many records"}'
+    try:
+        return 200, BINARY_MIMETYPE, evaluate_records(body, OP_FUNCS)
+    except ProtocolError as e:
+        return 400, 'application/json', json.dumps({'error': str(e)}).encode('utf-8')
+
+@app.route('/api/session', methods=['POST', 'DELETE'])
+def session_calculate():
+    """
+    Calcul incrémental sur l'accumulateur de la session du client.
+
+    Corps JSON de la requête POST :
+        {"value": "12.5"}             - (Re)démarre la session avec cette valeur
+        {"op": "+", "operand": "3"}   - Applique l'opération à l'accumulateur
+
+    Seuls l'opérateur et l'opérande suivants sont envoyés : l'expression
+    complète n'est ni retransmise ni réanalysée. La session est identifiée par
+    le cookie SESSION_COOKIE, posé au démarrage. DELETE supprime la session.
+
+    Sorties:
+        Response: JSON {"result": ..., "display": "..."} ou
+                  {"error": "...", "display": "Error: ..."} (accumulateur
+                  inchangé) ; 400 si le corps est invalide ; 409 si la session
+                  est inconnue ou expirée (le client la redémarre avec la
+                  valeur affichée)
+    """
+    cookie = app.config['SESSION_COOKIE']
+    session_id = request.cookies.get(cookie)
+    if request.method == 'DELETE':
+        if session_id:
+            session_store.delete(session_id)
+        response = make_response('', 204)
+        response.delete_cookie(cookie)
+        return response
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify(error="expected a JSON object"), 400
+
+    if 'value' in payload:
         try:
-            result = calculate(expression)
-        except Exception as e:
-            result = f"Error: {e}"
-    return render_template('index.html', result=result)
+            value = _session_number(payload['value'])
+        except ValueError as e:
+            return jsonify(error=str(e), display=f"Error: {e}")
+        response = jsonify(result=_serialize_result(value), display=str(value))
+        try:
+            session_store.set(session_id, value)
+        except SessionExpired:
+            response.set_cookie(cookie, session_store.create(value), httponly=True, samesite='Lax')
+        return response
+
+    func = OPS.get(payload.get('op'))
+    if func is None:
+        return jsonify(error="invalid operator"), 400
+    try:
+        result = session_store.apply(session_id, func, _session_number(payload.get('operand')))
+    except SessionExpired as e:
+        return jsonify(error=str(e)), 409
+    except Exception as e:
+        return jsonify(error=str(e), display=f"Error: {e}")
+    return jsonify(result=_serialize_result(result), display=str(result))
+
+def _session_number(value):
+    """Convertit une valeur ou un opérande de session (nombre JSON ou chaîne) en float."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("operands must be numbers")
+    try:
+        return float(value.replace(" ", "") if isinstance(value, str) else value)
+    except ValueError:
+        raise ValueError("operands must be numbers")
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """
+    Évalue un lot d'expressions en une seule requête.
+
+    Accepte soit du JSON (une liste d'expressions, ou un objet
+    {"expressions": [...]}) soit du NDJSON (Content-Type
+    application/x-ndjson, une expression JSON par ligne). La réponse utilise
+    le même format que la requête et conserve l'ordre des expressions :
+    chaque élément vaut {"result": ...} ou {"error": "..."}.
+
+    Le backend numérique se choisit avec le champ "backend" de l'objet JSON
+    ou, pour les deux formats, le paramètre d'URL ?backend=.
+
+    Sorties:
+        Response: 200 avec les résultats, 400 si le corps est invalide,
+                  413 si le lot dépasse BATCH_MAX_BYTES ou BATCH_MAX_ITEMS
+    """
+    max_items = app.config['BATCH_MAX_ITEMS']
+    body = _read_limited_body(app.config['BATCH_MAX_BYTES'])
+    if body is None:
+        return jsonify(error="request body too large"), 413
+
+    ndjson = request.mimetype == 'application/x-ndjson'
+    backend = request.args.get('backend')
+    try:
+        if ndjson:
+            lines = [line for line in body.splitlines() if line.strip()]
+            if len(lines) > max_items:
+                return jsonify(error="too many expressions"), 413
+            expressions = [json.loads(line) for line in lines]
+            expressions = [
+                e.get('expression') if isinstance(e, dict) else e
+                for e in expressions
+            ]
+        else:
+            payload = json.loads(body)
+            if isinstance(payload, dict):
+                backend = payload.get('backend', backend)
+                payload = payload.get('expressions')
+            if not isinstance(payload, list):
+                return jsonify(error="expected a list of expressions"), 400
+            if len(payload) > max_items:
+                return jsonify(error="too many expressions"), 413
+            expressions = payload
+    except ValueError:
+        return jsonify(error="invalid JSON body"), 400
+
+    items = [_batch_item(result, error) for result, error in evaluate_batch(expressions, backend)]
+
+    if ndjson:
+        lines = ''.join(json.dumps(item) + '\n' for item in items)
+        return Response(lines, mimetype='application/x-ndjson')
+    return jsonify(results=items)
+
+@app.route('/api/stats', methods=['GET'])
+def stats():
+    """
+    Expose les compteurs internes de l'application.
+
+    Sorties:
+        Response: JSON contenant les compteurs du cache des résultats
+                  (hits, misses, evictions...) pour aider à le dimensionner,
+                  ceux du regroupement des calculs identiques simultanés, du
+                  magasin de sessions et du contrôle d'admission
+    """
+    return jsonify(cache=result_cache.stats(), singleflight=_single_flight_stats(),
+                   sessions=session_store.stats(), admission=_admission_stats())
+
+def _admission_stats():
+    """
+    Compteurs du contrôle d'admission : 'threads' pour Flask, 'async' pour
+    le serveur ASGI lorsqu'il est chargé, et 'rate_limit' si la limite de
+    débit est configurée
+    """
+    counters = {'enabled': app.config['ADMISSION_ENABLED'], 'threads': admission_limiter.stats()}
+    async_limiter = app.extensions.get('calculator.async_admission')
+    if async_limiter is not None:
+        counters['async'] = async_limiter.stats()
+    if rate_limiter is not None:
+        counters['rate_limit'] = rate_limiter.stats()
+    return counters
+
+def _single_flight_stats():
+    """
+    Compteurs du regroupement des calculs : 'threads' pour evaluate(), et
+    'async' pour le point d'entrée ASGI lorsqu'il est chargé (asgi.py)
+    """
+    flights = {'threads': single_flight.stats()}
+    async_flight = app.extensions.get('calculator.async_single_flight')
+    if async_flight is not None:
+        flights['async'] = async_flight.stats()
+    return flights
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Expose les métriques au format texte de Prometheus.
+
+    Comprend les histogrammes de durée (analyse, opérateurs, rendu, latence
+    des requêtes), les erreurs par message, les compteurs du cache et ceux du
+    regroupement des calculs.
+
+    Sorties:
+        Response: text/plain (format d'exposition 0.0.4), ou 404 si
+                  METRICS_ENABLED est désactivé
+    """
+    if not app.config['METRICS_ENABLED']:
+        return jsonify(error="metrics are disabled"), 404
+    gauges = [
+        (f'calculator_cache_{name}', f"Cache des résultats : {name}", value)
+        for name, value in result_cache.stats().items()
+    ]
+    for kind, counters in _single_flight_stats().items():
+        prefix = 'calculator_singleflight' if kind == 'threads' else f'calculator_{kind}_singleflight'
+        gauges.extend(
+            (f'{prefix}_{name}', f"Regroupement des calculs ({kind}) : {name}", value)
+            for name, value in counters.items()
+        )
+    return Response(metrics_registry.render(gauges),
+                    content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/profile', methods=['GET'])
+def profile():
+    """
+    Retourne les piles agrégées par le profileur, au format collapsed stacks
+    (une ligne "cadre;cadre;... nombre" par pile), pour un outil de flame graph.
+
+    Le paramètre ?reset=1 efface les piles après les avoir retournées.
+
+    Sorties:
+        Response: text/plain, ou 404 si PROFILING_ENABLED est désactivé
+    """
+    if not app.config['PROFILING_ENABLED']:
+        return jsonify(error="profiling is disabled"), 404
+    body = profiler.collapsed()
+    if request.args.get('reset'):
+        profiler.reset()
+    return Response(body, content_type='text/plain; charset=utf-8')
+
+@app.before_request
+def _start_request_timer():
+    """Note l'instant de début de la requête lorsque les métriques sont actives."""
+    if app.config['METRICS_ENABLED']:
+        g.request_start = perf_counter()
+
+@app.before_request
+def _admit_request():
+    """
+    Contrôle d'admission des évaluations (ADMISSION_ENABLED) : limite de
+    débit du client, puis place dans la limite de concurrence.
+
+    Sorties:
+        None si la requête est admise, sinon la réponse de refus (429 ou
+        503, avec Retry-After)
+    """
+    if (not app.config['ADMISSION_ENABLED'] or request.method != 'POST'
+            or request.endpoint not in ADMISSION_ENDPOINTS):
+        return None
+    try:
+        if rate_limiter is not None:
+            rate_limiter.take(request.remote_addr)
+        g.admission_start = admission_limiter.acquire()
+    except Rejected as e:
+        return _rejection_response(e)
+    return None
+
+def _rejection_response(rejected):
+    """
+    Réponse JSON d'une requête refusée par le contrôle d'admission, avec le
+    champ 'display' des autres réponses de l'API (affiché par la page).
+    """
+    response = jsonify(error=str(rejected), display=f"Error: {rejected}")
+    response.status_code = rejected.status
+    response.headers['Retry-After'] = str(rejected.retry_after)
+    return response
+
+@app.teardown_request
+def _release_admission(exc):
+    """Libère la place de la requête admise, même en cas d'erreur."""
+    start = g.pop('admission_start', None)
+    if start is not None:
+        admission_limiter.release(start)
+
+@app.before_request
+def _start_profiling():
+    """Démarre le profilage de la requête si elle est désignée (en-tête ou tirage)."""
+    if not app.config['PROFILING_ENABLED'] or request.endpoint in (None, 'profile', 'static'):
+        return
+    rate = app.config['PROFILE_SAMPLE_RATE']
+    if request.headers.get(app.config['PROFILE_HEADER']) or (rate and _sample() < rate):
+        scope = profiler.profile(request.endpoint)
+        scope.__enter__()
+        g.profile_scope = scope
+
+def _sample():
+    """Tirage uniforme dans [0, 1) (random n'est importé qu'au premier tirage)."""
+    from random import random
+    return random()
+
+@app.teardown_request
+def _stop_profiling(exc):
+    """Arrête le profilage de la requête, même en cas d'erreur."""
+    scope = g.pop('profile_scope', None)
+    if scope is not None:
+        scope.__exit__(None, None, None)
+
+@app.after_request
+def _observe_request(response):
+    """Enregistre la latence de la requête dans calculator_request_seconds."""
+    start = g.get('request_start')
+    if start is not None:
+        REQUEST_SECONDS.observe(perf_counter() - start, request.endpoint or 'unknown', request.method)
+    return response
+
+def load_precomputed(path):
+    """
+    Ouvre (ou remplace) la table précalculée utilisée par index().
+
+    Entrées:
+        path (str): Fichier produit par "python precompute.py build",
+                    ou None pour désactiver la table
+
+    Sorties:
+        PrecomputedTable | None: La table ouverte, ou None si elle est
+                                 absente ou invalide (un avertissement est journalisé)
+    """
+    global precomputed_table
+    previous, precomputed_table = precomputed_table, None
+    if previous is not None:
+        previous.close()
+    if path:
+        try:
+            precomputed_table = PrecomputedTable(path)
+        except (OSError, ValueError) as e:
+            app.logger.warning("precomputed table disabled: %s", e)
+    return precomputed_table
+
+def lookup_precomputed(expression, backend=None):
+    """
+    Cherche le résultat d'une expression de la page dans la table précalculée.
+
+    Sorties:
+        float | None: Le résultat, ou None s'il faut évaluer l'expression
+                      (pas de table, backend autre que 'float', expression hors
+                      du domaine ou dont le calcul produit une erreur)
+    """
+    table = precomputed_table
+    if table is None or (backend or app.config['NUMERIC_BACKEND']) != 'float':
+        return None
+    return table.lookup(expression)
+
+precomputed_table = None
+load_precomputed(app.config['PRECOMPUTED_TABLE'])
+
+def warm_up():
+    """
+    Prépare l'application au démarrage plutôt qu'à la première requête.
+
+    Effectue un premier calcul, puis une requête GET et une requête POST
+    internes sur / : compilation (ou lecture du bytecode) de index.html,
+    coquille pré-rendue, analyse de formulaire et routage sont ainsi prêts
+    avant l'arrivée du premier client. Le cache des résultats et les
+    métriques sont ensuite remis à zéro.
+    """
+    calculate("1+1")
+    with app.test_client() as client:
+        client.get('/')
+        client.post('/', data={'display': '1+1'})
+    result_cache.clear()
+    single_flight.reset()
+    metrics_registry.clear()
+
+if app.config['WARMUP_ON_IMPORT']:
+    warm_up()
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
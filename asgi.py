@@ -0,0 +1,402 @@
+"""
+Module asgi - Point d'entrée asynchrone (ASGI) de la calculatrice
+
+Ce module expose l'application sous forme d'application ASGI, utilisable avec
+un serveur asynchrone comme uvicorn :
+
+    uvicorn asgi:app --workers 4
+
+Les routes les plus sollicitées sont servies directement par la boucle
+d'événements :
+    / (GET, POST)          - Page de la calculatrice (coquille pré-rendue)
+    /api/calculate (POST)  - Évaluation d'une expression en JSON
+    /api/binary (POST)     - Calculs en enregistrements binaires (protocol.py)
+
+L'évaluation (evaluate() de app.py, donc calculate() et son cache) est
+déléguée à un pool de threads borné pour ne jamais bloquer la boucle
+d'événements. Les requêtes simultanées portant sur la même expression
+partagent une seule tâche du pool (AsyncSingleFlight) : les appelants en
+attente n'occupent aucun thread. Toutes les autres requêtes (fichiers statiques, /api/batch,
+mode de rendu Jinja2...) sont transmises à l'application Flask (WSGI),
+exécutée dans ce même pool.
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from urllib.parse import parse_qs
+
+from assets import gzip_compress, gzip_constant, negotiate
+from cache import normalize
+from singleflight import AsyncSingleFlight
+from admission import AsyncConcurrencyLimiter, Rejected
+from app import (app as flask_app, evaluate, lookup_precomputed, page_renderer, page_variant,
+                 rate_limiter, warm_up, _evaluate_binary, _render, _serialize_result,
+                 REQUEST_SECONDS)
+
+# Taille du pool d'évaluation et nombre maximal de tâches en attente
+flask_app.config.setdefault('ASGI_MAX_WORKERS', min(32, (os.cpu_count() or 1) + 4))
+flask_app.config.setdefault('ASGI_MAX_PENDING', flask_app.config['ASGI_MAX_WORKERS'] * 4)
+
+_FORM_MIMETYPE = 'application/x-www-form-urlencoded'
+
+
+class CalculatorASGI:
+    """
+    Application ASGI servant la calculatrice.
+
+    Attributs:
+        flask_app (Flask): L'application Flask utilisée pour la configuration,
+                           le rendu de la page et les routes non accélérées
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self._executor = None
+        self._slots = None
+        self.flight = AsyncSingleFlight()
+        # Contrôle d'admission des routes accélérées (ADMISSION_ENABLED), avec
+        # les mêmes limites que app.py ; la limite de débit est partagée
+        config = flask_app.config
+        self.admission = AsyncConcurrencyLimiter(
+            max_concurrent=config['ADMISSION_MAX_CONCURRENT'],
+            max_queue=config['ADMISSION_MAX_QUEUE'],
+            queue_timeout=config['ADMISSION_QUEUE_TIMEOUT'],
+        )
+        # Compteurs exposés par /api/stats et /metrics de l'application Flask
+        flask_app.extensions['calculator.async_single_flight'] = self.flight
+        flask_app.extensions['calculator.async_admission'] = self.admission
+
+    # -- Pool d'évaluation ---------------------------------------------------
+
+    def _ensure_executor(self):
+        """Crée le pool de threads et le sémaphore qui borne l'attente."""
+        if self._executor is None:
+            config = self.flask_app.config
+            self._executor = ThreadPoolExecutor(
+                max_workers=config['ASGI_MAX_WORKERS'],
+                thread_name_prefix='calculator-eval',
+            )
+            self._slots = asyncio.Semaphore(config['ASGI_MAX_PENDING'])
+
+    async def run_blocking(self, func, *args):
+        """
+        Exécute func(*args) dans le pool borné, sans bloquer la boucle.
+
+        Au-delà de ASGI_MAX_PENDING tâches en cours, les appelants attendent
+        qu'une place se libère au lieu d'allonger indéfiniment la file.
+        """
+        self._ensure_executor()
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def evaluate(self, expression, backend=None):
+        """
+        Évalue une expression dans le pool, en regroupant les appels simultanés
+        sur la même expression normalisée (SINGLE_FLIGHT_ENABLED).
+        """
+        if not self.flask_app.config['SINGLE_FLIGHT_ENABLED'] or not isinstance(expression, str):
+            return await self.run_blocking(evaluate, expression, backend)
+        key = (backend, normalize(expression))
+        return await self.flight.do(key, self.run_blocking, evaluate, expression, backend)
+
+    def shutdown(self):
+        """Arrête le pool de threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._slots = None
+
+    # -- Protocole ASGI -------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        config = self.flask_app.config
+        # Comme _read_limited_body() côté Flask : lecture arrêtée au-delà de
+        # BATCH_MAX_BYTES, avant tout routage
+        body = await _read_body(scope, receive, config['BATCH_MAX_BYTES'])
+        if body is None:
+            await _respond(send, 413, b'{"error": "request body too large"}', 'application/json')
+            return
+        path = scope['path']
+        method = scope['method']
+        fast_page = config['RENDER_MODE'] == 'static' and not self.flask_app.debug
+        # Les routes passant par la passerelle WSGI sont mesurées par Flask
+        start = time.perf_counter() if config['METRICS_ENABLED'] else None
+
+        if path == '/' and method == 'GET' and fast_page:
+            endpoint = 'index'
+            await self._index_get(scope, send)
+        elif (path == '/' and method == 'POST' and fast_page
+                and _mimetype(scope) == _FORM_MIMETYPE):
+            endpoint = 'index'
+            await self._admitted(scope, send, self._index_post, scope, body, send)
+        elif path == '/api/calculate' and method == 'POST':
+            endpoint = 'api_calculate'
+            await self._admitted(scope, send, self._api_calculate, body, send)
+        elif path == '/api/binary' and method == 'POST':
+            endpoint = 'binary'
+            await self._admitted(scope, send, self._binary, body, send)
+        else:
+            await self._wsgi(scope, body, send)
+            return
+
+        if start is not None:
+            REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint, method)
+
+    async def _lifespan(self, receive, send):
+        """Gère le démarrage (pool, préchauffage) et l'arrêt du serveur."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._ensure_executor()
+                # Le démarrage est bloquant : aucune requête n'est encore servie
+                warm_up()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    # -- Routes accélérées ----------------------------------------------------
+
+    def _shell(self, scope):
+        """Coquille pré-rendue de index.html pour le préfixe d'URL de la requête."""
+        root_path = scope.get('root_path', '')
+        variant = page_variant(root_path)
+        shell = page_renderer.cached(variant)
+        if shell is not None:
+            return shell
+        # Premier rendu de cette variante : url_for() exige un contexte de requête
+        with self.flask_app.test_request_context('/', base_url='http://localhost' + root_path):
+            return page_renderer.shell(variant)
+
+    async def _index_get(self, scope, send):
+        """GET / : page vide constante, avec ETag et 304 Not Modified."""
+        shell = self._shell(scope)
+        body, headers = self._compress_page(scope, shell.empty_page, constant=True)
+        suffix = '-gzip' if (b'content-encoding', b'gzip') in headers else ''
+        etag = f'"{shell.etag}{suffix}"'
+        headers += [
+            (b'etag', etag.encode('ascii')),
+            (b'last-modified', formatdate(shell.last_modified, usegmt=True).encode('ascii')),
+        ]
+        if etag in _if_none_match(scope):
+            await _respond(send, 304, b'', headers=headers, content_type=None)
+            return
+        await _respond(send, 200, body, 'text/html; charset=utf-8', headers)
+
+    def _compress_page(self, scope, page, constant=False):
+        """
+        Compression gzip négociée de la page (voir _compress_page() de app.py).
+
+        Sorties:
+            tuple: (corps à envoyer, en-têtes Vary et Content-Encoding)
+        """
+        config = self.flask_app.config
+        if not config['COMPRESS_HTML']:
+            return page, []
+        headers = [(b'vary', b'Accept-Encoding')]
+        if (len(page) < config['COMPRESS_MIN_SIZE']
+                or negotiate(_header(scope, b'accept-encoding'), ('gzip',)) is None):
+            return page, headers
+        compress = gzip_constant if constant else gzip_compress
+        headers.append((b'content-encoding', b'gzip'))
+        return compress(page, config['COMPRESS_LEVEL']), headers
+
+    async def _admitted(self, scope, send, handler, *args):
+        """
+        Exécute handler(*args) sous le contrôle d'admission (ADMISSION_ENABLED),
+        ou envoie la réponse de refus (429 ou 503, avec Retry-After).
+        """
+        if not self.flask_app.config['ADMISSION_ENABLED']:
+            await handler(*args)
+            return
+        try:
+            if rate_limiter is not None:
+                rate_limiter.take((scope.get('client') or ('',))[0])
+            start = await self.admission.acquire()
+        except Rejected as e:
+            body = json.dumps({'error': str(e), 'display': f"Error: {e}"}).encode('utf-8')
+            await _respond(send, e.status, body, 'application/json',
+                           [(b'retry-after', str(e.retry_after).encode('ascii'))])
+            return
+        try:
+            await handler(*args)
+        finally:
+            self.admission.release(start)
+
+    async def _index_post(self, scope, body, send):
+        """POST / : évalue le champ display et renvoie la page avec le résultat."""
+        form = parse_qs(body.decode('utf-8', 'replace'), keep_blank_values=True)
+        expression = form.get('display', [''])[0]
+        backend = form.get('backend', [None])[0]
+        # Lecture de la table précalculée directement dans la boucle (O(1))
+        result = lookup_precomputed(expression, backend)
+        if result is None:
+            try:
+                result = str(await self.evaluate(expression, backend))
+            except Exception as e:
+                result = f"Error: {e}"
+        html = _render('static', self._shell(scope).render, result)
+        body, headers = self._compress_page(scope, html.encode('utf-8'))
+        await _respond(send, 200, body, 'text/html; charset=utf-8', headers)
+
+    async def _api_calculate(self, body, send):
+        """POST /api/calculate : même contrat que la route Flask."""
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            payload = {}
+        expression = payload.get('expression', '')
+        try:
+            result = await self.evaluate(expression, payload.get('backend'))
+            data = {'display': str(result), 'result': _serialize_result(result)}
+        except Exception as e:
+            data = {'display': f"Error: {e}", 'error': str(e)}
+        await _respond(send, 200, json.dumps(data).encode('utf-8'), 'application/json')
+
+    async def _binary(self, body, send):
+        """POST /api/binary : enregistrements binaires (voir protocol.py)."""
+        status, content_type, content = await self.run_blocking(_evaluate_binary, body)
+        await _respond(send, status, content, content_type)
+
+    # -- Passerelle WSGI ------------------------------------------------------
+
+    async def _wsgi(self, scope, body, send):
+        """Transmet la requête à l'application Flask, exécutée dans le pool."""
+        environ = _wsgi_environ(scope, body)
+        status, headers, content = await self.run_blocking(_call_wsgi, self.flask_app, environ)
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers],
+        })
+        await send({'type': 'http.response.body', 'body': content})
+
+
+async def _read_body(scope, receive, max_bytes):
+    """
+    Lit le corps de la requête ASGI sans dépasser max_bytes.
+
+    Sorties:
+        bytes | None: Le corps de la requête, ou None s'il est trop volumineux
+                      (Content-Length annoncé ou octets reçus)
+    """
+    length = _header(scope, b'content-length')
+    if length.isdigit() and int(length) > max_bytes:
+        return None
+    chunks = []
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > max_bytes:
+            return None
+        chunks.append(chunk)
+        more_body = message.get('more_body', False)
+    return b''.join(chunks)
+
+
+def _header(scope, name):
+    """Valeur d'un en-tête de requête (noms en minuscules, en bytes), ou ''."""
+    for key, value in scope.get('headers', ()):
+        if key == name:
+            return value.decode('latin-1')
+    return ''
+
+
+def _mimetype(scope):
+    """Type MIME de la requête, sans paramètres."""
+    return _header(scope, b'content-type').split(';', 1)[0].strip().lower()
+
+
+def _if_none_match(scope):
+    """ETags listés dans l'en-tête If-None-Match."""
+    value = _header(scope, b'if-none-match')
+    tags = (tag.strip() for tag in value.split(','))
+    return {tag[2:] if tag.startswith('W/') else tag for tag in tags if tag}
+
+
+async def _respond(send, status, body, content_type='text/plain', headers=()):
+    """Envoie une réponse HTTP complète."""
+    response_headers = [(b'content-length', str(len(body)).encode('ascii'))]
+    if content_type is not None:
+        response_headers.append((b'content-type', content_type.encode('ascii')))
+    response_headers.extend(headers)
+    await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _wsgi_environ(scope, body):
+    """Construit l'environnement WSGI correspondant à une requête ASGI."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('127.0.0.1', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+        'REMOTE_ADDR': str(client[0]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+        'CONTENT_LENGTH': str(len(body)),
+    }
+    for key, value in scope.get('headers', ()):
+        name = key.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            name = 'HTTP_' + name
+            environ[name] = environ[name] + ',' + value if name in environ else value
+    return environ
+
+
+def _call_wsgi(wsgi_app, environ):
+    """
+    Appelle une application WSGI et retourne sa réponse complète.
+
+    Sorties:
+        tuple: (code de statut, liste d'en-têtes, corps en bytes)
+    """
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = headers
+        return lambda data: None
+
+    result = wsgi_app(environ, start_response)
+    try:
+        content = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return response['status'], response['headers'], content
+
+
+app = CalculatorASGI(flask_app)
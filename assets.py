@@ -0,0 +1,203 @@
+"""
+Module assets - Fichiers statiques versionnés et compression des réponses
+
+Sans en-têtes de cache, le navigateur revalide style.css (et calculator.js)
+à chaque chargement de la page, donc après chaque calcul par formulaire.
+Ce module fournit :
+
+    StaticAssets     - Empreinte du contenu de chaque fichier statique, ajoutée
+                       aux URL (?v=...) : une URL versionnée ne change jamais
+                       de contenu et peut être mise en cache « immutable »
+    negotiate()      - Choix du codage de contenu d'après Accept-Encoding
+    gzip_compress()  - Compression gzip reproductible (sans date)
+    build()          - Variantes précompressées (.gz, et .br si le module
+                       brotli est installé) des fichiers statiques, générées
+                       à la construction :
+
+                           python assets.py [répertoire]
+
+Les variantes ne sont servies que si elles sont au moins aussi récentes que
+le fichier d'origine ; sans elles, le fichier est servi tel quel.
+"""
+
+import gzip
+import hashlib
+import os
+import sys
+from functools import lru_cache
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# En-tête Cache-Control des URL versionnées (un an, contenu immuable)
+IMMUTABLE_MAX_AGE = 31536000
+
+# Codages des variantes précompressées, par ordre de préférence
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+# Extensions des fichiers qui gagnent à être compressés
+COMPRESSIBLE = frozenset({'.css', '.js', '.html', '.svg', '.json', '.txt'})
+
+
+def negotiate(accept_encoding, available):
+    """
+    Choisit le codage de contenu à utiliser pour une réponse.
+
+    Entrées:
+        accept_encoding (str): En-tête Accept-Encoding de la requête
+        available (iterable): Codages disponibles, par ordre de préférence
+
+    Sorties:
+        str | None: Le premier codage accepté par le client (qualité > 0),
+                    ou None pour servir le contenu tel quel
+    """
+    if not accept_encoding:
+        return None
+    accepted = parse_accept_header(accept_encoding)
+    for encoding in available:
+        if accepted.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def gzip_compress(data, level=6):
+    """
+    Compresse en gzip sans date dans l'en-tête : le même contenu donne
+    toujours les mêmes octets (ETag et tests stables).
+    """
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+@lru_cache(maxsize=32)
+def gzip_constant(data, level=6):
+    """gzip_compress() mémorisé, pour les pages constantes (ex: page vide)."""
+    return gzip_compress(data, level)
+
+
+class StaticAssets:
+    """
+    Empreintes et variantes précompressées des fichiers d'un répertoire.
+
+    Les empreintes sont recalculées lorsque la date de modification ou la
+    taille d'un fichier change.
+
+    Attributs:
+        folder (str): Le répertoire des fichiers statiques
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        # Nom -> (date de modification, taille, empreinte)
+        self._versions = {}
+
+    def version(self, filename):
+        """
+        Empreinte du contenu d'un fichier statique.
+
+        Entrées:
+            filename (str): Chemin relatif au répertoire (ex: 'style.css')
+
+        Sorties:
+            str | None: 12 caractères hexadécimaux (SHA-256), ou None si le
+                        fichier n'existe pas
+        """
+        path = self._path(filename)
+        try:
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        cached = self._versions.get(filename)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        self._versions[filename] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def variant(self, filename, accept_encoding):
+        """
+        Choisit la variante précompressée à servir.
+
+        Entrées:
+            filename (str): Chemin relatif du fichier demandé
+            accept_encoding (str): En-tête Accept-Encoding de la requête
+
+        Sorties:
+            tuple: (chemin relatif à servir, codage ou None, booléen indiquant
+                   si des variantes existent, pour l'en-tête Vary)
+        """
+        path = self._path(filename)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except (OSError, ValueError):
+            return filename, None, False
+        available = {}
+        for encoding, suffix in PRECOMPRESSED:
+            try:
+                if os.stat(path + suffix).st_mtime_ns >= mtime:
+                    available[encoding] = suffix
+            except OSError:
+                continue
+        encoding = negotiate(accept_encoding, available)
+        if encoding is None:
+            return filename, None, bool(available)
+        return filename + available[encoding], encoding, True
+
+    def _path(self, filename):
+        return os.path.join(self.folder, *filename.split('/'))
+
+
+def build(folder, min_size=256, level=9):
+    """
+    Génère les variantes précompressées des fichiers statiques.
+
+    Seuls les fichiers compressibles (COMPRESSIBLE) d'au moins min_size
+    octets sont traités, et une variante n'est écrite que si elle est plus
+    petite que l'original ; une variante devenue inutile est supprimée.
+
+    Entrées:
+        folder (str): Le répertoire des fichiers statiques
+        min_size (int): Taille minimale d'un fichier à compresser (octets)
+        level (int): Niveau de compression gzip (brotli : qualité maximale)
+
+    Sorties:
+        list: Des tuples (nom, taille, taille gzip, taille brotli ou None)
+    """
+    built = []
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if os.path.splitext(name)[1] not in COMPRESSIBLE:
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) < min_size:
+                continue
+            sizes = {}
+            for encoding, suffix in PRECOMPRESSED:
+                if encoding == 'br':
+                    if brotli is None:
+                        continue
+                    compressed = brotli.compress(data, mode=brotli.MODE_TEXT)
+                else:
+                    compressed = gzip_compress(data, level)
+                if len(compressed) < len(data):
+                    with open(path + suffix, 'wb') as f:
+                        f.write(compressed)
+                    sizes[encoding] = len(compressed)
+                elif os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            built.append((os.path.relpath(path, folder), len(data), sizes.get('gzip'), sizes.get('br')))
+    return built
+
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), 'static')
+    if brotli is None:
+        print("brotli non installé : variantes .gz uniquement")
+    for name, size, gz_size, br_size in build(directory):
+        print(f"{name:<20} {size:>8} {gz_size or '-':>8} {br_size or '-':>8}")
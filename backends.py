@@ -0,0 +1,214 @@
+"""
+Module backends - Représentations numériques de calculate()
+
+Par défaut, calculate() convertit les opérandes avec float() : les grands
+entiers perdent leur précision et la puissance ('*') déborde rapidement. Ce
+module fournit des backends numériques interchangeables, choisis par requête :
+
+    - 'float'    : float() et les fonctions de operators.py (comportement
+                   historique)
+    - 'decimal'  : decimal.Decimal, avec un contexte configurable (précision,
+                   arrondi)
+    - 'fraction' : calcul exact ; entiers Python de taille arbitraire pour les
+                   opérandes entiers, fractions.Fraction sinon
+
+Chaque backend expose la même interface :
+
+    parse(text)             - Convertit le texte d'un opérande (lève ValueError)
+    apply(op_char, a, b)    - Applique l'opérateur avec la sémantique de
+                              operators.py ('*' est une puissance)
+
+Chemins rapides :
+    - 'fraction' : un opérande composé uniquement de chiffres est converti
+      directement avec int(), sans passer par float() ni Fraction() ; la
+      puissance à exposant entier utilise l'exponentiation rapide des entiers
+      Python (carrés successifs), exacte quelle que soit la taille.
+    - 'decimal' : la puissance à exposant entier est calculée par carrés
+      successifs dans le contexte choisi (exacte si la précision le permet).
+"""
+
+import decimal
+import re
+from fractions import Fraction
+
+from guard import PowerGuard
+from operators import add, subtract, multiply, divide
+
+# Opérande entier (signe facultatif) : chemin rapide du backend 'fraction'
+_INTEGER_RE = re.compile(r'[-+]?[0-9]+')
+
+
+class FloatBackend:
+    """Backend historique : float() et les fonctions de operators.py."""
+
+    name = 'float'
+    parse = float
+
+    def __init__(self):
+        self.ops = {'+': add, '-': subtract, '*': multiply, '/': divide}
+
+    def apply(self, op_char, a, b):
+        return self.ops[op_char](a, b)
+
+
+class DecimalBackend:
+    """
+    Backend décimal : opérandes decimal.Decimal, calculs dans un contexte dédié.
+
+    Attributs:
+        context (decimal.Context): Précision et arrondi utilisés pour les calculs
+    """
+
+    name = 'decimal'
+
+    def __init__(self, context=None):
+        self.context = context if context is not None else decimal.Context()
+        self.ops = {'+': add, '-': subtract, '*': multiply, '/': divide}
+
+    def parse(self, text):
+        """
+        Convertit le texte d'un opérande en Decimal (valeur exacte, sans arrondi).
+
+        Lève:
+            ValueError: Si le texte n'est pas un nombre
+        """
+        try:
+            return decimal.Decimal(text)
+        except decimal.InvalidOperation:
+            raise ValueError(f"invalid decimal operand: {text!r}")
+
+    def apply(self, op_char, a, b):
+        """
+        Applique l'opérateur dans le contexte du backend.
+
+        Les conditions décimales sont converties en exceptions usuelles, avec
+        des messages lisibles dans la page.
+
+        Lève:
+            ZeroDivisionError: Division par zéro
+            OverflowError: Résultat hors de l'exposant maximal du contexte
+            ValueError: Opération invalide (ex: puissance fractionnaire d'un négatif)
+        """
+        try:
+            with decimal.localcontext(self.context):
+                return self.ops[op_char](a, b)
+        except ZeroDivisionError:
+            # DivisionByZero et DivisionUndefined (0/0) héritent de ZeroDivisionError
+            raise ZeroDivisionError("decimal division by zero")
+        except decimal.Overflow:
+            raise OverflowError("decimal result out of range")
+        except decimal.InvalidOperation:
+            raise ValueError("invalid decimal operation")
+
+
+class FractionBackend:
+    """
+    Backend exact : entiers de taille arbitraire et fractions.Fraction.
+
+    Les résultats entiers sont retournés sous forme d'int (ex: "6/3" vaut 2,
+    "7/2" vaut Fraction(7, 2)). Une puissance à exposant non entier n'a pas de
+    valeur rationnelle exacte : elle est calculée en float, comme avec le
+    backend 'float'.
+
+    Attributs:
+        guard (PowerGuard): Modèle de coût appliqué aux puissances entières
+                            (voir guard.py), None pour aucune limite
+    """
+
+    name = 'fraction'
+
+    def __init__(self, guard=None):
+        self.guard = guard
+
+    def parse(self, text):
+        """
+        Convertit le texte d'un opérande en int (chemin rapide) ou en Fraction.
+
+        Un opérande en notation scientifique (ex: "1e5000") vaut un entier de
+        la taille de 10 ** exposant : son coût est vérifié par le garde avant
+        la conversion. La taille de tout opérande (nombre de chiffres, puis
+        numérateur et dénominateur) est bornée par le garde.
+
+        Lève:
+            ValueError: Si le texte n'est pas un nombre fini
+            guard.ResultTooLarge: Si l'opérande dépasse la limite du garde
+        """
+        guard = self.guard
+        if _INTEGER_RE.fullmatch(text):
+            if guard is not None:
+                guard.check_digits(len(text.lstrip('+-')))
+                return guard.check_value(int(text))
+            return int(text)
+        try:
+            value = decimal.Decimal(text)
+        except decimal.InvalidOperation:
+            raise ValueError(f"invalid exact operand: {text!r}")
+        if not value.is_finite():
+            raise ValueError(f"invalid exact operand: {text!r}")
+        if guard is None:
+            return _normalize(Fraction(value))
+        digits, exponent = value.as_tuple()[1:]
+        guard.check(10, exponent)
+        guard.check_digits(len(digits))
+        return guard.check_value(_normalize(Fraction(value)))
+
+    def apply(self, op_char, a, b):
+        """
+        Applique l'opérateur de manière exacte.
+
+        Lève:
+            ZeroDivisionError: Division par zéro, ou zéro élevé à une puissance négative
+            guard.ResultTooLarge: Si le résultat dépasse la limite du garde
+        """
+        if op_char == '+':
+            return self._checked(a + b)
+        if op_char == '-':
+            return self._checked(a - b)
+        if op_char == '/':
+            if not b:
+                raise ZeroDivisionError("division by zero")
+            return self._checked(_normalize(Fraction(a) / b))
+        # '*' : puissance
+        if b.__class__ is int:
+            if self.guard is not None:
+                # Rejet avant tout calcul : estimation logarithmique de la taille
+                self.guard.check(a, b)
+            if b >= 0:
+                # int ** int et Fraction ** int : exponentiation rapide, exacte
+                return a ** b
+            if not a:
+                raise ZeroDivisionError("zero to a negative power")
+            return _normalize(Fraction(a) ** b)
+        return multiply(float(a), float(b))
+
+    def _checked(self, value):
+        """Borne la taille d'un résultat exact (voir PowerGuard.check_value())."""
+        if self.guard is None:
+            return value
+        return self.guard.check_value(value)
+
+
+def _normalize(value):
+    """Retourne un int pour une Fraction de dénominateur 1, sinon la Fraction."""
+    if value.denominator == 1:
+        return value.numerator
+    return value
+
+
+def make_backends(decimal_precision=28, max_power_bits=None):
+    """
+    Construit le registre des backends disponibles.
+
+    Entrées:
+        decimal_precision (int): Nombre de chiffres significatifs du backend 'decimal'
+        max_power_bits (int): Taille maximale (en bits) d'une puissance exacte,
+                              None pour aucune limite
+
+    Sorties:
+        dict: Nom du backend -> instance
+    """
+    return {
+        'float': FloatBackend(),
+        'decimal': DecimalBackend(decimal.Context(prec=decimal_precision)),
+        'fraction': FractionBackend(PowerGuard(max_power_bits)),
+    }
@@ -0,0 +1,113 @@
+"""
+Benchmark du contrôle d'admission (admission.py) en surcharge
+
+Simule des requêtes arrivant à un débit fixe (boucle ouverte), supérieur à
+la capacité du serveur : chaque requête occupe le processeur pendant
+--service millisecondes. Compare :
+    - unlimited  : toutes les requêtes sont acceptées (comme app.run)
+    - admission  : ConcurrencyLimiter, file bornée et rejet anticipé (503)
+Affiche, pour les requêtes servies, les latences p50/p99 (de l'arrivée à la
+fin du calcul), et la part des requêtes refusées.
+
+Utilisation:
+    python benchmarks/bench_admission.py [--load 2.0] [--duration 2.0] [--service 2.0]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from admission import ConcurrencyLimiter, Rejected
+
+
+def calibrate(seconds):
+    """Nombre d'itérations de la boucle de calcul durant environ seconds."""
+    iterations = 10000
+    while True:
+        start = time.perf_counter()
+        spin(iterations)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0.05:
+            return max(1, int(iterations * seconds / elapsed))
+        iterations *= 2
+
+
+def spin(iterations):
+    """Travail processeur (garde le GIL, comme une évaluation Python)."""
+    total = 0
+    for i in range(iterations):
+        total += i
+    return total
+
+
+def run(limiter, arrivals, iterations):
+    """
+    Exécute les requêtes aux instants prévus.
+
+    Sorties:
+        tuple: (latences des requêtes servies en secondes, nombre de refus)
+    """
+    latencies = []
+    rejected = [0]
+    lock = threading.Lock()
+
+    def handle(arrival):
+        start = None
+        try:
+            if limiter is not None:
+                start = limiter.acquire()
+            spin(iterations)
+        except Rejected:
+            with lock:
+                rejected[0] += 1
+            return
+        finally:
+            if start is not None:
+                limiter.release(start)
+        with lock:
+            latencies.append(time.perf_counter() - arrival)
+
+    origin = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=256) as pool:
+        for offset in arrivals:
+            delay = origin + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(handle, origin + offset)
+    return sorted(latencies), rejected[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--load', type=float, default=2.0, help="débit d'arrivée / capacité")
+    parser.add_argument('--duration', type=float, default=2.0, help="durée des arrivées (s)")
+    parser.add_argument('--service', type=float, default=2.0, help="durée d'un calcul (ms)")
+    parser.add_argument('--max-concurrent', type=int, default=1)
+    parser.add_argument('--max-queue', type=int, default=32)
+    parser.add_argument('--queue-timeout', type=float, default=0.05)
+    args = parser.parse_args()
+
+    service = args.service / 1000
+    iterations = calibrate(service)
+    interval = service / args.load
+    arrivals = [i * interval for i in range(int(args.duration / interval))]
+
+    print(f"{len(arrivals)} requests, load {args.load:.1f}x capacity, service {args.service:.1f} ms")
+    print(f"{'mode':<10} {'served':>7} {'rejected':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, limiter in (
+        ('unlimited', None),
+        ('admission', ConcurrencyLimiter(args.max_concurrent, args.max_queue, args.queue_timeout)),
+    ):
+        latencies, rejected = run(limiter, arrivals, iterations)
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(f"{name:<10} {len(latencies):>7} {rejected / len(arrivals):>8.1%} {p50:>9.1f} {p99:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark des backends numériques (backends.py)
+
+Pour chaque backend ('float', 'decimal', 'fraction') et plusieurs formes
+d'expressions (petits entiers, décimaux, grands entiers, puissance entière),
+mesure le temps moyen d'un appel à calculate(expr, backend) en microsecondes.
+
+Utilisation:
+    python benchmarks/bench_backends.py [--number 20000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import BACKENDS, calculate
+
+CASES = {
+    'small-int': "1234+5678",
+    'decimal': "12.75/3.5",
+    'big-int': "123456789012345678901234567890-987654321098765432109876543210",
+    'int-power': "3*200",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    names = list(BACKENDS)
+    print(f"{'case':<12}" + ''.join(f"{name + ' (us)':>16}" for name in names))
+    for case, expr in CASES.items():
+        row = f"{case:<12}"
+        for name in names:
+            backend = BACKENDS[name]
+            # Le backend 'float' des routes appelle calculate() sans backend
+            func = (lambda: calculate(expr)) if name == 'float' else (lambda: calculate(expr, backend))
+            try:
+                func()
+            except ArithmeticError:
+                row += f"{'overflow':>16}"
+                continue
+            seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+            row += f"{seconds / args.number * 1e6:>16.3f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark du format binaire (/api/binary) contre les routes formulaire et JSON
+
+Évalue les mêmes calculs "a op b" par :
+    - form         : POST / (formulaire, page HTML), une expression par requête
+    - json         : POST /api/calculate, une expression par requête
+    - batch        : POST /api/batch, un lot JSON d'expressions
+    - binary       : POST /api/binary, un lot d'enregistrements binaires
+    - records      : evaluate_records() seul, sans Flask
+Affiche la durée et les octets échangés (requête + réponse) par calcul.
+
+Utilisation:
+    python benchmarks/bench_binary.py [--batch 1000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import OP_CODES, OP_FUNCS, OP_SYMBOLS, app
+from protocol import encode_requests, evaluate_records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--batch', type=int, default=1000, help="calculs par lot")
+    parser.add_argument('--single', type=int, default=500, help="requêtes des routes unitaires")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    calculations = [(rng.choice(OP_SYMBOLS), round(rng.uniform(-999, 999), 2), round(rng.uniform(1, 99), 2))
+                    for _ in range(args.batch)]
+    expressions = [f"{a}{op_char}{b}" for op_char, a, b in calculations]
+    records = encode_requests([(OP_CODES[op_char], a, b) for op_char, a, b in calculations])
+    batch_body = json.dumps(expressions).encode('utf-8')
+
+    app.config['RESULT_CACHE_ENABLED'] = False
+    client = app.test_client()
+
+    def form():
+        sent = received = 0
+        for expr in expressions[:args.single]:
+            response = client.post('/', data={'display': expr})
+            sent += len(f"display={expr}")
+            received += len(response.data)
+        return args.single, sent + received
+
+    def single_json():
+        sent = received = 0
+        for expr in expressions[:args.single]:
+            body = json.dumps({'expression': expr})
+            response = client.post('/api/calculate', data=body, content_type='application/json')
+            sent += len(body)
+            received += len(response.data)
+        return args.single, sent + received
+
+    def batch():
+        response = client.post('/api/batch', data=batch_body, content_type='application/json')
+        return args.batch, len(batch_body) + len(response.data)
+
+    def binary():
+        response = client.post('/api/binary', data=records, content_type='application/octet-stream')
+        return args.batch, len(records) + len(response.data)
+
+    def bare_records():
+        return args.batch, len(records) + len(evaluate_records(records, OP_FUNCS))
+
+    print(f"{'path':<10} {'us/calc':>10} {'bytes/calc':>11}")
+    for name, run in (('form', form), ('json', single_json), ('batch', batch),
+                      ('binary', binary), ('records', bare_records)):
+        run()  # préchauffage
+        best = None
+        for _ in range(5):
+            start = time.perf_counter()
+            count, size = run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{name:<10} {best / count * 1e6:>10.2f} {size / count:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark du moteur d'expressions à plusieurs opérateurs (engine.py)
+
+Pour des expressions de 10 à 10 000 jetons, mesure :
+    - compile : analyse + compilation (cache vidé), en jetons par seconde
+    - run     : exécution du programme déjà compilé (cache chaud)
+
+Utilisation:
+    python benchmarks/bench_engine.py [--seed 0]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import OPS
+from engine import compile_expression, evaluate_expression
+
+
+def make_expression(operators, seed=0):
+    """Génère une expression avec le nombre d'opérateurs donné (sans puissance)."""
+    rng = random.Random(seed)
+    parts = [str(rng.randint(1, 99))]
+    for _ in range(operators):
+        parts.append(rng.choice('+-/'))
+        parts.append(str(rng.randint(1, 99)))
+    return ''.join(parts)
+
+
+def _best(func, repeat):
+    """Meilleur temps d'exécution de func sur repeat essais."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'tokens':>8} {'compile (ms)':>13} {'compile tok/s':>14} {'run (ms)':>9} {'run tok/s':>12}")
+    for operators in (5, 50, 500, 5000):
+        expr = make_expression(operators, args.seed)
+        tokens = 2 * operators + 1
+
+        def cold():
+            compile_expression.cache_clear()
+            evaluate_expression(expr, OPS)
+
+        compile_time = _best(cold, 5)
+        evaluate_expression(expr, OPS)
+        run_time = _best(lambda: evaluate_expression(expr, OPS), 20)
+        print(f"{tokens:>8} {compile_time * 1e3:>13.3f} {tokens / compile_time:>14,.0f} "
+              f"{run_time * 1e3:>9.3f} {tokens / run_time:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
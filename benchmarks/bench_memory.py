@@ -0,0 +1,85 @@
+"""
+Benchmark de la mémoire des expressions analysées (expressions.py)
+
+Mesure avec tracemalloc la mémoire occupée par N expressions analysées selon
+leur représentation :
+    - dict             : {'left': a, 'op': '+', 'right': b}
+    - tuple            : (a, '+', b), tel que retourné par parse_expression()
+    - ParsedExpression : objet à __slots__ (code d'opérateur, deux float)
+    - ExpressionArray  : colonnes array('b') / array('d')
+ainsi que la sérialisation du lot (to_bytes).
+
+Utilisation:
+    python benchmarks/bench_memory.py [--rows 100000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import OP_SYMBOLS, parse_expression
+from expressions import ExpressionArray, ParsedExpression
+
+
+def measure(build):
+    """
+    Mémoire allouée (et conservée) par build().
+
+    Sorties:
+        tuple: (objet construit, octets alloués)
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    expressions = [f"{rng.uniform(-1000, 1000):.3f}{rng.choice(OP_SYMBOLS)}{rng.uniform(1, 1000):.3f}"
+                   for _ in range(args.rows)]
+
+    def as_dicts():
+        rows = []
+        for expr in expressions:
+            a, op_char, b = parse_expression(expr)
+            rows.append({'left': a, 'op': op_char, 'right': b})
+        return rows
+
+    cases = {
+        'dict': as_dicts,
+        'tuple': lambda: [parse_expression(expr) for expr in expressions],
+        'ParsedExpression': lambda: [ParsedExpression.parse(expr) for expr in expressions],
+        'ExpressionArray': lambda: ExpressionArray.parse(expressions),
+    }
+
+    print(f"{args.rows} expressions\n")
+    print(f"{'representation':<18} {'bytes/expr':>11} {'vs dict':>9}")
+    reference = None
+    for name, build in cases.items():
+        value, size = measure(build)
+        per_expr = size / args.rows
+        reference = reference or per_expr
+        print(f"{name:<18} {per_expr:>11.1f} {reference / per_expr:>8.1f}x")
+        del value
+
+    parsed = ExpressionArray.parse(expressions)
+    data = parsed.to_bytes()
+    assert ExpressionArray.from_bytes(data) == parsed
+    print(f"\nto_bytes: {len(data) / args.rows:.1f} bytes/expr")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark de l'instrumentation (metrics.py)
+
+Compare, métriques désactivées puis activées (METRICS_ENABLED) :
+    - evaluate   : evaluate("12.5+7") sans cache (analyse + opérateur mesurés)
+    - POST /     : requête complète via le client de test Flask
+
+Utilisation:
+    python benchmarks/bench_metrics.py [--number 20000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, evaluate
+
+
+def _measure(func, number):
+    """Temps moyen d'un appel (microsecondes), meilleur de 5 essais."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    app.config['RESULT_CACHE_ENABLED'] = False
+    client = app.test_client()
+    cases = {
+        'evaluate': (lambda: evaluate("12.5+7"), args.number),
+        'POST /': (lambda: client.post('/', data={'display': '12.5+7'}), max(1, args.number // 20)),
+    }
+
+    print(f"{'case':<10} {'off (us)':>10} {'on (us)':>10} {'overhead':>10}")
+    for case, (func, number) in cases.items():
+        app.config['METRICS_ENABLED'] = False
+        off = _measure(func, number)
+        app.config['METRICS_ENABLED'] = True
+        on = _measure(func, number)
+        print(f"{case:<10} {off:>10.3f} {on:>10.3f} {(on - off) / off:>9.1%}")
+    app.config['METRICS_ENABLED'] = False
+
+
+if __name__ == '__main__':
+    main()
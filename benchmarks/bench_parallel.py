@@ -0,0 +1,59 @@
+"""
+Benchmark de mise à l'échelle de l'évaluateur parallèle (parallel.py)
+
+Évalue le même lot d'expressions avec 1 à N processus et affiche le débit,
+l'accélération par rapport à un seul processus et l'efficacité (accélération
+divisée par le nombre de processus). La référence "inline" est la boucle
+calculate() dans le processus courant.
+
+Utilisation:
+    python benchmarks/bench_parallel.py [--rows 1000000] [--max-workers N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from parallel import ParallelEvaluator
+
+
+def make_expressions(n, seed=0):
+    """Génère n expressions "a op b" aléatoires."""
+    rng = random.Random(seed)
+    return [f"{rng.randint(-999, 999)}{rng.choice('+-*/')}{rng.randint(0, 9)}.{rng.randint(0, 99)}"
+            for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    expressions = make_expressions(args.rows)
+    start = time.perf_counter()
+    ParallelEvaluator(inline_below=args.rows + 1).evaluate(expressions)
+    inline = time.perf_counter() - start
+    print(f"inline: {args.rows / inline:,.0f} rows/s")
+
+    print(f"{'workers':>8} {'rows/s':>12} {'speedup':>8} {'efficiency':>11}")
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        with ParallelEvaluator(workers=workers, inline_below=0) as evaluator:
+            evaluator.evaluate(expressions[:10_000])
+            start = time.perf_counter()
+            evaluator.evaluate(expressions)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>8} {args.rows / elapsed:>12,.0f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
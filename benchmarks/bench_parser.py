@@ -0,0 +1,81 @@
+"""
+Micro-benchmark de l'analyseur d'expressions de calculate()
+
+Compare parse_expression() (automate précompilé, une passe) avec l'ancienne
+implémentation caractère par caractère, reproduite ci-dessous, sur des
+expressions courtes et sur des opérandes très longs.
+
+Utilisation:
+    python benchmarks/bench_parser.py [--number 20000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import OPS, parse_expression
+
+
+def legacy_parse(expr):
+    """Ancienne analyse de calculate() : boucle Python sur chaque caractère."""
+    if not expr or not isinstance(expr, str):
+        raise ValueError("empty expression")
+    s = expr.replace(" ", "")
+    op_pos = -1
+    op_char = None
+    for i, ch in enumerate(s):
+        if ch in OPS:
+            if i == 0 and ch in ['+', '-'] and len(s) > 1:
+                continue
+            if op_pos != -1:
+                raise ValueError("only one operator is allowed")
+            op_pos = i
+            op_char = ch
+    if op_pos <= 0 or op_pos >= len(s) - 1:
+        raise ValueError("invalid expression format")
+    try:
+        a = float(s[:op_pos])
+        b = float(s[op_pos+1:])
+    except ValueError:
+        raise ValueError("operands must be numbers")
+    return a, op_char, b
+
+
+CASES = {
+    'short': "5+3",
+    'signed': "-12.5*3",
+    'spaces': "  123 +  456  ",
+    'long-100': "1" * 100 + "/" + "7" * 100,
+    'long-10k': "1" * 10_000 + "-" + "9" * 10_000,
+    'error-multi': "5+3-2",
+}
+
+
+def _run(func, expr, number):
+    """Temps moyen par appel en microsecondes, erreurs comprises."""
+    def call():
+        try:
+            func(expr)
+        except ValueError:
+            pass
+    return min(timeit.repeat(call, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'case':<12} {'legacy (us)':>12} {'compiled (us)':>14} {'speedup':>8}")
+    for name, expr in CASES.items():
+        number = args.number if len(expr) < 1000 else max(1, args.number // 100)
+        legacy = _run(legacy_parse, expr, number)
+        compiled = _run(parse_expression, expr, number)
+        print(f"{name:<12} {legacy:>12.3f} {compiled:>14.3f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
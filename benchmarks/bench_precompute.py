@@ -0,0 +1,78 @@
+"""
+Benchmark de la table précalculée (precompute.py)
+
+Compare, pour des expressions "a op b" du domaine de la table :
+    - calculate  : analyse et calcul à chaque appel
+    - cache      : evaluate() avec le cache des résultats (entrée présente)
+    - table      : PrecomputedTable.lookup() (mmap, sans copie)
+et la route POST / complète avec et sans table.
+
+Utilisation:
+    python benchmarks/bench_precompute.py [--number 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import OP_SYMBOLS, app, calculate, evaluate, load_precomputed
+from precompute import PrecomputedTable, build
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--low', type=int, default=-99)
+    parser.add_argument('--high', type=int, default=99)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    expressions = [f"{rng.randint(args.low, args.high)}{rng.choice(OP_SYMBOLS)}{rng.randint(1, args.high)}"
+                   for _ in range(1000)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'results.table')
+        start = time.perf_counter()
+        count = build(path, args.low, args.high)
+        print(f"build: {count} records, {os.path.getsize(path)} bytes, "
+              f"{time.perf_counter() - start:.2f} s\n")
+
+        table = PrecomputedTable(path)
+
+        def loop(func):
+            def run():
+                for expr in expressions:
+                    try:
+                        func(expr)
+                    except Exception:
+                        pass
+            return run
+
+        cases = {'calculate': loop(calculate), 'cache': loop(evaluate), 'table': loop(table.lookup)}
+        cases['cache']()  # remplit le cache des résultats
+        repeat = max(1, args.number // len(expressions))
+        print(f"{'case':<12} {'us/expr':>10}")
+        for name, func in cases.items():
+            seconds = min(timeit.repeat(func, number=repeat, repeat=5))
+            print(f"{name:<12} {seconds / repeat / len(expressions) * 1e6:>10.3f}")
+
+        client = app.test_client()
+        app.config['RESULT_CACHE_ENABLED'] = False
+        post = lambda: client.post('/', data={'display': expressions[0]})
+        print(f"\n{'route':<12} {'us/req':>10}")
+        for name, table_path in (('POST / live', None), ('POST / table', path)):
+            load_precomputed(table_path)
+            seconds = min(timeit.repeat(post, number=500, repeat=5))
+            print(f"{name:<12} {seconds / 500 * 1e6:>10.1f}")
+        load_precomputed(None)
+        table.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark du rendu de la page de la calculatrice
+
+Compare, via le client de test Flask, la latence de GET / et POST / selon le
+mode de rendu :
+    - jinja  : render_template() complet à chaque requête
+    - static : coquille pré-rendue avec insertion du résultat (rendering.py)
+Mesure aussi le coût d'un GET conditionnel répondu en 304.
+
+Utilisation:
+    python benchmarks/bench_render.py [--requests 5000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app
+
+
+def _latency(send, n):
+    """Latence moyenne d'une requête en microsecondes."""
+    send()
+    start = time.perf_counter()
+    for _ in range(n):
+        send()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    app.config['RESULT_CACHE_ENABLED'] = False
+    client = app.test_client()
+    etag = None
+
+    print(f"{'mode':<8} {'GET (us)':>10} {'POST (us)':>10} {'304 (us)':>10}")
+    for mode in ('jinja', 'static'):
+        app.config['RENDER_MODE'] = mode
+        etag = client.get('/').headers['ETag']
+        get = _latency(lambda: client.get('/'), args.requests)
+        post = _latency(lambda: client.post('/', data={'display': '12+30'}), args.requests)
+        not_modified = _latency(
+            lambda: client.get('/', headers={'If-None-Match': etag}), args.requests)
+        print(f"{mode:<8} {get:>10.1f} {post:>10.1f} {not_modified:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
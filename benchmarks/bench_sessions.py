@@ -0,0 +1,74 @@
+"""
+Benchmark du calcul incrémental en session (/api/session)
+
+Simule une longue chaîne de calculs au clavier : chaque étape applique un
+opérateur et un opérande au résultat précédent.
+    - expression : le client renvoie "résultat op opérande" à /api/calculate
+                   (le résultat affiché est réanalysé à chaque étape)
+    - session    : le client n'envoie que {"op", "operand"} à /api/session
+Affiche la durée par étape, la taille moyenne des corps de requête et le
+nombre d'étapes en erreur (en mode expression, un résultat affiché en
+notation scientifique, ex: "1e-05", ne peut pas être réanalysé).
+
+Utilisation:
+    python benchmarks/bench_sessions.py [--steps 2000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--steps', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # Pas de '*' (puissance, voir operators.py) : la chaîne déborderait vite
+    steps = [(rng.choice('+-/'), f"{rng.uniform(1, 100):.2f}") for _ in range(args.steps)]
+    app.config['RESULT_CACHE_ENABLED'] = False
+    client = app.test_client()
+
+    def expression_chain():
+        display, sent, errors = "0", 0, 0
+        for op, operand in steps:
+            body = json.dumps({'expression': f"{display}{op}{operand}"})
+            sent += len(body)
+            data = client.post('/api/calculate', data=body, content_type='application/json').get_json()
+            if 'error' in data:
+                # Comme l'utilisateur : on repart de zéro
+                errors += 1
+                display = "0"
+            else:
+                display = data['display']
+        return sent, errors
+
+    def session_chain():
+        client.post('/api/session', json={'value': '0'})
+        sent, errors = 0, 0
+        for op, operand in steps:
+            body = json.dumps({'op': op, 'operand': operand})
+            sent += len(body)
+            data = client.post('/api/session', data=body, content_type='application/json').get_json()
+            errors += 'error' in data
+        return sent, errors
+
+    print(f"{args.steps} steps\n")
+    print(f"{'mode':<12} {'us/step':>10} {'bytes/step':>11} {'errors':>7}")
+    for name, chain in (('expression', expression_chain), ('session', session_chain)):
+        start = time.perf_counter()
+        sent, errors = chain()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12} {elapsed / args.steps * 1e6:>10.1f} {sent / args.steps:>11.1f} {errors:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark du démarrage à froid (time-to-first-response)
+
+Lance un nouveau processus Python par mesure et relève :
+    - import : durée de l'import de app.py (préchauffage compris si actif)
+    - first  : latence de la première requête POST / servie
+    - total  : du lancement du processus à la fin de la première réponse
+
+Quatre configurations sont comparées :
+    - cold             : ni préchauffage, ni cache de bytecode
+    - bytecode         : CALC_TEMPLATE_CACHE (cache de bytecode Jinja2 déjà rempli)
+    - warm-up          : CALC_WARMUP=1 (warm_up() exécuté à l'import)
+    - warm-up+bytecode : les deux
+
+Utilisation:
+    python benchmarks/bench_startup.py [--runs 7]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Script exécuté dans chaque processus mesuré
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from app import app
+imported = time.perf_counter()
+client = app.test_client()
+response = client.post('/', data={{'display': '12+7'}})
+assert response.status_code == 200
+done = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'first': done - imported}}))
+"""
+
+
+def measure(environ, runs):
+    """
+    Lance runs processus avec l'environnement donné.
+
+    Sorties:
+        dict: Médianes (secondes) de import, first et total
+    """
+    samples = {'import': [], 'first': [], 'total': []}
+    code = CHILD.format(root=ROOT)
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', code], env=environ, check=True,
+                                capture_output=True, text=True).stdout
+        total = time.perf_counter() - start
+        result = json.loads(output)
+        samples['import'].append(result['import'])
+        samples['first'].append(result['first'])
+        samples['total'].append(total)
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args()
+
+    base = {k: v for k, v in os.environ.items() if k not in ('CALC_WARMUP', 'CALC_TEMPLATE_CACHE')}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        modes = {
+            'cold': base,
+            'bytecode': dict(base, CALC_TEMPLATE_CACHE=cache_dir),
+            'warm-up': dict(base, CALC_WARMUP='1'),
+            'warm-up+bytecode': dict(base, CALC_WARMUP='1', CALC_TEMPLATE_CACHE=cache_dir),
+        }
+        # Remplit le cache de bytecode (comme le ferait le premier worker)
+        measure(modes['bytecode'], 1)
+
+        print(f"{'mode':<18} {'import (ms)':>12} {'first (ms)':>11} {'total (ms)':>11}")
+        for mode, environ in modes.items():
+            result = measure(environ, args.runs)
+            print(f"{mode:<18} {result['import'] * 1e3:>12.1f} {result['first'] * 1e3:>11.2f} "
+                  f"{result['total'] * 1e3:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
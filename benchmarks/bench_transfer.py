@@ -0,0 +1,116 @@
+"""
+Benchmark des octets transférés et des requêtes par calcul (avant/après)
+
+Simule un navigateur qui charge la page puis effectue --calculations calculs
+par formulaire (POST /), en rechargeant à chaque fois les ressources de la
+page (style.css, calculator.js avec --client-eval) selon leurs en-têtes de
+cache : ressource fraîche (max-age) servie par le cache, sinon revalidation
+(If-None-Match, 304) ou téléchargement. Compare :
+    - before : URL non versionnées, pas de compression (comportement d'origine)
+    - after  : URL versionnées immutable, variantes précompressées (assets.py)
+               et pages compressées en gzip
+Affiche les requêtes et les octets de réponse (en-têtes + corps) par calcul.
+
+Utilisation:
+    python benchmarks/bench_transfer.py [--calculations 50] [--client-eval]
+"""
+
+import argparse
+import gzip
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as app_module
+from app import app, page_renderer
+from assets import StaticAssets, build
+
+ACCEPT_ENCODING = 'gzip, deflate, br'
+_RESOURCE = re.compile(rb'(?:href|src)="(/static/[^"]+)"')
+
+
+class Browser:
+    """Client avec un cache HTTP minimal (fraîcheur max-age et ETag)."""
+
+    def __init__(self, client):
+        self.client = client
+        self.cache = {}
+        self.requests = 0
+        self.bytes = 0
+
+    def fetch(self, method, url, **kwargs):
+        response = getattr(self.client, method)(url, headers={'Accept-Encoding': ACCEPT_ENCODING,
+                                                              **kwargs.pop('headers', {})}, **kwargs)
+        self.requests += 1
+        self.bytes += len(response.data) + len(f"HTTP/1.1 {response.status}\r\n")
+        self.bytes += sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+        response.close()
+        return response
+
+    def load_resources(self, page):
+        for url in _RESOURCE.findall(page):
+            url = url.decode('ascii').replace('&amp;', '&')
+            cached = self.cache.get(url)
+            if cached is not None and cached['fresh']:
+                continue
+            headers = {'If-None-Match': cached['etag']} if cached else {}
+            response = self.fetch('get', url, headers=headers)
+            if response.status_code == 200:
+                control = response.cache_control
+                self.cache[url] = {'etag': response.headers.get('ETag', ''),
+                                   'fresh': bool(control.max_age) and not control.no_cache}
+
+
+def session(calculations):
+    """Chargement de la page puis calculs ; renvoie (requêtes, octets) par calcul."""
+    browser = Browser(app.test_client())
+    page = browser.fetch('get', '/')
+    browser.load_resources(_decoded(page))
+    for i in range(calculations):
+        page = browser.fetch('post', '/', data={'display': f"{i}+{i % 7}"})
+        browser.load_resources(_decoded(page))
+    total = calculations + 1
+    return browser.requests / total, browser.bytes / total
+
+
+def _decoded(response):
+    if response.headers.get('Content-Encoding') == 'gzip':
+        return gzip.decompress(response.data)
+    return response.data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calculations', type=int, default=50)
+    parser.add_argument('--client-eval', action='store_true', help="charge aussi calculator.js")
+    args = parser.parse_args()
+
+    app.config['CLIENT_EVAL'] = args.client_eval
+    app.config['RESULT_CACHE_ENABLED'] = False
+    folder = tempfile.mkdtemp()
+    try:
+        static = os.path.join(folder, 'static')
+        shutil.copytree(app.static_folder, static,
+                        ignore=shutil.ignore_patterns('*.gz', '*.br'))
+        app.static_folder = static
+        app_module.static_assets = StaticAssets(static)
+
+        print(f"{'mode':<8} {'requests/calc':>14} {'bytes/calc':>11}")
+        for name, enabled in (('before', False), ('after', True)):
+            if enabled:
+                build(static)
+            app.config['STATIC_VERSIONING'] = enabled
+            app.config['COMPRESS_HTML'] = enabled
+            page_renderer.invalidate()
+            requests, size = session(args.calculations)
+            print(f"{name:<8} {requests:>14.2f} {size:>11.0f}")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark du moteur en colonnes (vectorized.py) contre la boucle scalaire
+
+Mesure le débit (lignes par seconde) de trois chemins pour des lots de
+1e3 à 1e7 expressions générées aléatoirement :
+    - scalar   : boucle Python sur calculate()
+    - columnar : analyse en colonnes + évaluation NumPy (evaluate_vectorized)
+    - eval     : évaluation NumPy seule sur des colonnes déjà analysées
+
+Utilisation:
+    python benchmarks/bench_vectorized.py [--max-rows 10000000] [--seed 0]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import calculate
+from vectorized import evaluate_columns, evaluate_vectorized, parse_columns
+
+
+def make_expressions(n, seed=0):
+    """Génère n expressions "a op b" avec des opérandes entiers et décimaux."""
+    rng = random.Random(seed)
+    ops = '+-*/'
+    return [
+        f"{rng.randint(-999, 999)}{rng.choice(ops)}{rng.randint(0, 9)}.{rng.randint(0, 99)}"
+        for _ in range(n)
+    ]
+
+
+def _rate(n, seconds):
+    """Débit en lignes par seconde."""
+    return n / seconds if seconds > 0 else float('inf')
+
+
+def scalar_loop(expressions):
+    """Référence : une boucle Python sur calculate()."""
+    results = []
+    for expr in expressions:
+        try:
+            results.append(calculate(expr))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--max-rows', type=int, default=10_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'scalar/s':>14} {'columnar/s':>14} {'eval/s':>14} {'speedup':>8}")
+    n = 1000
+    while n <= args.max_rows:
+        expressions = make_expressions(n, args.seed)
+
+        start = time.perf_counter()
+        scalar_loop(expressions)
+        scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        evaluate_vectorized(expressions)
+        columnar = time.perf_counter() - start
+
+        left, ops, right, errors = parse_columns(expressions)
+        start = time.perf_counter()
+        evaluate_columns(left, ops, right, errors)
+        evaluation = time.perf_counter() - start
+
+        print(f"{n:>10} {_rate(n, scalar):>14,.0f} {_rate(n, columnar):>14,.0f} "
+              f"{_rate(n, evaluation):>14,.0f} {scalar / columnar:>7.2f}x")
+        n *= 10
+
+
+if __name__ == '__main__':
+    main()
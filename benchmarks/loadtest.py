@@ -0,0 +1,377 @@
+"""
+Harnais de test de charge de POST / : WSGI (Flask) vs ASGI (asgi.py)
+
+Rejoue un mélange reproductible d'expressions (voir generate_expressions())
+contre la route POST / et mesure le débit (requêtes/s), la latence (p50,
+p95, p99, p999) et les taux d'erreur :
+    - http_errors : réponses dont le statut n'est pas 200 (ou connexion en échec)
+    - app_errors  : pages affichant "Error: ..." (expression refusée par calculate())
+
+Les expressions sont tirées du clavier de index.html (chiffres, + - * /, =) :
+calculs valides, mais aussi les formes d'erreur qu'un utilisateur peut y
+saisir (opérateur final, plusieurs opérateurs, division par zéro...). Le
+mélange est paramétrable (--mix) et reproductible (--seed).
+
+Cibles :
+    --inprocess : l'application WSGI dans ce processus (client de test Flask,
+                  un thread par connexion simulée), sans réseau
+    --url       : un serveur déjà démarré
+    --compare   : le harnais démarre lui-même les deux serveurs sur des ports
+                  locaux : wsgi (app.run(threaded=True)) et asgi (uvicorn
+                  asgi:app, pip install uvicorn)
+
+Plusieurs niveaux de concurrence (--concurrency 1,8,64) montrent l'évolution
+de la latence avec la charge. --json écrit les résultats dans un fichier JSON
+(ou sur la sortie standard avec -), à comparer entre deux versions.
+
+Utilisation:
+    python benchmarks/loadtest.py --inprocess --concurrency 1,8,64 --json results.json
+    python benchmarks/loadtest.py --compare [--concurrency 64] [--requests 5000]
+    python benchmarks/loadtest.py --url http://127.0.0.1:5000/ --mix binary=0.9,empty=0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SERVERS = {
+    'wsgi': [sys.executable, '-c',
+             'import sys; from app import app; app.run(port=int(sys.argv[1]), threaded=True)'],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi:app', '--log-level', 'warning', '--port'],
+}
+
+FORMAT_VERSION = 1
+
+# Marqueur d'une expression refusée dans la page rendue
+ERROR_MARKER = b'Error:'
+
+_DIGITS = '0123456789'
+_OPERATORS = '+-*/'
+
+
+def _operand(rng):
+    """Opérande saisi au clavier : surtout 1 ou 2 chiffres, parfois jusqu'à 4."""
+    length = rng.choices((1, 2, 3, 4), weights=(50, 30, 15, 5))[0]
+    return ''.join(rng.choice(_DIGITS) for _ in range(length))
+
+
+# Formes d'expressions et leur générateur. Les formes valides sont bien
+# formées (une forme valide peut encore échouer au calcul, ex: "9999*9999"
+# ou "5/0") ; les autres produisent toujours "Error: ...".
+SHAPES = {
+    # Valides
+    'binary': lambda rng: f"{_operand(rng)}{rng.choice(_OPERATORS)}{_operand(rng)}",
+    'signed': lambda rng: f"-{_operand(rng)}{rng.choice(_OPERATORS)}{_operand(rng)}",
+    # Refusées par calculate()
+    'divide_by_zero': lambda rng: f"{_operand(rng)}/0",
+    'overflow': lambda rng: f"{rng.randint(100, 999)}*{rng.randint(200, 999)}",
+    'empty': lambda rng: "",
+    'trailing_operator': lambda rng: f"{_operand(rng)}{rng.choice(_OPERATORS)}",
+    'multi_operator': lambda rng: f"{_operand(rng)}{rng.choice(_OPERATORS)}{_operand(rng)}"
+                                  f"{rng.choice(_OPERATORS)}{_operand(rng)}",
+    'double_operator': lambda rng: f"{_operand(rng)}{rng.choice(_OPERATORS)}"
+                                   f"{rng.choice(_OPERATORS)}{_operand(rng)}",
+    'leading_operator': lambda rng: f"{rng.choice('*/')}{_operand(rng)}",
+}
+VALID_SHAPES = ('binary', 'signed')
+
+# Mélange par défaut : environ 80 % de calculs valides
+DEFAULT_MIX = {
+    'binary': 0.72, 'signed': 0.08, 'divide_by_zero': 0.04, 'overflow': 0.01,
+    'empty': 0.03, 'trailing_operator': 0.05, 'multi_operator': 0.04,
+    'double_operator': 0.02, 'leading_operator': 0.01,
+}
+
+
+def parse_mix(text):
+    """
+    Analyse un mélange "forme=poids,forme=poids".
+
+    Sorties:
+        dict: Forme -> poids
+
+    Lève:
+        ValueError: Si une forme est inconnue ou un poids invalide
+    """
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in SHAPES:
+            raise ValueError(f"unknown shape: {name} (expected one of {', '.join(SHAPES)})")
+        mix[name] = float(weight)
+        if mix[name] < 0:
+            raise ValueError(f"negative weight for {name}")
+    if not sum(mix.values()):
+        raise ValueError("the mix must have a positive weight")
+    return mix
+
+
+def generate_expressions(count, mix=None, seed=0):
+    """
+    Génère un mélange reproductible d'expressions.
+
+    Entrées:
+        count (int): Nombre d'expressions
+        mix (dict): Forme -> poids (DEFAULT_MIX par défaut)
+        seed (int): Graine du générateur
+
+    Sorties:
+        list: Des tuples (forme, expression)
+    """
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    names = list(mix)
+    shapes = rng.choices(names, weights=[mix[name] for name in names], k=count)
+    return [(name, SHAPES[name](rng)) for name in shapes]
+
+
+def encode_bodies(expressions):
+    """Corps de formulaire (display=...) de chaque expression."""
+    return [urlencode({'display': expr}).encode('ascii') for _, expr in expressions]
+
+
+def percentile(sorted_values, q):
+    """Percentile q (0-100) d'une liste triée, par la méthode du rang le plus proche."""
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, http_errors, app_errors):
+    """
+    Résume une exécution.
+
+    Entrées:
+        latencies (list): Durée de chaque requête, en secondes
+        elapsed (float): Durée totale, en secondes
+        http_errors, app_errors (int): Nombres d'erreurs (voir en tête du module)
+
+    Sorties:
+        dict: Débit, latences (ms) et taux d'erreur
+    """
+    latencies = sorted(latencies)
+    total = len(latencies)
+    stats = {'requests': total, 'seconds': elapsed, 'rps': total / elapsed if elapsed else 0.0}
+    for name, q in (('p50', 50), ('p95', 95), ('p99', 99), ('p999', 99.9)):
+        stats[f'{name}_ms'] = percentile(latencies, q) * 1000
+    stats.update({
+        'http_errors': http_errors,
+        'app_errors': app_errors,
+        'http_error_rate': http_errors / total if total else 0.0,
+        'app_error_rate': app_errors / total if total else 0.0,
+    })
+    return stats
+
+
+async def _post(host, port, path, body):
+    """Envoie un POST HTTP/1.1 sur une nouvelle connexion et lit la réponse."""
+    reader, writer = await asyncio.open_connection(host, port)
+    request = (
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n"
+        f"Content-Type: application/x-www-form-urlencoded\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode('ascii') + body
+    writer.write(request)
+    await writer.drain()
+    status_line = await reader.readline()
+    content = await reader.read()
+    writer.close()
+    return int(status_line.split()[1]), content
+
+
+async def run_load(url, concurrency, total, bodies):
+    """
+    Envoie total requêtes à un serveur avec concurrency connexions simultanées.
+
+    Sorties:
+        dict: Voir summarize()
+    """
+    parts = urlsplit(url)
+    host, port, path = parts.hostname, parts.port or 80, parts.path or '/'
+    latencies = []
+    http_errors = app_errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal http_errors, app_errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                status, content = await _post(host, port, path, bodies[i % len(bodies)])
+            except OSError:
+                status, content = 0, b''
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                http_errors += 1
+            elif ERROR_MARKER in content:
+                app_errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, http_errors, app_errors)
+
+
+def run_inprocess(concurrency, total, bodies, wsgi_app=None):
+    """
+    Envoie total requêtes à l'application WSGI dans ce processus, avec
+    concurrency threads (un client de test Flask chacun).
+
+    Sorties:
+        dict: Voir summarize()
+    """
+    if wsgi_app is None:
+        sys.path.insert(0, ROOT)
+        from app import app as wsgi_app
+    latencies = []
+    errors = {'http': 0, 'app': 0}
+    counter = iter(range(total))
+    lock = threading.Lock()
+
+    def worker():
+        client = wsgi_app.test_client()
+        local_latencies = []
+        http_errors = app_errors = 0
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            start = time.perf_counter()
+            response = client.post('/', data=bodies[i % len(bodies)],
+                                   content_type='application/x-www-form-urlencoded')
+            local_latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                http_errors += 1
+            elif ERROR_MARKER in response.data:
+                app_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors['http'] += http_errors
+            errors['app'] += app_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - start, errors['http'], errors['app'])
+
+
+def _free_port():
+    """Réserve un port TCP local libre."""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=15.0):
+    """Attend que le serveur accepte les connexions."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def start_server(kind):
+    """Démarre le serveur kind ('wsgi' ou 'asgi') et retourne (processus, url)."""
+    port = _free_port()
+    process = subprocess.Popen(SERVERS[kind] + [str(port)], cwd=ROOT,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _wait_for_port(port)
+    return process, f"http://127.0.0.1:{port}/"
+
+
+def _print(name, concurrency, stats):
+    print(f"{name:<9} {concurrency:>5} {stats['rps']:>10,.0f} {stats['p50_ms']:>8.2f} "
+          f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['p999_ms']:>8.2f} "
+          f"{stats['http_error_rate']:>6.1%} {stats['app_error_rate']:>6.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--url', help="serveur déjà démarré à tester")
+    target.add_argument('--compare', action='store_true', help="compare WSGI et ASGI")
+    target.add_argument('--inprocess', action='store_true', help="application WSGI dans ce processus")
+    parser.add_argument('--concurrency', default='64',
+                        help="niveau(x) de concurrence, séparés par des virgules")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--mix', type=parse_mix, default=None,
+                        help="mélange forme=poids,... (formes : " + ', '.join(SHAPES) + ")")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help="écrit les résultats en JSON (- : sortie standard)")
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    mix = args.mix or DEFAULT_MIX
+    expressions = generate_expressions(args.requests, mix, args.seed)
+    bodies = encode_bodies(expressions)
+    invalid = sum(1 for name, _ in expressions if name not in VALID_SHAPES) / len(expressions)
+
+    out = sys.stderr if args.json == '-' else sys.stdout
+    results = []
+
+    def record(name, concurrency, stats):
+        results.append({'target': name, 'concurrency': concurrency, **stats})
+        if out is sys.stdout:
+            _print(name, concurrency, stats)
+
+    if out is sys.stdout:
+        print(f"{args.requests} requests, seed {args.seed}, invalid shapes {invalid:.1%}\n")
+        print(f"{'target':<9} {'conc':>5} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'p999 ms':>8} {'http':>6} {'app':>6}")
+
+    if args.inprocess:
+        for level in levels:
+            record('inprocess', level, run_inprocess(level, args.requests, bodies))
+    elif args.url:
+        for level in levels:
+            record('target', level, asyncio.run(run_load(args.url, level, args.requests, bodies)))
+    else:
+        for kind in SERVERS:
+            process, url = start_server(kind)
+            try:
+                for level in levels:
+                    record(kind, level, asyncio.run(run_load(url, level, args.requests, bodies)))
+            finally:
+                process.terminate()
+                process.wait()
+
+    if args.json:
+        document = {
+            'version': FORMAT_VERSION,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'config': {'requests': args.requests, 'seed': args.seed, 'mix': mix,
+                       'invalid_shape_rate': invalid},
+            'results': results,
+        }
+        text = json.dumps(document, indent=2) + '\n'
+        if args.json == '-':
+            sys.stdout.write(text)
+        else:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                f.write(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+Suite de benchmarks de non-régression
+
+Mesure calculate() sur plusieurs formes d'expressions, chaque fonction de
+operators.py et les routes GET / et POST / via le client de test Flask. Les
+mesures (plusieurs échantillons par cas) sont enregistrées dans un fichier
+JSON de référence ; une exécution ultérieure est comparée à cette référence
+avec un test t de Welch, et échoue si un cas est significativement plus lent.
+
+Utilisation:
+    python benchmarks/suite.py --save benchmarks/baseline.json
+    python benchmarks/suite.py --compare benchmarks/baseline.json
+    python benchmarks/suite.py --compare baseline.json --only calculate
+
+Code de sortie : 1 si au moins une régression est détectée, 0 sinon.
+
+Une régression est signalée lorsque la moyenne courante dépasse celle de la
+référence de plus de --threshold (5 % par défaut) ET que la différence est
+significative au seuil --alpha (1 % par défaut). Les deux conditions évitent
+de signaler du bruit de mesure comme des différences minimes mais réelles.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+FORMAT_VERSION = 1
+
+
+def build_cases():
+    """
+    Construit les cas de la suite.
+
+    Sorties:
+        dict: Nom du cas -> (fonction sans argument, nombre d'appels par échantillon)
+    """
+    from app import app, calculate
+    from operators import add, subtract, multiply, divide
+
+    def calc(expr):
+        def call():
+            try:
+                calculate(expr)
+            except ValueError:
+                pass
+        return call
+
+    cases = {
+        'calculate/short': (calc("5+3"), 20000),
+        'calculate/signed': (calc("-12.5*3"), 20000),
+        'calculate/long-numbers': (calc("1234567890.123456789/987654321.987654321"), 20000),
+        'calculate/whitespace': (calc("   12   +    34    "), 20000),
+        'calculate/error-format': (calc("5+"), 20000),
+        'calculate/error-operands': (calc("abc+5"), 20000),
+        'calculate/error-multi': (calc("5+3-2"), 20000),
+        'operators/add': (lambda: add(12.5, 7.25), 100000),
+        'operators/subtract': (lambda: subtract(12.5, 7.25), 100000),
+        'operators/multiply': (lambda: multiply(1.5, 7.25), 100000),
+        'operators/divide': (lambda: divide(12.5, 7.25), 100000),
+    }
+
+    app.config['TESTING'] = True
+    client = app.test_client()
+    cases['routes/GET /'] = (lambda: client.get('/'), 500)
+    cases['routes/POST /'] = (lambda: client.post('/', data={'display': '12+7'}), 500)
+    return cases
+
+
+def run(cases, samples=15):
+    """
+    Mesure chaque cas.
+
+    Entrées:
+        cases (dict): Cas retournés par build_cases()
+        samples (int): Nombre d'échantillons par cas
+
+    Sorties:
+        dict: Nom du cas -> {"samples": [...], "mean": ..., "stdev": ...},
+              les durées étant des microsecondes par appel
+    """
+    results = {}
+    for name, (func, number) in cases.items():
+        func()  # préchauffage (caches, imports paresseux)
+        values = [t / number * 1e6 for t in timeit.repeat(func, number=number, repeat=samples)]
+        results[name] = {
+            'samples': values,
+            'mean': statistics.fmean(values),
+            'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+        }
+    return results
+
+
+def welch_t_test(a, b):
+    """
+    Test t de Welch (variances inégales) sur deux échantillons.
+
+    Entrées:
+        a, b (list): Les deux échantillons (au moins deux valeurs chacun)
+
+    Sorties:
+        tuple: (statistique t, degrés de liberté, p-valeur bilatérale)
+    """
+    mean_a, mean_b = statistics.fmean(a), statistics.fmean(b)
+    var_a, var_b = statistics.variance(a) / len(a), statistics.variance(b) / len(b)
+    if var_a + var_b == 0:
+        return (0.0 if mean_a == mean_b else math.copysign(math.inf, mean_b - mean_a)), math.inf, \
+            (1.0 if mean_a == mean_b else 0.0)
+    t = (mean_b - mean_a) / math.sqrt(var_a + var_b)
+    df = (var_a + var_b) ** 2 / (var_a ** 2 / (len(a) - 1) + var_b ** 2 / (len(b) - 1))
+    return t, df, student_t_sf(abs(t), df) * 2
+
+
+def student_t_sf(t, df):
+    """
+    Fonction de survie P(T > t) de la loi de Student, pour t >= 0.
+
+    Utilise la relation avec la fonction bêta incomplète régularisée :
+    P(T > t) = I_x(df/2, 1/2) / 2 avec x = df / (df + t²).
+    """
+    if math.isinf(df):
+        return 0.5 * math.erfc(t / math.sqrt(2))
+    x = df / (df + t * t)
+    return 0.5 * _betainc(df / 2, 0.5, x)
+
+
+def _betainc(a, b, x):
+    """Fonction bêta incomplète régularisée I_x(a, b) (fraction continue de Lentz)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                 + a * math.log(x) + b * math.log1p(-x))
+    # La fraction continue converge rapidement pour x < (a + 1) / (a + b + 2)
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _betainc(b, a, 1 - x)
+
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 300):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return math.exp(log_front) * result / a
+
+
+def compare(baseline, current, alpha=0.01, threshold=0.05):
+    """
+    Compare des mesures à une référence.
+
+    Entrées:
+        baseline, current (dict): Cas -> {"samples": [...], ...} (voir run())
+        alpha (float): Seuil de significativité du test de Welch
+        threshold (float): Ralentissement relatif minimal signalé
+
+    Sorties:
+        list: Un dictionnaire par cas commun {name, baseline, current, change,
+              p_value, status}, status valant 'regression', 'improvement' ou 'ok'
+    """
+    report = []
+    for name in sorted(set(baseline) & set(current)):
+        before, after = baseline[name]['samples'], current[name]['samples']
+        mean_before, mean_after = statistics.fmean(before), statistics.fmean(after)
+        change = mean_after / mean_before - 1
+        _, _, p_value = welch_t_test(before, after)
+        status = 'ok'
+        if p_value < alpha and change > threshold:
+            status = 'regression'
+        elif p_value < alpha and change < -threshold:
+            status = 'improvement'
+        report.append({'name': name, 'baseline': mean_before, 'current': mean_after,
+                       'change': change, 'p_value': p_value, 'status': status})
+    return report
+
+
+def save(path, results):
+    """Enregistre les mesures et le contexte d'exécution dans un fichier JSON."""
+    document = {
+        'version': FORMAT_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cases': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
+
+
+def load(path):
+    """Charge un fichier de référence enregistré par save()."""
+    with open(path, encoding='utf-8') as f:
+        document = json.load(f)
+    if document.get('version') != FORMAT_VERSION:
+        raise ValueError(f"unsupported baseline version: {document.get('version')}")
+    return document['cases']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de non-régression")
+    parser.add_argument('--save', metavar='PATH', help="enregistre les mesures comme référence")
+    parser.add_argument('--compare', metavar='PATH', help="compare les mesures à une référence")
+    parser.add_argument('--only', default='', help="ne mesure que les cas dont le nom contient ce texte")
+    parser.add_argument('--samples', type=int, default=15)
+    parser.add_argument('--alpha', type=float, default=0.01)
+    parser.add_argument('--threshold', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    cases = {name: case for name, case in build_cases().items() if args.only in name}
+    results = run(cases, args.samples)
+
+    print(f"{'case':<28} {'mean (us)':>10} {'stdev':>8}")
+    for name, result in results.items():
+        print(f"{name:<28} {result['mean']:>10.3f} {result['stdev']:>8.3f}")
+
+    if args.save:
+        save(args.save, results)
+        print(f"\nbaseline written to {args.save}")
+
+    if args.compare:
+        report = compare(load(args.compare), results, args.alpha, args.threshold)
+        print(f"\n{'case':<28} {'baseline':>10} {'current':>10} {'change':>8} {'p':>8}  status")
+        for row in report:
+            print(f"{row['name']:<28} {row['baseline']:>10.3f} {row['current']:>10.3f} "
+                  f"{row['change']:>+8.1%} {row['p_value']:>8.4f}  {row['status']}")
+        regressions = [row['name'] for row in report if row['status'] == 'regression']
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
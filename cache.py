@@ -0,0 +1,143 @@
+"""
+Module cache - Cache borné des résultats de calcul
+
+Ce module fournit un cache mémoire LRU avec expiration (TTL) placé devant
+calculate(). Les expressions sont normalisées comme le fait calculate()
+(espaces retirés) avant d'être utilisées comme clés, de sorte que "5 + 3" et
+"5+3" partagent la même entrée.
+
+Les erreurs de calcul (ValueError, ZeroDivisionError, OverflowError...) sont
+elles aussi mises en cache : une expression invalide n'est analysée qu'une
+seule fois tant que son entrée est valide.
+
+Le cache est protégé par un verrou et peut être utilisé par le serveur Flask
+multi-thread.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize(expr):
+    """
+    Normalise une expression comme le fait calculate().
+
+    Entrées:
+        expr (str): L'expression brute
+
+    Sorties:
+        str: L'expression sans espaces
+    """
+    return expr.replace(" ", "")
+
+
+class ResultCache:
+    """
+    Cache LRU à durée de vie limitée pour les résultats de calcul.
+
+    Attributs:
+        maxsize (int): Nombre maximal d'entrées (0 désactive le cache)
+        ttl (float): Durée de vie d'une entrée en secondes (None = illimitée)
+        hits, misses, evictions, expirations (int): Compteurs d'utilisation
+    """
+
+    # Exceptions de calcul mémorisées au même titre que les résultats
+    CACHED_ERRORS = (ValueError, ArithmeticError)
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, expr, func, flight=None):
+        """
+        Retourne le résultat mémorisé pour expr, ou le calcule avec func.
+
+        Entrées:
+            expr (str): L'expression à évaluer
+            func (callable): La fonction de calcul (ex: calculate)
+            flight (SingleFlight): Si fourni, les défauts de cache simultanés
+                                   sur la même clé partagent un seul calcul
+                                   (voir singleflight.py)
+
+        Sorties:
+            Le résultat de func(expr), éventuellement issu du cache
+
+        Lève:
+            L'exception levée par func(expr), éventuellement issue du cache
+        """
+        if self.maxsize <= 0 or not expr or not isinstance(expr, str):
+            return func(expr)
+
+        # La fonction fait partie de la clé : deux moteurs de calcul (ex:
+        # calculate et calculate_full) ne partagent pas leurs résultats
+        key = (func, normalize(expr))
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, is_error, value = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if is_error:
+                        # Une nouvelle instance par levée : l'instance mémorisée
+                        # n'accumule pas de traceback partagé entre threads
+                        raise value[0](*value[1])
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        # Le calcul est fait hors du verrou pour ne pas sérialiser les threads
+        try:
+            value = func(expr) if flight is None else flight.do(key, func, expr)
+        except self.CACHED_ERRORS as e:
+            self._store(key, True, (type(e), e.args), now)
+            raise
+        self._store(key, False, value, now)
+        return value
+
+    def _store(self, key, is_error, value, now):
+        """Insère une entrée en évinçant les moins récemment utilisées."""
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, is_error, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        """
+        Retourne les compteurs d'utilisation du cache.
+
+        Sorties:
+            dict: Taille courante, limites et compteurs hits/misses/evictions
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
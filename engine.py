@@ -0,0 +1,208 @@
+"""
+Module engine - Moteur d'expressions à plusieurs opérateurs
+
+calculate() n'accepte qu'un seul opérateur par expression. Ce module évalue
+des expressions de longueur arbitraire comme "1+2*3-4/5" en trois étapes :
+
+    1. Analyse (parser de Pratt) : la suite d'opérandes et d'opérateurs est
+       transformée en arbre syntaxique en respectant la priorité des
+       opérateurs ('*' et '/' avant '+' et '-', associativité à gauche).
+    2. Compilation : l'arbre est aplati en un programme pour machine à pile
+       (notation postfixée), mis en cache par texte d'expression.
+    3. Exécution : le programme est exécuté avec la table des opérateurs
+       fournie (OPS dans app.py), donc avec la sémantique de operators.py :
+       '*' est une puissance et '/' une division décimale.
+
+Les opérandes suivent les règles de calculate() : les espaces sont ignorés,
+un signe + ou - n'est accepté qu'au tout début de l'expression (il fait
+partie du premier opérande) et chaque opérande est converti avec float().
+Les messages d'erreur sont ceux de calculate().
+"""
+
+import re
+from functools import lru_cache
+
+from guard import check_budget
+
+# Priorité des opérateurs binaires (plus grand = plus prioritaire)
+PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2}
+
+_SPLIT_RE = re.compile(r'([-+*/])')
+
+# Nombre d'instructions exécutées entre deux vérifications du budget CPU
+BUDGET_STRIDE = 4096
+
+
+class Num:
+    """Feuille de l'arbre syntaxique : un opérande numérique."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class BinOp:
+    """Nœud de l'arbre syntaxique : une opération binaire."""
+
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+def tokenize(text):
+    """
+    Découpe une expression normalisée (sans espaces) en opérandes et opérateurs.
+
+    Entrées:
+        text (str): L'expression sans espaces
+
+    Sorties:
+        list: Alternance [opérande (float), opérateur (str), opérande, ...]
+
+    Lève:
+        ValueError: "invalid expression format" si un opérande est manquant,
+                    "operands must be numbers" si un opérande n'est pas un nombre
+    """
+    # Un signe + ou - au tout début appartient au premier opérande
+    start = 1 if len(text) > 1 and text[0] in '+-' else 0
+    parts = _SPLIT_RE.split(text[start:])
+    parts[0] = text[:start] + parts[0]
+    if len(parts) < 3 or not all(parts[0::2]):
+        raise ValueError("invalid expression format")
+    try:
+        parts[0::2] = [float(part) for part in parts[0::2]]
+    except ValueError:
+        raise ValueError("operands must be numbers")
+    return parts
+
+
+def parse(tokens):
+    """
+    Construit l'arbre syntaxique d'une suite de jetons (parser de Pratt).
+
+    Entrées:
+        tokens (list): Jetons retournés par tokenize()
+
+    Sorties:
+        Num | BinOp: La racine de l'arbre
+    """
+    position = 0
+
+    def expression(min_precedence):
+        nonlocal position
+        left = Num(tokens[position])
+        position += 1
+        while position < len(tokens):
+            op = tokens[position]
+            precedence = PRECEDENCE[op]
+            if precedence < min_precedence:
+                break
+            position += 1
+            # Associativité à gauche : l'opérande droit ne prend que les
+            # opérateurs strictement plus prioritaires
+            left = BinOp(op, left, expression(precedence + 1))
+        return left
+
+    return expression(1)
+
+
+def compile_tree(tree):
+    """
+    Aplatit un arbre syntaxique en programme postfixé pour machine à pile.
+
+    Le parcours est itératif pour supporter des expressions de plusieurs
+    milliers de jetons sans atteindre la limite de récursion.
+
+    Entrées:
+        tree (Num | BinOp): La racine de l'arbre
+
+    Sorties:
+        tuple: Instructions ; un float empile une constante, un symbole
+               d'opérateur dépile deux valeurs et empile le résultat
+    """
+    program = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Num):
+            program.append(node.value)
+        elif isinstance(node, BinOp):
+            # Émis après ses deux opérandes (ordre inversé car pile)
+            stack.append(node.op)
+            stack.append(node.right)
+            stack.append(node.left)
+        else:
+            program.append(node)
+    return tuple(program)
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(text):
+    """
+    Analyse et compile une expression normalisée, avec mise en cache.
+
+    Entrées:
+        text (str): L'expression sans espaces
+
+    Sorties:
+        tuple: Le programme retourné par compile_tree()
+    """
+    return compile_tree(parse(tokenize(text)))
+
+
+def run(program, ops):
+    """
+    Exécute un programme compilé.
+
+    Les longs programmes sont exécutés par tranches de BUDGET_STRIDE
+    instructions ; le budget CPU de la requête (voir guard.py) est vérifié
+    entre deux tranches.
+
+    Entrées:
+        program (tuple): Programme retourné par compile_expression()
+        ops (dict): Table symbole -> fonction (ex: OPS dans app.py)
+
+    Sorties:
+        float: Le résultat de l'expression
+
+    Lève:
+        guard.BudgetExceeded: Si le budget CPU de la requête est épuisé
+    """
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for start in range(0, len(program), BUDGET_STRIDE):
+        if start:
+            check_budget()
+        for instruction in program[start:start + BUDGET_STRIDE]:
+            if instruction.__class__ is float:
+                push(instruction)
+            else:
+                b = pop()
+                push(ops[instruction](pop(), b))
+    return stack[0]
+
+
+def evaluate_expression(expr, ops):
+    """
+    Évalue une expression à plusieurs opérateurs.
+
+    Entrées:
+        expr (str): L'expression (ex: "1+2*3-4/5")
+        ops (dict): Table symbole -> fonction (ex: OPS dans app.py)
+
+    Sorties:
+        float: Le résultat de l'expression
+
+    Lève:
+        ValueError: Si l'expression est vide, a un format invalide ou contient
+                   des opérandes non numériques
+        ZeroDivisionError, OverflowError: Selon les fonctions de operators.py
+    """
+    if not expr or not isinstance(expr, str):
+        raise ValueError("empty expression")
+    return run(compile_expression(expr.replace(" ", "")), ops)
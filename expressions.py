@@ -0,0 +1,301 @@
+"""
+Module expressions - Représentations compactes des expressions analysées
+
+calculate() analyse puis évalue aussitôt chaque expression. Les traitements
+qui conservent beaucoup d'expressions analysées (lots, programmes
+précompilés, moteur en colonnes de vectorized.py) utilisent plutôt l'une des
+deux représentations de ce module :
+
+    ParsedExpression - Une expression : code d'opérateur (petit entier, voir
+                       OP_CODES dans app.py) et deux opérandes float, sans
+                       dictionnaire d'attributs (__slots__)
+    ExpressionArray  - Un lot d'expressions en colonnes (structure de
+                       tableaux) : array('b') pour les codes d'opérateurs,
+                       array('d') pour chaque opérande, soit 17 octets par
+                       expression
+
+Les colonnes d'un ExpressionArray sont exportées sans copie par memoryview
+(ou numpy.frombuffer), et le lot complet se sérialise en un bloc d'octets
+(to_bytes / from_bytes).
+
+Format sérialisé (petit-boutiste) :
+
+    En-tête (HEADER = '<4sBxxxII', 16 octets) :
+        magic      4s   b'CEXP'
+        version    B    FORMAT_VERSION
+        count      I    nombre d'expressions
+        errors     I    nombre d'erreurs d'analyse
+    Colonnes : count codes int8, complétés à un multiple de 8 octets, puis
+    count opérandes gauches et count opérandes droits en float64.
+    Erreurs : pour chacune, ERROR (indice et longueur, '<II') suivi du
+    message UTF-8.
+"""
+
+import struct
+import sys
+from array import array
+
+from app import OPS, OP_CODES, OP_SYMBOLS, parse_expression
+
+# Code d'opérateur d'une ligne dont l'analyse a échoué
+INVALID = -1
+
+MAGIC = b'CEXP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sBxxxII')
+ERROR = struct.Struct('<II')
+
+# Fonctions des opérateurs indexées par code
+_FUNCS = tuple(OPS[symbol] for symbol in OP_SYMBOLS)
+
+
+class ParsedExpression:
+    """
+    Expression "nombre opérateur nombre" analysée.
+
+    Attributs:
+        op (int): Code de l'opérateur (voir OP_CODES)
+        left (float): Opérande gauche
+        right (float): Opérande droit
+    """
+
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    @classmethod
+    def parse(cls, expr):
+        """
+        Analyse une expression avec parse_expression().
+
+        Entrées:
+            expr (str): L'expression à analyser (ex: "10+5")
+
+        Sorties:
+            ParsedExpression: L'expression analysée
+
+        Lève:
+            ValueError: Mêmes erreurs que parse_expression()
+        """
+        a, op_char, b = parse_expression(expr)
+        return cls(OP_CODES[op_char], a, b)
+
+    @property
+    def symbol(self):
+        """Symbole de l'opérateur (ex: '+')."""
+        return OP_SYMBOLS[self.op]
+
+    def evaluate(self):
+        """
+        Sorties:
+            float: Le résultat, identique à calculate() sur l'expression d'origine
+        """
+        return _FUNCS[self.op](self.left, self.right)
+
+    def __eq__(self, other):
+        if not isinstance(other, ParsedExpression):
+            return NotImplemented
+        return (self.op, self.left, self.right) == (other.op, other.left, other.right)
+
+    def __repr__(self):
+        return f"ParsedExpression({self.left!r} {self.symbol} {self.right!r})"
+
+
+class ExpressionArray:
+    """
+    Lot d'expressions analysées, stocké en colonnes.
+
+    Les lignes dont l'analyse a échoué ont le code INVALID, des opérandes NaN
+    et leur exception dans errors (dictionnaire creux : les lignes valides
+    n'y occupent aucune place).
+
+    Attributs:
+        ops (array): Codes d'opérateurs (array('b'))
+        left (array): Opérandes gauches (array('d'))
+        right (array): Opérandes droits (array('d'))
+        errors (dict): Indice de ligne -> exception d'analyse
+    """
+
+    __slots__ = ('ops', 'left', 'right', 'errors')
+
+    def __init__(self):
+        self.ops = array('b')
+        self.left = array('d')
+        self.right = array('d')
+        self.errors = {}
+
+    @classmethod
+    def parse(cls, expressions):
+        """
+        Analyse un lot d'expressions.
+
+        Entrées:
+            expressions (iterable): Les expressions à analyser
+
+        Sorties:
+            ExpressionArray: Une ligne par expression, dans l'ordre d'entrée
+        """
+        result = cls()
+        ops_append = result.ops.append
+        left_append = result.left.append
+        right_append = result.right.append
+        codes = OP_CODES
+        nan = float('nan')
+        for i, expr in enumerate(expressions):
+            try:
+                a, op_char, b = parse_expression(expr)
+            except ValueError as e:
+                result.errors[i] = e
+                ops_append(INVALID)
+                left_append(nan)
+                right_append(nan)
+                continue
+            ops_append(codes[op_char])
+            left_append(a)
+            right_append(b)
+        return result
+
+    def append(self, parsed):
+        """Ajoute une expression analysée (ParsedExpression) en fin de lot."""
+        self.ops.append(parsed.op)
+        self.left.append(parsed.left)
+        self.right.append(parsed.right)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __getitem__(self, index):
+        """
+        Sorties:
+            ParsedExpression: La ligne demandée
+
+        Lève:
+            IndexError: Si l'indice est hors du lot
+            ValueError: L'erreur d'analyse de la ligne, si elle est invalide
+        """
+        op = self.ops[index]
+        if op == INVALID:
+            raise self.errors[index % len(self.ops)]
+        return ParsedExpression(op, self.left[index], self.right[index])
+
+    def evaluate(self):
+        """
+        Évalue chaque ligne avec les fonctions de operators.py.
+
+        Sorties:
+            list: Une liste de tuples (résultat, erreur) dans l'ordre, où
+                  exactement un des deux éléments vaut None (même contrat
+                  que app.evaluate_batch())
+        """
+        results = []
+        append = results.append
+        errors = self.errors
+        for i, (op, a, b) in enumerate(zip(self.ops, self.left, self.right)):
+            if op == INVALID:
+                append((None, str(errors[i])))
+                continue
+            try:
+                append((_FUNCS[op](a, b), None))
+            except Exception as e:
+                append((None, str(e)))
+        return results
+
+    def memoryviews(self):
+        """
+        Exporte les colonnes sans copie.
+
+        Sorties:
+            tuple: (ops, left, right) sous forme de memoryview (formats 'b',
+                   'd', 'd'), utilisables par numpy.frombuffer, struct ou
+                   une écriture de fichier
+        """
+        return memoryview(self.ops), memoryview(self.left), memoryview(self.right)
+
+    def to_bytes(self):
+        """
+        Sérialise le lot (voir le format en tête du module).
+
+        Sorties:
+            bytes: Le lot sérialisé, relu par from_bytes()
+        """
+        count = len(self.ops)
+        ops, left, right = self._little_endian()
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, count, len(self.errors)),
+                 ops.tobytes(), bytes(-count % 8), left.tobytes(), right.tobytes()]
+        for index, error in sorted(self.errors.items()):
+            message = str(error).encode('utf-8')
+            parts.append(ERROR.pack(index, len(message)))
+            parts.append(message)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reconstruit un lot sérialisé par to_bytes().
+
+        Entrées:
+            data (bytes-like): Le lot sérialisé
+
+        Sorties:
+            ExpressionArray: Le lot ; les erreurs d'analyse sont reconstruites
+                             en ValueError avec leur message d'origine
+
+        Lève:
+            ValueError: Si les données ne sont pas un lot valide
+        """
+        view = memoryview(data)
+        try:
+            magic, version, count, error_count = HEADER.unpack_from(view, 0)
+        except struct.error:
+            raise ValueError("truncated expression array")
+        if magic != MAGIC:
+            raise ValueError("not an expression array")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported expression array version {version}")
+
+        result = cls()
+        position = HEADER.size
+        columns_end = position + count + (-count % 8) + 16 * count
+        if len(view) < columns_end:
+            raise ValueError("truncated expression array")
+        result.ops.frombytes(view[position:position + count])
+        position += count + (-count % 8)
+        result.left.frombytes(view[position:position + 8 * count])
+        position += 8 * count
+        result.right.frombytes(view[position:position + 8 * count])
+        position += 8 * count
+        if sys.byteorder == 'big':
+            result.left.byteswap()
+            result.right.byteswap()
+
+        try:
+            for _ in range(error_count):
+                index, length = ERROR.unpack_from(view, position)
+                position += ERROR.size
+                result.errors[index] = ValueError(str(view[position:position + length], 'utf-8'))
+                position += length
+        except struct.error:
+            raise ValueError("truncated expression array")
+        return result
+
+    def _little_endian(self):
+        """Colonnes dans l'ordre d'octets du format sérialisé."""
+        if sys.byteorder == 'little':
+            return self.ops, self.left, self.right
+        left, right = array('d', self.left), array('d', self.right)
+        left.byteswap()
+        right.byteswap()
+        return self.ops, left, right
+
+    def __eq__(self, other):
+        if not isinstance(other, ExpressionArray):
+            return NotImplemented
+        # Comparaison octet à octet : deux NaN des lignes invalides sont égaux
+        return (self.ops == other.ops
+                and self.left.tobytes() == other.left.tobytes()
+                and self.right.tobytes() == other.right.tobytes()
+                and {i: str(e) for i, e in self.errors.items()}
+                == {i: str(e) for i, e in other.errors.items()})
@@ -0,0 +1,194 @@
+"""
+Module guard - Garde-fous contre les calculs trop coûteux
+
+Deux protections complémentaires :
+
+    - Modèle de coût de la puissance ('*', voir operators.multiply) : avant
+      de calculer a ** b avec le backend exact ('fraction'), la taille du
+      résultat est estimée par log2|a ** b| = b * log2|a|. Si elle dépasse
+      la limite, le calcul est refusé immédiatement, sans rien allouer.
+      Exemple : "9999999*99999999" produirait un entier d'environ 2,3
+      milliards de bits ; il est rejeté en quelques microsecondes.
+
+      Les opérandes et les résultats exacts (addition, soustraction,
+      division) sont bornés de la même façon, par leur taille en bits.
+
+    - Budget de temps CPU par requête : une évaluation longue (lot
+      d'expressions, expression à plusieurs milliers d'opérateurs) vérifie
+      régulièrement le temps CPU consommé par le thread courant
+      (time.thread_time) et s'interrompt au-delà du budget. Le budget actif
+      est porté par une variable de contexte, ouverte par budget_scope().
+
+Les calculs en float et en Decimal ne sont pas concernés par le modèle de
+coût : leur puissance est de coût borné (par la taille d'un double, ou par la
+précision du contexte décimal) et signale elle-même les débordements.
+"""
+
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class BudgetExceeded(RuntimeError):
+    """
+    Levée lorsque le budget de temps CPU d'une requête est épuisé.
+
+    Ce n'est pas une ValueError : l'erreur dépend de la charge et non de
+    l'expression, elle n'est donc pas mémorisée par le cache des résultats.
+    """
+
+    def __init__(self, message="evaluation budget exceeded"):
+        super().__init__(message)
+
+
+class ResultTooLarge(ValueError):
+    """Levée lorsque le modèle de coût refuse un calcul ("result too large")."""
+
+    def __init__(self, message="result too large"):
+        super().__init__(message)
+
+
+def power_bits(a, b):
+    """
+    Estime la taille en bits de a ** b pour une base exacte (borne logarithmique).
+
+    Entrées:
+        a (int | Fraction): La base
+        b (int): L'exposant
+
+    Sorties:
+        float: Estimation de |b| * log2 de la plus grande des parties de a
+               (numérateur ou dénominateur) ; 0 si la base vaut 0, 1 ou -1,
+               math.inf si l'exposant n'est pas représentable en float
+    """
+    # Le dénominateur d'une fraction grossit comme son numérateur
+    size = max(_log2(a.numerator), _log2(a.denominator))
+    if not size:
+        return 0.0
+    try:
+        return abs(b) * size
+    except OverflowError:
+        # Exposant de plus de ~308 chiffres : résultat démesuré
+        return math.inf
+
+
+_LOG2_10 = math.log2(10)
+
+
+def _log2(n):
+    """log2|n| pour un entier de taille quelconque (0 pour 0)."""
+    return math.log2(abs(n)) if n else 0.0
+
+
+class PowerGuard:
+    """
+    Refuse les puissances dont le résultat dépasserait max_bits bits.
+
+    Attributs:
+        max_bits (int): Taille maximale estimée du résultat (None = illimitée)
+    """
+
+    def __init__(self, max_bits=None):
+        self.max_bits = max_bits
+
+    def check(self, a, b):
+        """
+        Vérifie le coût de a ** b avant de le calculer.
+
+        Lève:
+            ResultTooLarge: Si le résultat estimé dépasse max_bits
+        """
+        if self.max_bits is not None and power_bits(a, b) > self.max_bits:
+            raise ResultTooLarge()
+
+    def check_digits(self, count):
+        """
+        Vérifie la taille d'un entier écrit avec count chiffres décimaux,
+        avant de le convertir.
+
+        Lève:
+            ResultTooLarge: Si l'entier dépasserait max_bits
+        """
+        if self.max_bits is not None and (count - 1) * _LOG2_10 > self.max_bits:
+            raise ResultTooLarge()
+
+    def check_value(self, value):
+        """
+        Vérifie la taille d'un opérande ou d'un résultat exact (int ou
+        Fraction) : numérateur et dénominateur d'au plus max_bits bits.
+
+        Sorties:
+            La valeur, inchangée
+
+        Lève:
+            ResultTooLarge: Si la valeur dépasse max_bits
+        """
+        if self.max_bits is not None and (value.numerator.bit_length() > self.max_bits
+                                          or value.denominator.bit_length() > self.max_bits):
+            raise ResultTooLarge()
+        return value
+
+
+class CpuBudget:
+    """
+    Budget de temps CPU d'une requête, mesuré sur le thread courant.
+
+    Attributs:
+        seconds (float): Temps CPU autorisé
+        deadline (float): Valeur de clock() au-delà de laquelle le budget est épuisé
+    """
+
+    def __init__(self, seconds, clock=time.thread_time):
+        self.seconds = seconds
+        self._clock = clock
+        self.deadline = clock() + seconds
+
+    def check(self):
+        """
+        Lève:
+            BudgetExceeded: Si le temps CPU consommé dépasse le budget
+        """
+        if self._clock() > self.deadline:
+            raise BudgetExceeded()
+
+
+_current_budget = ContextVar('calculator_cpu_budget', default=None)
+
+
+@contextmanager
+def budget_scope(seconds, clock=time.thread_time):
+    """
+    Ouvre un budget de temps CPU pour le bloc with.
+
+    Si un budget est déjà actif (ex: evaluate() appelé depuis un lot), il est
+    conservé : le budget s'applique à la requête entière.
+
+    Entrées:
+        seconds (float): Temps CPU autorisé (None ou 0 = pas de budget)
+
+    Sorties:
+        CpuBudget | None: Le budget actif
+    """
+    budget = _current_budget.get()
+    if budget is not None or not seconds:
+        yield budget
+        return
+    budget = CpuBudget(seconds, clock)
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def check_budget():
+    """
+    Vérifie le budget actif, s'il y en a un (appel peu coûteux sinon).
+
+    Lève:
+        BudgetExceeded: Si le budget de la requête est épuisé
+    """
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.check()
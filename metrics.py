@@ -0,0 +1,209 @@
+"""
+Module metrics - Compteurs et histogrammes au format Prometheus
+
+Ce module fournit une instrumentation légère de la chaîne requête/calcul :
+des compteurs et des histogrammes à étiquettes, enregistrés dans un registre
+qui produit le format texte d'exposition de Prometheus (version 0.0.4) :
+
+    registry = Registry()
+    parse_seconds = registry.histogram('calculator_parse_seconds', "...")
+    parse_seconds.observe(0.000002)
+    print(registry.render())
+
+Chaque mise à jour est une recherche dichotomique dans les bornes de
+l'histogramme et quelques additions, sous un verrou. Lorsque les métriques
+sont désactivées, les appelants (voir app.py) n'appellent simplement pas ces
+méthodes : aucun coût n'est ajouté au chemin de calcul.
+
+Le nombre de combinaisons d'étiquettes d'une métrique est borné
+(max_series) : au-delà, les nouvelles valeurs sont regroupées sous
+l'étiquette "other", pour qu'un message d'erreur contenant du texte saisi ne
+puisse pas faire grossir le registre indéfiniment.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+
+# Bornes par défaut des histogrammes de durée (secondes), de 1 µs à 10 s
+DEFAULT_BUCKETS = (
+    1e-06, 2.5e-06, 5e-06, 1e-05, 2.5e-05, 5e-05, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0,
+)
+
+OVERFLOW_LABEL = 'other'
+
+
+class _Metric:
+    """Base commune des compteurs et histogrammes : nom, aide et étiquettes."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labels=(), max_series=100):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.max_series = max_series
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, values):
+        """Clé de série, regroupée sous "other" au-delà de max_series."""
+        if values in self._series or len(self._series) < self.max_series:
+            return values
+        return (OVERFLOW_LABEL,) * len(values)
+
+    def _label_text(self, values, extra=()):
+        """Formate les étiquettes {nom="valeur",...} d'une série."""
+        pairs = list(zip(self.labels, values)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def render(self):
+        """Retourne les lignes du format d'exposition pour cette métrique."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            series = sorted(self._series.items())
+            lines.extend(self._render_series(series))
+        return lines
+
+    def clear(self):
+        """Supprime toutes les séries."""
+        with self._lock:
+            self._series.clear()
+
+
+class Counter(_Metric):
+    """Compteur monotone à étiquettes."""
+
+    kind = 'counter'
+
+    def inc(self, *values, amount=1):
+        """
+        Incrémente la série correspondant aux valeurs d'étiquettes.
+
+        Entrées:
+            values (str): Une valeur par étiquette, dans l'ordre de labels
+            amount (float): Incrément
+        """
+        with self._lock:
+            key = values if values in self._series else self._key(values)
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, *values):
+        """Retourne la valeur courante d'une série (0 si absente)."""
+        return self._series.get(values, 0)
+
+    def _render_series(self, series):
+        return [f"{self.name}{self._label_text(key)} {_number(value)}" for key, value in series]
+
+
+class Histogram(_Metric):
+    """
+    Histogramme à étiquettes (bornes cumulatives, somme et nombre).
+
+    Attributs:
+        buckets (tuple): Bornes supérieures croissantes des intervalles
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS, max_series=100):
+        super().__init__(name, documentation, labels, max_series)
+        self.buckets = tuple(buckets)
+
+    def observe(self, amount, *values):
+        """
+        Enregistre une observation.
+
+        Entrées:
+            amount (float): La valeur observée (ex: une durée en secondes)
+            values (str): Une valeur par étiquette, dans l'ordre de labels
+        """
+        # Indice du premier intervalle dont la borne est >= amount
+        index = bisect_left(self.buckets, amount)
+        with self._lock:
+            state = self._series.get(values)
+            if state is None:
+                # [nombre par intervalle (+ un pour +Inf), somme]
+                state = self._series.setdefault(self._key(values), [[0] * (len(self.buckets) + 1), 0.0])
+            state[0][index] += 1
+            state[1] += amount
+
+    def count(self, *values):
+        """Retourne le nombre d'observations d'une série (0 si absente)."""
+        state = self._series.get(values)
+        return sum(state[0]) if state is not None else 0
+
+    def _render_series(self, series):
+        lines = []
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = (('le', '+Inf'),) if bound == math.inf else (('le', _number(bound)),)
+                lines.append(f"{self.name}_bucket{self._label_text(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Ensemble de métriques exposées ensemble sur /metrics."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, documentation, labels=(), **options):
+        """Crée et enregistre un compteur."""
+        return self._register(Counter(name, documentation, labels, **options))
+
+    def histogram(self, name, documentation, labels=(), **options):
+        """Crée et enregistre un histogramme."""
+        return self._register(Histogram(name, documentation, labels, **options))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def clear(self):
+        """Remet toutes les métriques à zéro."""
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self, gauges=()):
+        """
+        Produit le texte d'exposition Prometheus de toutes les métriques.
+
+        Entrées:
+            gauges (iterable): Valeurs ponctuelles supplémentaires, sous forme
+                               de tuples (nom, aide, valeur) (ex: taille du cache)
+
+        Sorties:
+            str: Le texte d'exposition, terminé par un saut de ligne
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, documentation, value in gauges:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    """Échappe une valeur d'étiquette (barre oblique inverse, guillemet, saut de ligne)."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    """Formate une valeur numérique selon le format d'exposition."""
+    if value is None:
+        return 'NaN'
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
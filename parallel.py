@@ -0,0 +1,200 @@
+"""
+Module parallel - Évaluation parallèle de lots sur plusieurs processus
+
+calculate() s'exécute sur un seul cœur à cause du GIL. Ce module répartit les
+grands lots d'expressions sur un pool persistant de processus :
+
+    - Chaque worker importe app (donc operators et OPS) une seule fois, à
+      son démarrage.
+    - Les blocs sont transmis sous forme compacte : un tableau de longueurs
+      (array('I')) et les expressions concaténées en UTF-8, plutôt qu'une
+      liste de chaînes sérialisée élément par élément par pickle.
+    - Les résultats reviennent sous forme de tableaux (array('d') pour les
+      valeurs) accompagnés des seules erreurs, puis sont réassemblés dans
+      l'ordre d'entrée.
+    - La taille des blocs s'adapte au nombre de workers, à la taille du lot
+      et au coût par expression mesuré lors des lots précédents.
+
+Les résultats sont identiques à ceux de app.evaluate_batch() : une liste de
+tuples (résultat, erreur) dans l'ordre d'entrée.
+"""
+
+import math
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+_calculate = None
+
+
+def _init_worker():
+    """Initialisation d'un worker : importe app et operators une seule fois."""
+    global _calculate
+    from app import calculate
+    _calculate = calculate
+
+
+def pack(expressions):
+    """
+    Encode un bloc d'expressions en deux tampons compacts.
+
+    Les éléments qui ne sont pas des chaînes sont encodés comme des chaînes
+    vides, ce qui produit la même erreur ("empty expression") dans calculate().
+    Les surrogates isolés (possibles dans un corps JSON) sont conservés
+    ('surrogatepass') : calculate() les refuse alors élément par élément.
+
+    Entrées:
+        expressions (sequence): Les expressions du bloc
+
+    Sorties:
+        tuple: (longueurs en octets sous forme de bytes array('I'), données UTF-8)
+    """
+    encoded = [e.encode('utf-8', 'surrogatepass') if isinstance(e, str) else b'' for e in expressions]
+    return array('I', map(len, encoded)).tobytes(), b''.join(encoded)
+
+
+def unpack(lengths, data):
+    """
+    Décode un bloc encodé par pack().
+
+    Sorties:
+        list: Les expressions du bloc
+    """
+    expressions = []
+    position = 0
+    view = memoryview(data)
+    for length in array('I', lengths):
+        expressions.append(str(view[position:position + length], 'utf-8', 'surrogatepass'))
+        position += length
+    return expressions
+
+
+def _evaluate_chunk(lengths, data):
+    """
+    Évalue un bloc encodé dans un worker.
+
+    Sorties:
+        tuple: (valeurs array('d') en bytes, erreurs {indice: message},
+                résultats non flottants {indice: valeur}, durée de calcul)
+    """
+    start = time.perf_counter()
+    calculate = _calculate
+    values = array('d')
+    errors = {}
+    objects = {}
+    for i, expr in enumerate(unpack(lengths, data)):
+        try:
+            value = calculate(expr)
+        except Exception as e:
+            errors[i] = str(e)
+            value = math.nan
+        if value.__class__ is not float:
+            objects[i] = value
+            value = math.nan
+        values.append(value)
+    return values.tobytes(), errors, objects, time.perf_counter() - start
+
+
+class ParallelEvaluator:
+    """
+    Évaluateur de lots réparti sur un pool persistant de processus.
+
+    S'utilise de préférence comme gestionnaire de contexte :
+
+        with ParallelEvaluator(workers=8) as evaluator:
+            rows = evaluator.evaluate(expressions)
+
+    Attributs:
+        workers (int): Nombre de processus du pool
+        min_chunk, max_chunk (int): Bornes de la taille des blocs
+        target_chunk_seconds (float): Durée de calcul visée par bloc
+        inline_below (int): En dessous de cette taille, le lot est évalué
+                            dans le processus courant (pas de coût d'envoi)
+    """
+
+    def __init__(self, workers=None, min_chunk=256, max_chunk=65536,
+                 target_chunk_seconds=0.05, inline_below=2048):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.target_chunk_seconds = target_chunk_seconds
+        self.inline_below = inline_below
+        # Coût moyen (secondes) d'une expression, mesuré dans les workers
+        self.item_cost = None
+        self._pool = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        """Démarre le pool de processus (fait automatiquement au besoin)."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self
+
+    def close(self):
+        """Arrête le pool de processus."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def chunk_size(self, n):
+        """
+        Choisit la taille des blocs pour un lot de n expressions.
+
+        Vise environ quatre blocs par worker (équilibrage de charge), limités
+        à target_chunk_seconds de calcul d'après le coût mesuré, dans les
+        bornes [min_chunk, max_chunk].
+        """
+        size = math.ceil(n / (self.workers * 4))
+        if self.item_cost:
+            size = min(size, round(self.target_chunk_seconds / self.item_cost))
+        return max(self.min_chunk, min(self.max_chunk, size))
+
+    def evaluate(self, expressions):
+        """
+        Évalue un lot d'expressions en parallèle.
+
+        Entrées:
+            expressions (sequence): Les expressions à évaluer
+
+        Sorties:
+            list: Tuples (résultat, erreur) dans l'ordre d'entrée
+        """
+        n = len(expressions)
+        if n == 0:
+            return []
+        if n < self.inline_below:
+            _init_worker()
+            values, errors, objects, _ = _evaluate_chunk(*pack(expressions))
+            return _rows(values, errors, objects)
+
+        self.start()
+        size = self.chunk_size(n)
+        chunks = [pack(expressions[i:i + size]) for i in range(0, n, size)]
+        rows = []
+        busy = 0.0
+        for values, errors, objects, seconds in self._pool.map(_evaluate_chunk, *zip(*chunks)):
+            rows.extend(_rows(values, errors, objects))
+            busy += seconds
+
+        # Moyenne glissante du coût par expression pour les prochains lots
+        cost = busy / n
+        self.item_cost = cost if self.item_cost is None else 0.8 * self.item_cost + 0.2 * cost
+        return rows
+
+
+def _rows(values, errors, objects):
+    """Reconstruit les tuples (résultat, erreur) d'un bloc."""
+    rows = []
+    for i, value in enumerate(array('d', values)):
+        if i in errors:
+            rows.append((None, errors[i]))
+        else:
+            rows.append((objects.get(i, value), None))
+    return rows
@@ -0,0 +1,204 @@
+"""
+Module precompute - Table précalculée des résultats, lue par mmap
+
+Une grande partie du trafic porte sur un ensemble fini d'expressions : "a op b"
+pour de petits entiers saisis au clavier de index.html. Ce module évalue tout
+ce domaine une fois avec calculate() et l'écrit dans un fichier binaire
+compact. La route index() y lit ensuite les résultats par mmap : la
+recherche est un simple calcul d'indice, sans copie, et les pages du fichier
+sont partagées par tous les processus workers via le cache du système.
+
+Format du fichier (petit-boutiste) :
+
+    En-tête (24 octets, HEADER) :
+        magic        8s   b'CALCTBL\\0'
+        version      H    FORMAT_VERSION
+        record_size  H    taille d'un enregistrement (9)
+        low, high    i i  bornes incluses des opérandes entiers (le second
+                          opérande, sans signe pour la saisie, va de
+                          max(low, 0) à high)
+        ops          4s   symboles des opérateurs, dans l'ordre des blocs
+                          (complétés par des octets nuls s'il y en a moins de 4)
+    Enregistrements (RECORD = '<dB', 9 octets), un par (op, a, b) :
+        value        d    le résultat de calculate("a op b")
+        status       B    STATUS_OK, ou STATUS_LIVE si le résultat doit être
+                          recalculé (erreur, résultat non flottant)
+
+    Indice de (op, a, b) : (op_index * n + (a - low)) * m + (b - max(low, 0)),
+    avec n = high - low + 1 et m = high - max(low, 0) + 1 (0 si high < 0).
+
+Utilisation:
+    python precompute.py build results.table --low -99 --high 99
+    python precompute.py info results.table
+
+La table doit être reconstruite (commande build) après toute modification
+de operators.py ; un fichier d'une autre version du format est refusé.
+"""
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+
+MAGIC = b'CALCTBL\x00'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<8sHHii4s')
+RECORD = struct.Struct('<dB')
+
+STATUS_OK = 0
+STATUS_LIVE = 1
+
+# Forme acceptée par la table : deux entiers ASCII (signe facultatif devant le
+# premier) et un opérateur, avec des espaces autour des éléments seulement.
+# Toute autre forme est évaluée normalement.
+_KEY_RE = re.compile(r' *([-+]?[0-9]{1,9}) *([-+*/]) *([0-9]{1,9}) *')
+
+
+class PrecomputedTable:
+    """
+    Table précalculée ouverte en lecture par mmap.
+
+    Attributs:
+        low, high (int): Bornes incluses des opérandes
+        ops (str): Symboles des opérateurs de la table
+        path (str): Chemin du fichier
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, record_size, low, high, ops = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: not a precomputed table")
+            if version != FORMAT_VERSION or record_size != RECORD.size:
+                raise ValueError(f"{path}: unsupported table version {version}, rebuild it")
+            self.low = low
+            self.high = high
+            self.ops = ops.rstrip(b'\x00').decode('ascii')
+            self._size = high - low + 1
+            # Second opérande : sans signe (voir _KEY_RE)
+            self._right_low = max(low, 0)
+            self._right_size = max(high - self._right_low + 1, 0)
+            expected = HEADER.size + len(self.ops) * self._size * self._right_size * RECORD.size
+            if len(self._map) != expected:
+                raise ValueError(f"{path}: truncated table, rebuild it")
+        except Exception:
+            self._map.close()
+            raise
+        self._op_index = {op: i for i, op in enumerate(self.ops)}
+
+    def lookup(self, expr):
+        """
+        Cherche le résultat précalculé d'une expression.
+
+        Entrées:
+            expr (str): L'expression telle que saisie (ex: "12+7")
+
+        Sorties:
+            float | None: Le résultat de calculate(expr), ou None si
+                          l'expression est hors du domaine de la table ou doit
+                          être évaluée normalement (erreur, résultat complexe)
+        """
+        match = _KEY_RE.fullmatch(expr)
+        if match is None:
+            return None
+        left, op_char, right = match.groups()
+        a = int(left)
+        b = int(right)
+        low = self.low
+        if not (low <= a <= self.high and self._right_low <= b <= self.high):
+            return None
+        if not a and left[0] == '-':
+            # "-0" vaut -0.0 pour calculate() : le signe du résultat peut différer
+            return None
+        op_index = self._op_index.get(op_char)
+        if op_index is None:
+            # Opérateur absent d'une table construite pour un sous-ensemble
+            return None
+        index = (op_index * self._size + (a - low)) * self._right_size + (b - self._right_low)
+        value, status = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+        return value if status == STATUS_OK else None
+
+    def close(self):
+        """Libère la projection mémoire."""
+        self._map.close()
+
+
+def build(path, low, high, func=None, ops=None):
+    """
+    Évalue le domaine complet et écrit la table de manière atomique.
+
+    Entrées:
+        path (str): Fichier de sortie
+        low, high (int): Bornes incluses des opérandes entiers
+        func (callable): Fonction de calcul (calculate de app.py par défaut)
+        ops (str): Symboles des opérateurs (ceux de OPS par défaut)
+
+    Sorties:
+        int: Le nombre d'enregistrements écrits
+    """
+    if func is None or ops is None:
+        from app import OP_SYMBOLS, calculate
+        func = func or calculate
+        ops = ops or ''.join(OP_SYMBOLS)
+    if high < low:
+        raise ValueError("high must be greater than or equal to low")
+    if not 0 < len(ops) <= 4:
+        raise ValueError("ops must contain 1 to 4 operators")
+
+    operands = range(low, high + 1)
+    # _KEY_RE n'accepte pas de signe devant le second opérande : les valeurs
+    # négatives ne seraient jamais lues
+    right_operands = range(max(low, 0), high + 1)
+    pack = RECORD.pack
+    temporary = path + '.tmp'
+    count = 0
+    with open(temporary, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, low, high, ops.encode('ascii')))
+        for op_char in ops:
+            # Un bloc par premier opérande : écritures groupées
+            for a in operands:
+                records = []
+                for b in right_operands:
+                    try:
+                        value = func(f"{a}{op_char}{b}")
+                    except Exception:
+                        value = None
+                    if value.__class__ is float:
+                        records.append(pack(value, STATUS_OK))
+                    else:
+                        records.append(pack(0.0, STATUS_LIVE))
+                f.write(b''.join(records))
+                count += len(records)
+    os.replace(temporary, path)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Table précalculée des résultats")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help="construit (ou reconstruit) la table")
+    build_parser.add_argument('path')
+    build_parser.add_argument('--low', type=int, default=-99)
+    build_parser.add_argument('--high', type=int, default=99)
+    info_parser = commands.add_parser('info', help="affiche l'en-tête d'une table")
+    info_parser.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        count = build(args.path, args.low, args.high)
+        print(f"{args.path}: {count} records, {os.path.getsize(args.path)} bytes")
+    else:
+        table = PrecomputedTable(args.path)
+        print(f"{args.path}: version {FORMAT_VERSION}, operands [{table.low}, {table.high}], "
+              f"operators {table.ops!r}")
+        table.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Module profiler - Profileur par échantillonnage des requêtes
+
+Profileur statistique à faible surcoût, activé requête par requête :
+
+    profiler = SamplingProfiler(interval=0.001)
+    with profiler.profile('index'):
+        ...  # traitement de la requête
+
+Pendant qu'au moins une requête est profilée, un thread d'échantillonnage
+relève toutes les `interval` secondes la pile d'appels des threads concernés
+(sys._current_frames()) et compte chaque pile. Le reste du temps, ce thread
+est bloqué sur un événement et ne coûte rien.
+
+Les piles agrégées sont produites au format « collapsed stacks » attendu par
+les outils de flame graph (flamegraph.pl, speedscope, inferno) :
+
+    index;app.py:index;app.py:evaluate;app.py:calculate 12
+
+Avec le GIL, le thread d'échantillonnage ne peut relever une pile que
+lorsque le thread profilé lui cède la main. Pendant un profilage,
+l'intervalle de bascule entre threads (sys.setswitchinterval) est donc
+abaissé à `interval`, puis rétabli dès qu'aucune requête n'est profilée.
+
+La mémoire est bornée : au-delà de max_stacks piles distinctes, les
+nouvelles piles sont comptées sous "[truncated]".
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+TRUNCATED = '[truncated]'
+
+
+class SamplingProfiler:
+    """
+    Profileur par échantillonnage des threads de requête.
+
+    Attributs:
+        interval (float): Période d'échantillonnage en secondes
+        max_depth (int): Nombre maximal de cadres conservés par pile
+        max_stacks (int): Nombre maximal de piles distinctes
+        samples (int): Nombre total d'échantillons relevés
+        profiled (int): Nombre de blocs profilés (requêtes)
+    """
+
+    def __init__(self, interval=0.001, max_depth=64, max_stacks=10000):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self.samples = 0
+        self.profiled = 0
+        self._stacks = Counter()
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread = None
+
+    @contextmanager
+    def profile(self, label):
+        """
+        Profile le thread courant pendant le bloc with.
+
+        Entrées:
+            label (str): Racine des piles relevées (ex: nom de la route)
+        """
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._targets[thread_id] = label
+            self.profiled += 1
+            self._ensure_thread()
+            self._active.set()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._targets.pop(thread_id, None)
+                if not self._targets:
+                    self._active.clear()
+
+    def _ensure_thread(self):
+        """Démarre le thread d'échantillonnage au premier profilage."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='calculator-profiler', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Boucle du thread d'échantillonnage."""
+        while True:
+            # Bloqué (sans aucun coût) tant qu'aucune requête n'est profilée
+            self._active.wait()
+            previous = sys.getswitchinterval()
+            sys.setswitchinterval(min(previous, self.interval))
+            try:
+                while self._active.is_set():
+                    time.sleep(self.interval)
+                    self.sample()
+            finally:
+                sys.setswitchinterval(previous)
+
+    def sample(self):
+        """Relève une fois la pile de chaque thread profilé."""
+        frames = sys._current_frames()
+        with self._lock:
+            for thread_id, label in self._targets.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = self._collapse(label, frame)
+                if stack not in self._stacks and len(self._stacks) >= self.max_stacks:
+                    stack = f"{label};{TRUNCATED}"
+                self._stacks[stack] += 1
+                self.samples += 1
+
+    def _collapse(self, label, frame):
+        """Construit la pile "label;fichier:fonction;..." de la racine vers la feuille."""
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        names.append(label)
+        names.reverse()
+        return ';'.join(names)
+
+    def collapsed(self):
+        """
+        Retourne les piles agrégées au format collapsed stacks.
+
+        Sorties:
+            str: Une ligne "pile nombre" par pile distincte, triées par pile
+        """
+        with self._lock:
+            items = sorted(self._stacks.items())
+        return ''.join(f"{stack} {count}\n" for stack, count in items)
+
+    def write(self, path):
+        """Écrit les piles agrégées dans un fichier (pour flamegraph.pl, speedscope...)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
+
+    def reset(self):
+        """Efface les piles agrégées et les compteurs."""
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+            self.profiled = 0
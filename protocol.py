@@ -0,0 +1,117 @@
+"""
+Module protocol - Format binaire compact pour les clients programmatiques
+
+Les services qui appellent la calculatrice en masse n'ont besoin ni du
+formulaire, ni du HTML, ni de l'analyse des expressions. La route
+/api/binary accepte un corps d'enregistrements de taille fixe et répond avec
+un enregistrement par calcul, dans le même ordre (petit-boutiste) :
+
+    Requête  (REQUEST  = '<B7xdd', 24 octets) :
+        op      B    code de l'opérateur (voir OP_CODES dans app.py)
+        (7 octets de remplissage, pour aligner les opérandes)
+        left    d    opérande gauche (float64)
+        right   d    opérande droit (float64)
+
+    Réponse  (RESPONSE = '<dB7x', 16 octets) :
+        value   d    le résultat (NaN si status n'est pas STATUS_OK)
+        status  B    voir STATUS_* ci-dessous
+        (7 octets de remplissage)
+
+Les enregistrements sont décodés d'un bloc par struct.iter_unpack sur une
+memoryview du corps, sans copie ni analyse de texte, puis calculés avec les
+fonctions de OPS : le résultat et les erreurs sont ceux de calculate() sur
+l'expression "left op right".
+"""
+
+import struct
+
+REQUEST = struct.Struct('<B7xdd')
+RESPONSE = struct.Struct('<dB7x')
+
+MIMETYPE = 'application/octet-stream'
+
+# Codes de statut d'un calcul
+STATUS_OK = 0
+STATUS_ZERO_DIVISION = 1    # ZeroDivisionError (ex: divide(a, 0))
+STATUS_OVERFLOW = 2         # OverflowError (ex: puissance trop grande)
+STATUS_NOT_REAL = 3         # Résultat complexe (puissance d'une base négative)
+STATUS_INVALID_OPERATOR = 4  # Code d'opérateur inconnu
+STATUS_ERROR = 5            # Toute autre erreur de calcul
+
+_NAN = float('nan')
+
+
+class ProtocolError(ValueError):
+    """Corps de requête qui n'est pas une suite d'enregistrements REQUEST."""
+
+
+def evaluate_records(data, funcs):
+    """
+    Calcule chaque enregistrement d'un corps de requête.
+
+    Entrées:
+        data (bytes-like): Le corps, une suite d'enregistrements REQUEST
+        funcs (sequence): Fonctions des opérateurs indexées par code
+                          (les valeurs de OPS, dans l'ordre de OP_CODES)
+
+    Sorties:
+        bytes: Un enregistrement RESPONSE par enregistrement de la requête
+
+    Lève:
+        ProtocolError: Si la taille du corps n'est pas un multiple de REQUEST.size
+    """
+    view = memoryview(data).cast('B')
+    if len(view) % REQUEST.size:
+        raise ProtocolError(f"body length must be a multiple of {REQUEST.size} bytes")
+
+    out = bytearray(len(view) // REQUEST.size * RESPONSE.size)
+    pack_into = RESPONSE.pack_into
+    op_count = len(funcs)
+    offset = 0
+    for op, a, b in REQUEST.iter_unpack(view):
+        if op < op_count:
+            try:
+                value = funcs[op](a, b)
+            except ZeroDivisionError:
+                value, status = _NAN, STATUS_ZERO_DIVISION
+            except OverflowError:
+                value, status = _NAN, STATUS_OVERFLOW
+            except Exception:
+                value, status = _NAN, STATUS_ERROR
+            else:
+                if value.__class__ is float:
+                    status = STATUS_OK
+                else:
+                    value, status = _NAN, STATUS_NOT_REAL
+        else:
+            value, status = _NAN, STATUS_INVALID_OPERATOR
+        pack_into(out, offset, value, status)
+        offset += RESPONSE.size
+    return bytes(out)
+
+
+def encode_requests(records):
+    """
+    Encode des calculs au format de requête (côté client).
+
+    Entrées:
+        records (iterable): Des tuples (code d'opérateur, gauche, droite)
+
+    Sorties:
+        bytes: Le corps de la requête
+    """
+    pack = REQUEST.pack
+    return b''.join([pack(op, a, b) for op, a, b in records])
+
+
+def decode_responses(data):
+    """
+    Décode un corps de réponse (côté client).
+
+    Entrées:
+        data (bytes-like): Le corps de la réponse
+
+    Sorties:
+        list: Des tuples (valeur, statut), dans l'ordre de la requête
+    """
+    return list(RESPONSE.iter_unpack(data))
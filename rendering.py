@@ -0,0 +1,112 @@
+"""
+Module rendering - Rendu pré-calculé de la page de la calculatrice
+
+Le template index.html est presque entièrement statique : seule la valeur du
+champ d'affichage (variable Jinja2 `result`) change d'une requête à l'autre.
+Ce module rend le template une seule fois avec un marqueur à la place du
+résultat, découpe le HTML obtenu autour de ce marqueur, puis construit chaque
+page en insérant le résultat échappé entre les deux morceaux.
+
+Le HTML produit est identique octet pour octet à celui de render_template().
+La page vide (GET) est mémorisée avec son ETag pour permettre des réponses
+304 Not Modified.
+"""
+
+import hashlib
+import threading
+import time
+
+from flask import render_template
+from markupsafe import Markup, escape
+
+# Marqueur inséré à la place du résultat lors du rendu de la coquille
+_SENTINEL = '\x00calculator-result\x00'
+
+
+class PageShell:
+    """
+    Coquille pré-rendue d'un template, découpée autour du résultat.
+
+    Attributs:
+        prefix (str): HTML précédant la valeur du résultat
+        suffix (str): HTML suivant la valeur du résultat
+        empty_page (bytes): Page complète avec un résultat vide (GET)
+        etag (str): ETag de la page vide
+        last_modified (float): Date du rendu de la coquille (timestamp)
+    """
+
+    __slots__ = ('prefix', 'suffix', 'empty_page', 'etag', 'last_modified')
+
+    def __init__(self, html):
+        if html.count(_SENTINEL) != 1:
+            raise ValueError("template must render the result exactly once")
+        self.prefix, self.suffix = html.split(_SENTINEL)
+        self.empty_page = (self.prefix + self.suffix).encode('utf-8')
+        self.etag = hashlib.sha1(self.empty_page).hexdigest()
+        self.last_modified = int(time.time())
+
+    def render(self, result):
+        """
+        Construit la page avec le résultat échappé, comme le ferait Jinja2.
+
+        Entrées:
+            result: La valeur à afficher (nombre, message d'erreur ou "")
+
+        Sorties:
+            str: Le HTML complet de la page
+        """
+        return self.prefix + str(escape(result)) + self.suffix
+
+
+class PageRenderer:
+    """
+    Fabrique de pages pré-rendues pour un template donné.
+
+    La coquille est rendue à la première utilisation dans le contexte de
+    requête courant, puis réutilisée. Une coquille distincte est conservée
+    par variante (ex: préfixe d'URL de l'application, pour que les liens
+    générés par url_for() restent corrects, ou options du template).
+    """
+
+    def __init__(self, template='index.html', **context):
+        self.template = template
+        self.context = context
+        self._shells = {}
+        self._lock = threading.Lock()
+
+    def shell(self, variant=''):
+        """
+        Retourne la coquille pré-rendue, en la rendant si nécessaire.
+
+        Doit être appelée dans un contexte de requête Flask.
+
+        Entrées:
+            variant (hashable): Clé identifiant tout ce dont dépend le rendu
+                                en dehors du résultat (préfixe d'URL, options)
+
+        Sorties:
+            PageShell: La coquille du template
+        """
+        shell = self._shells.get(variant)
+        if shell is None:
+            with self._lock:
+                shell = self._shells.get(variant)
+                if shell is None:
+                    html = render_template(self.template, result=Markup(_SENTINEL), **self.context)
+                    shell = self._shells[variant] = PageShell(html)
+        return shell
+
+    def cached(self, variant=''):
+        """
+        Retourne la coquille déjà rendue pour cette variante, sans contexte
+        de requête.
+
+        Sorties:
+            PageShell | None: La coquille, ou None si elle n'est pas encore rendue
+        """
+        return self._shells.get(variant)
+
+    def invalidate(self):
+        """Oublie les coquilles rendues (ex: après modification du template)."""
+        with self._lock:
+            self._shells.clear()
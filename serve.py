@@ -0,0 +1,143 @@
+"""
+Module serve - Lanceur de production multi-processus
+
+Remplace app.run(debug=True) (serveur de développement, un seul processus)
+par un serveur préforké basé sur gunicorn :
+
+    python serve.py --workers 8 --threads 4 --bind 0.0.0.0:8000
+
+Fonctionnement:
+    - Par défaut, le module app (et donc OPS, les automates de
+      parse_expression() et la coquille pré-rendue de index.html) est chargé
+      dans le processus maître avant le fork, pour que les workers partagent
+      ces pages mémoire en copie sur écriture.
+    - SIGHUP redémarre les workers gracieusement (les anciens terminent leurs
+      requêtes en cours), mais en préchargement ils sont forkés depuis le
+      maître, qui a déjà importé app : le code et les templates modifiés ne
+      sont PAS relus. Pour déployer une nouvelle version, faire une mise à
+      jour binaire :
+
+          kill -USR2 <maître>   # nouveau maître (ré-exécuté) et ses workers
+          kill -WINCH <ancien>  # arrêt gracieux des anciens workers
+          kill -QUIT <ancien>   # arrêt de l'ancien maître
+
+      Avec --preload 0 (CALC_PRELOAD=0), chaque worker importe app après le
+      fork : SIGHUP recharge alors le code, au prix de la mémoire partagée
+      et d'une préparation par worker.
+    - Chaque worker est recyclé après max_requests requêtes (plus un décalage
+      aléatoire, max_requests_jitter, pour ne pas les recycler tous ensemble).
+
+Chaque option peut aussi être fournie par une variable d'environnement
+(CALC_WORKERS, CALC_THREADS, CALC_BACKLOG, CALC_BIND, CALC_MAX_REQUESTS,
+CALC_MAX_REQUESTS_JITTER, CALC_TIMEOUT, CALC_GRACEFUL_TIMEOUT, CALC_PRELOAD) ; la ligne de
+commande a priorité sur l'environnement.
+
+Dépendance:
+    gunicorn (pip install gunicorn, systèmes POSIX uniquement)
+"""
+
+import argparse
+import os
+
+
+def _flag(value):
+    """Convertit une valeur booléenne textuelle (1/0, true/false, yes/no, on/off)."""
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes', 'on'):
+        return True
+    if text in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f"invalid boolean: {value!r}")
+
+# Options du serveur : nom -> (variable d'environnement, type, valeur par défaut)
+OPTIONS = {
+    'bind': ('CALC_BIND', str, '127.0.0.1:8000'),
+    'workers': ('CALC_WORKERS', int, os.cpu_count() or 1),
+    'threads': ('CALC_THREADS', int, 1),
+    'backlog': ('CALC_BACKLOG', int, 2048),
+    'max_requests': ('CALC_MAX_REQUESTS', int, 10000),
+    'max_requests_jitter': ('CALC_MAX_REQUESTS_JITTER', int, 1000),
+    'timeout': ('CALC_TIMEOUT', int, 30),
+    'graceful_timeout': ('CALC_GRACEFUL_TIMEOUT', int, 30),
+    'preload': ('CALC_PRELOAD', _flag, True),
+}
+
+
+def build_options(args=None, environ=None):
+    """
+    Construit la configuration gunicorn à partir de la ligne de commande et
+    de l'environnement.
+
+    Entrées:
+        args (argparse.Namespace): Options de la ligne de commande (None = aucune)
+        environ (dict): Variables d'environnement (os.environ par défaut)
+
+    Sorties:
+        dict: Les paramètres de configuration gunicorn
+    """
+    environ = os.environ if environ is None else environ
+    options = {}
+    for name, (variable, kind, default) in OPTIONS.items():
+        value = getattr(args, name, None) if args is not None else None
+        if value is None:
+            value = kind(environ[variable]) if variable in environ else default
+        options[name] = value
+
+    options['worker_class'] = 'gthread' if options['threads'] > 1 else 'sync'
+    options['preload_app'] = options.pop('preload')
+    return options
+
+
+def preload():
+    """
+    Charge et prépare l'application : dans le processus maître avant le fork
+    en préchargement, sinon dans chaque worker.
+
+    Importe app.py (OPS, automates compilés) et appelle warm_up() : premier
+    calcul, template compilé et coquille de index.html rendue, pour que ces
+    objets soient partagés par tous les workers.
+
+    Sorties:
+        Flask: L'application à servir
+    """
+    from app import app, warm_up
+
+    warm_up()
+    return app
+
+
+def run(options):
+    """
+    Démarre le serveur gunicorn préforké avec les options données.
+
+    Entrées:
+        options (dict): Configuration retournée par build_options()
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class CalculatorServer(BaseApplication):
+        """
+        Application gunicorn servant le module app ; gunicorn appelle load()
+        dans le maître en préchargement, sinon dans chaque worker.
+        """
+
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return preload()
+
+    CalculatorServer().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de production de la calculatrice")
+    for name, (variable, kind, default) in OPTIONS.items():
+        parser.add_argument('--' + name.replace('_', '-'), type=kind, default=None,
+                            help=f"défaut : ${variable} ou {default}")
+    run(build_options(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
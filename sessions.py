@@ -0,0 +1,175 @@
+"""
+Module sessions - Accumulateurs de calcul par client, côté serveur
+
+En mode session, le serveur conserve le résultat courant (l'accumulateur)
+de chaque client : au lieu de renvoyer toute l'expression affichée à chaque
+calcul, le client n'envoie que l'opérateur et l'opérande suivants, et le
+calcul est incrémental (une seule fonction de OPS appliquée à
+l'accumulateur).
+
+Le magasin est borné :
+    - max_sessions : au-delà, la session la moins récemment utilisée est
+      évincée (LRU) ;
+    - idle_ttl : une session inutilisée pendant plus de idle_ttl secondes
+      expire.
+Chaque session n'occupe qu'une entrée de taille fixe (identifiant, date
+d'échéance, valeur), la mémoire totale est donc bornée par max_sessions.
+
+Le magasin est local au processus : avec plusieurs workers (serve.py), une
+session inconnue du worker qui reçoit la requête est traitée comme expirée,
+et le client la recrée à partir de la valeur affichée.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+class SessionExpired(LookupError):
+    """Session inconnue, expirée ou évincée."""
+
+
+class SessionStore:
+    """
+    Magasin LRU borné des accumulateurs, avec expiration d'inactivité.
+
+    Attributs:
+        max_sessions (int): Nombre maximal de sessions conservées
+        idle_ttl (float): Durée d'inactivité avant expiration, en secondes
+        created, evictions, expirations (int): Compteurs d'utilisation
+    """
+
+    def __init__(self, max_sessions=10000, idle_ttl=1800.0, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        # Identifiant -> [échéance, valeur], du moins au plus récemment utilisé
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self, value=0.0):
+        """
+        Crée une session.
+
+        Entrées:
+            value: Valeur initiale de l'accumulateur
+
+        Sorties:
+            str: Identifiant de la session (aléatoire, non devinable)
+        """
+        session_id = secrets.token_urlsafe(16)
+        now = self._clock()
+        with self._lock:
+            self._purge(now)
+            self._sessions[session_id] = [now + self.idle_ttl, value]
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+            self.created += 1
+        return session_id
+
+    def get(self, session_id):
+        """
+        Retourne la valeur de l'accumulateur.
+
+        Lève:
+            SessionExpired: Si la session est inconnue ou expirée
+        """
+        with self._lock:
+            return self._entry(session_id, self._clock())[1]
+
+    def set(self, session_id, value):
+        """
+        Remplace la valeur de l'accumulateur.
+
+        Lève:
+            SessionExpired: Si la session est inconnue ou expirée
+        """
+        with self._lock:
+            self._entry(session_id, self._clock())[1] = value
+
+    def apply(self, session_id, func, operand):
+        """
+        Applique une opération à l'accumulateur : valeur = func(valeur, operand).
+
+        L'accumulateur n'est pas modifié si func lève une exception.
+
+        Entrées:
+            session_id (str): Identifiant de la session
+            func (callable): Fonction de OPS (ex: add)
+            operand (float): Opérande droit
+
+        Sorties:
+            Le nouveau résultat
+
+        Lève:
+            SessionExpired: Si la session est inconnue ou expirée
+            Les exceptions de func (ex: ZeroDivisionError)
+        """
+        with self._lock:
+            entry = self._entry(session_id, self._clock())
+            entry[1] = func(entry[1], operand)
+            return entry[1]
+
+    def delete(self, session_id):
+        """Supprime une session (sans erreur si elle n'existe pas)."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _entry(self, session_id, now):
+        """Entrée d'une session valide, marquée comme récemment utilisée (verrou tenu)."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            raise SessionExpired("unknown or expired session")
+        if entry[0] <= now:
+            del self._sessions[session_id]
+            self.expirations += 1
+            raise SessionExpired("unknown or expired session")
+        entry[0] = now + self.idle_ttl
+        self._sessions.move_to_end(session_id)
+        return entry
+
+    def _purge(self, now):
+        """
+        Supprime les sessions expirées (verrou tenu).
+
+        Les sessions sont rangées par dernière utilisation et ont toutes la
+        même durée d'inactivité : les expirées sont en tête.
+        """
+        sessions = self._sessions
+        while sessions:
+            session_id, entry = next(iter(sessions.items()))
+            if entry[0] > now:
+                break
+            del sessions[session_id]
+            self.expirations += 1
+
+    def clear(self):
+        """Supprime toutes les sessions et remet les compteurs à zéro."""
+        with self._lock:
+            self._sessions.clear()
+            self.created = self.evictions = self.expirations = 0
+
+    def stats(self):
+        """
+        Retourne les compteurs d'utilisation du magasin.
+
+        Sorties:
+            dict: Nombre de sessions, limites et compteurs
+        """
+        with self._lock:
+            return {
+                'size': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'idle_ttl': self.idle_ttl,
+                'created': self.created,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
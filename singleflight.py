@@ -0,0 +1,197 @@
+"""
+Module singleflight - Regroupement des calculs identiques simultanés
+
+Lors d'un pic de trafic, plusieurs requêtes portent souvent sur la même
+expression au même moment (ex: un tableau de bord qui envoie la même requête
+depuis plusieurs onglets). Un « vol unique » (single-flight) garantit qu'un
+seul calcul est en cours par clé : les appelants arrivés pendant ce calcul
+attendent son résultat au lieu de le refaire, et reçoivent la même valeur ou
+la même erreur.
+
+Deux variantes :
+    SingleFlight       - Appelants multi-thread (serveur Flask, pool ASGI)
+    AsyncSingleFlight  - Coroutines d'une même boucle d'événements (asgi.py) ;
+                         les appelants en attente n'occupent aucun thread
+
+Les compteurs (leaders, coalesced) indiquent combien de calculs ont été
+effectués et combien d'appels ont été servis par un calcul déjà en cours.
+
+asyncio n'est importé que par AsyncSingleFlight.do() : app.py importe ce
+module, et asyncio allongerait le démarrage de chaque processus (workers,
+scripts) qui n'utilise pas le serveur ASGI.
+"""
+
+import threading
+
+
+def _copy_error(error):
+    """
+    Nouvelle instance de l'exception pour un appelant en attente.
+
+    Chaque appelant lève sa propre instance : une instance partagée
+    accumulerait les tracebacks de tous les threads.
+    """
+    try:
+        return type(error)(*error.args)
+    except Exception:
+        return error
+
+
+class _Call:
+    """Calcul en cours : résultat et verrous des appelants en attente."""
+
+    __slots__ = ('waiters', 'value', 'error')
+
+    def __init__(self):
+        # Un verrou par appelant en attente, créé seulement s'il y en a : le
+        # cas courant (aucun appel simultané) ne paie aucune synchronisation
+        # supplémentaire
+        self.waiters = []
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Vol unique pour des appelants multi-thread.
+
+    Attributs:
+        leaders (int): Nombre de calculs effectivement exécutés
+        coalesced (int): Nombre d'appels servis par un calcul déjà en cours
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args):
+        """
+        Exécute func(*args), sauf si un calcul de même clé est déjà en cours.
+
+        Entrées:
+            key: Clé identifiant le calcul (ex: expression normalisée)
+            func (callable): La fonction de calcul
+            args: Ses arguments
+
+        Sorties:
+            Le résultat de func(*args), calculé par cet appel ou par un autre
+
+        Lève:
+            L'exception levée par le calcul (une instance par appelant)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                waiter = None
+            else:
+                self.coalesced += 1
+                waiter = threading.Lock()
+                waiter.acquire()
+                call.waiters.append(waiter)
+
+        if waiter is not None:
+            # Bloqué jusqu'à ce que le meneur libère ce verrou
+            waiter.acquire()
+            if call.error is not None:
+                raise _copy_error(call.error)
+            return call.value
+
+        try:
+            call.value = func(*args)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            for waiter in call.waiters:
+                waiter.release()
+
+    def stats(self):
+        """
+        Sorties:
+            dict: Compteurs leaders, coalesced et nombre de calculs en cours
+        """
+        with self._lock:
+            return {'leaders': self.leaders, 'coalesced': self.coalesced, 'inflight': len(self._calls)}
+
+    def reset(self):
+        """Remet les compteurs à zéro (les calculs en cours ne sont pas affectés)."""
+        with self._lock:
+            self.leaders = self.coalesced = 0
+
+
+class AsyncSingleFlight:
+    """
+    Vol unique pour des coroutines d'une même boucle d'événements.
+
+    Attributs:
+        leaders (int): Nombre de calculs effectivement exécutés
+        coalesced (int): Nombre d'appels servis par un calcul déjà en cours
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key, func, *args):
+        """
+        Attend func(*args) (une coroutine), sauf si un calcul de même clé est en cours.
+
+        Entrées:
+            key: Clé identifiant le calcul
+            func (callable): Fonction retournant un objet awaitable
+            args: Ses arguments
+
+        Sorties:
+            Le résultat du calcul
+
+        Lève:
+            L'exception levée par le calcul (une instance par appelant)
+        """
+        import asyncio
+
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                # shield : l'annulation d'un appelant en attente n'annule pas
+                # le calcul partagé
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                raise _copy_error(e)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        try:
+            value = await func(*args)
+        except Exception as e:
+            future.set_exception(e)
+            # Marque l'exception comme consultée (pas d'avertissement si
+            # aucun appelant n'attendait)
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._calls[key]
+
+    def stats(self):
+        """
+        Sorties:
+            dict: Compteurs leaders, coalesced et nombre de calculs en cours
+        """
+        return {'leaders': self.leaders, 'coalesced': self.coalesced, 'inflight': len(self._calls)}
@@ -0,0 +1,164 @@
+/**
+ * Évaluation côté client des expressions de la calculatrice
+ *
+ * Reproduit la grammaire de parse_expression() (app.py) et la sémantique des
+ * opérateurs de operators.py pour évaluer les expressions simples dans le
+ * navigateur, sans aller-retour serveur. Attention : '*' est une puissance.
+ *
+ * evaluateLocally() retourne la valeur à afficher (identique à celle que
+ * produirait le serveur), ou null lorsque le résultat ne peut pas être
+ * garanti identique (opérande que seul float() de Python accepte, division
+ * par zéro, puissance non entière, résultat non fini...). Dans ce cas,
+ * l'appelant doit demander le calcul au serveur. Seuls le moteur 'single'
+ * et le backend 'float' du serveur sont reproduits : avec un autre moteur
+ * (EXPRESSION_ENGINE) ou backend (NUMERIC_BACKEND), tout est délégué.
+ *
+ * Utilisable dans le navigateur (window.Calculator) et sous Node.js
+ * (module.exports) pour les tests de conformité.
+ */
+(function (root) {
+  "use strict";
+
+  // Même automate que _EXPRESSION_RE dans app.py
+  var EXPRESSION_RE = /^([-+]?[^-+*/]+)([-+*/])([^-+*/]+)$/;
+  var OPERATOR_RE = /[-+*/]/g;
+  // Sous-ensemble des nombres acceptés par float() que Number() lit à l'identique
+  var NUMBER_RE = /^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$/;
+
+  /**
+   * Analyse une expression comme parse_expression() en Python
+   * @param {string} expr - L'expression saisie
+   * @returns {{left: string, op: string, right: string} | {error: string}}
+   */
+  function parseExpression(expr) {
+    if (!expr) {
+      return { error: "empty expression" };
+    }
+    var s = expr.split(" ").join("");
+    var match = EXPRESSION_RE.exec(s);
+    if (match) {
+      return { left: match[1], op: match[2], right: match[3] };
+    }
+
+    // Positions des opérateurs, en ignorant un signe + ou - initial
+    var start = s.length > 1 && (s[0] === "+" || s[0] === "-") ? 1 : 0;
+    var positions = [];
+    var found;
+    OPERATOR_RE.lastIndex = start;
+    while ((found = OPERATOR_RE.exec(s)) !== null) {
+      positions.push(found.index);
+    }
+    if (positions.length === 0) {
+      return { error: "invalid expression format" };
+    }
+    if (positions.length > 1) {
+      return { error: "only one operator is allowed" };
+    }
+    var opPos = positions[0];
+    if (opPos === 0 || opPos === s.length - 1) {
+      return { error: "invalid expression format" };
+    }
+    return { left: s.slice(0, opPos), op: s[opPos], right: s.slice(opPos + 1) };
+  }
+
+  /**
+   * Formate un nombre comme str(float) en Python (ex: 8 -> "8.0", 1e16 -> "1e+16")
+   * @param {number} x - Un nombre fini
+   * @returns {string}
+   */
+  function formatFloat(x) {
+    if (x === 0) {
+      return 1 / x < 0 ? "-0.0" : "0.0";
+    }
+    // toExponential() sans argument donne la plus courte représentation exacte
+    var parts = /^(-?)(\d)(?:\.(\d+))?e([-+]\d+)$/.exec(x.toExponential());
+    var sign = parts[1];
+    var digits = parts[2] + (parts[3] || "");
+    var exponent = parseInt(parts[4], 10);
+
+    if (exponent < -4 || exponent >= 16) {
+      var mantissa = digits[0] + (digits.length > 1 ? "." + digits.slice(1) : "");
+      var abs = Math.abs(exponent);
+      return sign + mantissa + "e" + (exponent < 0 ? "-" : "+") + (abs < 10 ? "0" : "") + abs;
+    }
+    if (exponent < 0) {
+      return sign + "0." + "0".repeat(-exponent - 1) + digits;
+    }
+    while (digits.length <= exponent) {
+      digits += "0";
+    }
+    var fraction = digits.slice(exponent + 1) || "0";
+    return sign + digits.slice(0, exponent + 1) + "." + fraction;
+  }
+
+  /**
+   * Applique un opérateur avec la sémantique de operators.py
+   * @returns {number | null} Le résultat, ou null s'il doit venir du serveur
+   */
+  function applyOperator(op, a, b) {
+    var result;
+    switch (op) {
+      case "+":
+        result = a + b;
+        break;
+      case "-":
+        result = a - b;
+        break;
+      case "/":
+        if (b === 0) {
+          return null;
+        }
+        result = a / b;
+        break;
+      case "*":
+        // Puissance : seuls les résultats entiers exacts sont garantis
+        // identiques entre Math.pow et pow() de la bibliothèque C
+        if (!Number.isInteger(a) || !Number.isInteger(b) || b < 0) {
+          return null;
+        }
+        result = Math.pow(a, b);
+        if (!Number.isSafeInteger(result)) {
+          return null;
+        }
+        break;
+      default:
+        return null;
+    }
+    return Number.isFinite(result) ? result : null;
+  }
+
+  /**
+   * Évalue une expression dans le navigateur
+   * @param {string} expr - L'expression saisie
+   * @param {{engine: string, backend: string}} [options] - Moteur et backend
+   *        du serveur (attributs data-engine et data-backend du formulaire)
+   * @returns {string | null} La valeur à afficher, ou null pour déléguer au serveur
+   */
+  function evaluateLocally(expr, options) {
+    if (options && ((options.engine && options.engine !== "single") ||
+                    (options.backend && options.backend !== "float"))) {
+      return null;
+    }
+    var parsed = parseExpression(expr);
+    if (parsed.error) {
+      return "Error: " + parsed.error;
+    }
+    if (!NUMBER_RE.test(parsed.left) || !NUMBER_RE.test(parsed.right)) {
+      return null;
+    }
+    var result = applyOperator(parsed.op, Number(parsed.left), Number(parsed.right));
+    return result === null ? null : formatFloat(result);
+  }
+
+  var Calculator = {
+    parseExpression: parseExpression,
+    formatFloat: formatFloat,
+    evaluateLocally: evaluateLocally,
+  };
+
+  if (typeof module !== "undefined" && module.exports) {
+    module.exports = Calculator;
+  } else {
+    root.Calculator = Calculator;
+  }
+})(this);
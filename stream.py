@@ -0,0 +1,237 @@
+"""
+Module stream - Évaluation en flux de gros fichiers d'expressions
+
+Ce module lit des expressions "a op b" (une par ligne) depuis un fichier ou
+l'entrée standard, les évalue par blocs avec calculate() et écrit les
+résultats en NDJSON ou en CSV au fur et à mesure. La mémoire utilisée reste
+constante quelle que soit la taille de l'entrée : rien n'est chargé en entier.
+
+Chaque enregistrement de sortie contient la position (en octets) de la ligne
+dans l'entrée, ce qui permet de reprendre un traitement interrompu avec
+--offset (et --first-line pour la numérotation des lignes), ou
+automatiquement avec --checkpoint. Le point de reprise enregistre aussi la
+taille de la sortie à la fin du dernier bloc : en reprise, les
+enregistrements écrits après ce point (bloc interrompu, dernière ligne
+incomplète) sont tronqués avant de compléter la sortie.
+
+Utilisation:
+    python stream.py expressions.txt -o results.ndjson
+    cat expressions.txt | python stream.py - --format csv
+    python stream.py big.txt -o out.ndjson --checkpoint big.offset
+    python stream.py big.txt -o rest.ndjson --offset 1048576 --first-line 90001
+
+Bibliothèque:
+    read_expressions(stream, offset)  - Générateur des lignes et de leurs positions
+    evaluate_stream(records, ...)     - Générateur de résultats, par blocs
+    write_ndjson(results, out)        - Écriture NDJSON
+    write_csv(results, out)           - Écriture CSV
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from itertools import islice
+
+from app import calculate, _serialize_result
+
+CSV_FIELDS = ('line', 'offset', 'expression', 'result', 'error')
+
+
+def read_expressions(stream, offset=0, first_line=1):
+    """
+    Lit les expressions d'un flux binaire, ligne par ligne.
+
+    Entrées:
+        stream: Flux binaire (fichier ouvert en 'rb' ou sys.stdin.buffer)
+        offset (int): Position en octets à partir de laquelle reprendre
+        first_line (int): Numéro attribué à la première ligne lue
+
+    Sorties:
+        generator: Tuples (offset, numéro de ligne, expression, next_offset)
+                   où offset est la position du début de la ligne dans le
+                   flux et next_offset celle de la ligne suivante
+    """
+    if offset:
+        if stream.seekable():
+            stream.seek(offset)
+        else:
+            # Flux non positionnable (stdin) : on consomme les octets à sauter
+            remaining = offset
+            while remaining:
+                skipped = stream.read(min(remaining, 1 << 16))
+                if not skipped:
+                    break
+                remaining -= len(skipped)
+
+    position = offset
+    for number, raw in enumerate(iter(stream.readline, b''), start=first_line):
+        expression = raw.rstrip(b'\r\n').decode('utf-8', 'replace')
+        next_position = position + len(raw)
+        yield position, number, expression, next_position
+        position = next_position
+
+
+def evaluate_stream(records, chunk_size=1000, func=calculate, on_chunk=None):
+    """
+    Évalue un flux d'expressions par blocs.
+
+    Entrées:
+        records (iterable): Tuples retournés par read_expressions()
+        chunk_size (int): Nombre d'expressions traitées par bloc
+        func (callable): La fonction de calcul (calculate par défaut)
+        on_chunk (callable): Appelée avec la position de reprise après chaque
+                             bloc entièrement produit (ex: checkpoint)
+
+    Sorties:
+        generator: Dictionnaires {line, offset, expression, result | error},
+                   dans l'ordre d'entrée ; error contient le message de
+                   l'exception (ex: "operands must be numbers")
+    """
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        for offset, line, expression, _ in chunk:
+            record = {'line': line, 'offset': offset, 'expression': expression}
+            try:
+                record['result'] = _serialize_result(func(expression))
+            except Exception as e:
+                record['error'] = str(e)
+            yield record
+        if on_chunk is not None:
+            # Position de reprise : début de la ligne suivant le bloc. Le
+            # générateur ne reprend ici qu'une fois le dernier enregistrement
+            # du bloc consommé (écrit) par l'appelant.
+            _, last_line, _, next_offset = chunk[-1]
+            on_chunk(next_offset, last_line + 1)
+
+
+def write_ndjson(results, out):
+    """
+    Écrit les résultats en NDJSON (un objet JSON par ligne).
+
+    Sorties:
+        int: Le nombre d'enregistrements écrits
+    """
+    count = 0
+    for record in results:
+        out.write(json.dumps(record) + '\n')
+        count += 1
+    return count
+
+
+def write_csv(results, out, header=True):
+    """
+    Écrit les résultats en CSV (colonnes CSV_FIELDS).
+
+    Sorties:
+        int: Le nombre d'enregistrements écrits
+    """
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS, lineterminator='\n')
+    if header:
+        writer.writeheader()
+    count = 0
+    for record in results:
+        writer.writerow(record)
+        count += 1
+    return count
+
+
+def _read_checkpoint(path):
+    """
+    Lit la position de reprise enregistrée.
+
+    Sorties:
+        tuple: (offset, ligne, taille de la sortie ou None), ou (0, 1, None)
+               sans point de reprise (un ancien point de reprise sans taille
+               de sortie donne None)
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            fields = [int(field) for field in f.read().split()]
+    except (OSError, ValueError):
+        return 0, 1, None
+    if len(fields) == 2:
+        return fields[0], fields[1], None
+    if len(fields) == 3:
+        return tuple(fields)
+    return 0, 1, None
+
+
+def _write_checkpoint(path, offset, line, output_size=None):
+    """
+    Enregistre la position de reprise de manière atomique (taille de la
+    sortie omise si elle est inconnue, ex: sortie standard).
+    """
+    fields = (offset, line) if output_size is None else (offset, line, output_size)
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(' '.join(map(str, fields)) + '\n')
+    os.replace(temporary, path)
+
+
+def _truncate_output(path, size):
+    """
+    Ramène la sortie à la taille enregistrée au dernier point de reprise :
+    les enregistrements d'un bloc interrompu seraient sinon écrits deux fois.
+    """
+    try:
+        if os.path.getsize(path) > size:
+            os.truncate(path, size)
+    except OSError:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Évaluation en flux d'expressions")
+    parser.add_argument('input', help="fichier d'expressions, ou - pour l'entrée standard")
+    parser.add_argument('-o', '--output', help="fichier de sortie (sortie standard par défaut)")
+    parser.add_argument('--format', choices=('ndjson', 'csv'), default='ndjson')
+    parser.add_argument('--offset', type=int, default=None, help="position de reprise en octets")
+    parser.add_argument('--first-line', type=int, default=1,
+                        help="numéro de la ligne située à --offset (numérotation des lignes)")
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--checkpoint', help="fichier de reprise mis à jour après chaque bloc")
+    args = parser.parse_args(argv)
+
+    offset, first_line, output_size = 0, 1, None
+    if args.offset is not None:
+        offset, first_line = args.offset, args.first_line
+    elif args.checkpoint:
+        offset, first_line, output_size = _read_checkpoint(args.checkpoint)
+    resuming = offset > 0
+
+    source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    # En reprise, la sortie est complétée plutôt qu'écrasée, après avoir
+    # retiré ce qui suit le dernier point de reprise
+    if args.output and resuming and output_size is not None:
+        _truncate_output(args.output, output_size)
+    out = (open(args.output, 'a' if resuming else 'w', encoding='utf-8', newline='')
+           if args.output else sys.stdout)
+
+    def on_chunk(next_offset, next_line):
+        out.flush()
+        if args.checkpoint:
+            # Taille de la sortie en octets (fichier de sortie uniquement)
+            size = out.tell() if args.output else None
+            _write_checkpoint(args.checkpoint, next_offset, next_line, size)
+
+    try:
+        records = read_expressions(source, offset, first_line)
+        results = evaluate_stream(records, args.chunk_size, on_chunk=on_chunk)
+        if args.format == 'csv':
+            write_csv(results, out, header=not resuming)
+        else:
+            write_ndjson(results, out)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -10,4 +10,17 @@ Structure:
     test_routes.py - Tests d'intégration pour les routes Flask
 
 Pour exécuter les tests, voir tests/README.md
+
+Utilitaires partagés:
+    FakeClock - Horloge manuelle (cache, garde, sessions, admission)
 """
+
+
+class FakeClock:
+    """Horloge manipulable pour tester les durées et expirations sans attendre."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
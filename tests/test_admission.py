@@ -0,0 +1,325 @@
+"""
+Tests unitaires pour le contrôle d'admission (admission.py)
+
+Vérifie la limite de concurrence (file bornée, rejet anticipé, délai
+d'attente), sa version asynchrone, la limite de débit par client, et
+l'intégration dans l'application Flask (refus 429/503 et /api/stats).
+
+Fonctions testées:
+    - ConcurrencyLimiter.acquire() / release(): Limite pour les threads
+    - AsyncConcurrencyLimiter.acquire() / release(): Limite pour les coroutines
+    - TokenBuckets.take(client): Seau à jetons par client
+    - Rejected: Statut et délai Retry-After
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as app_module
+from app import app
+from admission import AsyncConcurrencyLimiter, ConcurrencyLimiter, Rejected, TokenBuckets
+from tests import FakeClock
+
+
+@pytest.fixture
+def client():
+    """Client de test Flask."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestRejected:
+    """
+    Tests de l'exception de refus
+    """
+
+    def test_retry_after_rounded_up(self):
+        """
+        Test du délai Retry-After.
+
+        Vérifie l'arrondi à la seconde supérieure, au moins 1
+        """
+        assert Rejected("x", 503, 0.01).retry_after == 1
+        assert Rejected("x", 429, 2.2).retry_after == 3
+        assert Rejected("x").status == 503
+
+
+class TestConcurrencyLimiter:
+    """
+    Tests de la limite de concurrence pour les threads
+    """
+
+    def test_admits_up_to_limit(self):
+        """
+        Test des admissions immédiates.
+
+        Vérifie que max_concurrent requêtes passent sans attendre
+        """
+        limiter = ConcurrencyLimiter(max_concurrent=2, max_queue=0)
+        starts = [limiter.acquire(), limiter.acquire()]
+        assert limiter.stats()['active'] == 2
+        for start in starts:
+            limiter.release(start)
+        assert limiter.stats()['active'] == 0
+        assert limiter.stats()['admitted'] == 2
+
+    def test_queue_full_is_rejected(self):
+        """
+        Test de la file pleine.
+
+        Vérifie le refus immédiat (503) lorsque la file est bornée à zéro
+        """
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=0)
+        limiter.acquire()
+        with pytest.raises(Rejected) as info:
+            limiter.acquire()
+        assert info.value.status == 503
+        assert limiter.stats()['shed_queue_full'] == 1
+
+    def test_long_expected_wait_is_rejected(self):
+        """
+        Test du rejet anticipé.
+
+        Vérifie qu'une requête est refusée sans attendre lorsque la durée
+        moyenne des évaluations dépasse l'attente maximale
+        """
+        clock = FakeClock()
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=10, queue_timeout=0.1, clock=clock)
+        for _ in range(20):
+            start = limiter.acquire()
+            clock.now += 1.0
+            limiter.release(start)
+        limiter.acquire()
+        with pytest.raises(Rejected, match="expected wait"):
+            limiter.acquire()
+        assert limiter.stats()['shed_overload'] == 1
+        assert limiter.stats()['waiting'] == 0
+
+    def test_queue_timeout(self):
+        """
+        Test du délai d'attente.
+
+        Vérifie qu'une requête en file est refusée après queue_timeout
+        """
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        limiter.acquire()
+        with pytest.raises(Rejected, match="timeout"):
+            limiter.acquire()
+        assert limiter.stats()['timeouts'] == 1
+        assert limiter.stats()['waiting'] == 0
+
+    def test_waiter_admitted_on_release(self):
+        """
+        Test de l'attente en file.
+
+        Vérifie qu'une requête en attente est admise dès qu'une place se libère
+        """
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=5.0)
+        start = limiter.acquire()
+        admitted = []
+        waiter = threading.Thread(target=lambda: admitted.append(limiter.acquire()))
+        waiter.start()
+        while limiter.stats()['waiting'] == 0:
+            time.sleep(0.001)
+        limiter.release(start)
+        waiter.join(5)
+        assert len(admitted) == 1
+        assert limiter.stats()['queued'] == 1
+        assert limiter.stats()['active'] == 1
+
+
+class TestAsyncConcurrencyLimiter:
+    """
+    Tests de la limite de concurrence pour les coroutines
+    """
+
+    def test_fifo_hand_off(self):
+        """
+        Test de la transmission des places.
+
+        Vérifie que les places libérées vont aux requêtes en attente, dans
+        l'ordre d'arrivée
+        """
+        async def scenario():
+            limiter = AsyncConcurrencyLimiter(max_concurrent=1, max_queue=2, queue_timeout=5.0)
+            order = []
+
+            async def worker(name):
+                start = await limiter.acquire()
+                order.append(name)
+                await asyncio.sleep(0)
+                limiter.release(start)
+
+            await asyncio.gather(worker('a'), worker('b'), worker('c'))
+            return order, limiter.stats()
+
+        order, stats = asyncio.run(scenario())
+        assert order == ['a', 'b', 'c']
+        assert stats['active'] == 0
+        assert stats['queued'] == 2
+
+    def test_queue_full_and_timeout(self):
+        """
+        Test du refus asynchrone.
+
+        Vérifie le refus immédiat quand la file est pleine, puis l'expiration
+        de l'attente
+        """
+        async def scenario():
+            limiter = AsyncConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+            await limiter.acquire()
+            waiting = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            with pytest.raises(Rejected, match="queue full"):
+                await limiter.acquire()
+            with pytest.raises(Rejected, match="timeout"):
+                await waiting
+            return limiter.stats()
+
+        stats = asyncio.run(scenario())
+        assert (stats['shed_queue_full'], stats['timeouts'], stats['waiting']) == (1, 1, 0)
+
+
+class TestTokenBuckets:
+    """
+    Tests de la limite de débit par client
+    """
+
+    def test_burst_then_limited(self):
+        """
+        Test d'une rafale.
+
+        Vérifie que burst requêtes passent, puis le refus 429 avec le délai
+        avant le prochain jeton, et la recharge
+        """
+        clock = FakeClock()
+        buckets = TokenBuckets(rate=2.0, burst=3, clock=clock)
+        for _ in range(3):
+            buckets.take('10.0.0.1')
+        with pytest.raises(Rejected) as info:
+            buckets.take('10.0.0.1')
+        assert info.value.status == 429
+        buckets.take('10.0.0.2')  # un autre client a son propre seau
+        clock.now += 0.5
+        buckets.take('10.0.0.1')
+        assert buckets.stats()['limited'] == 1
+
+    def test_clients_bounded(self):
+        """
+        Test du nombre de clients suivis.
+
+        Vérifie que le client le moins récent est oublié au-delà de max_clients
+        """
+        buckets = TokenBuckets(rate=1.0, burst=1, max_clients=2, clock=FakeClock())
+        for client in ('a', 'b', 'c'):
+            buckets.take(client)
+        assert buckets.stats()['clients'] == 2
+        buckets.take('a')  # oublié : repart avec un seau plein
+
+
+class TestAdmissionRoutes:
+    """
+    Tests de l'intégration dans l'application Flask
+    """
+
+    def test_disabled_by_default(self, client):
+        """
+        Test de la configuration par défaut.
+
+        Vérifie que les évaluations ne passent pas par le limiteur
+        """
+        admitted = app_module.admission_limiter.stats()['admitted']
+        client.post('/api/calculate', json={'expression': '1+1'})
+        assert app_module.admission_limiter.stats()['admitted'] == admitted
+
+    def test_admitted_and_released(self, client, monkeypatch):
+        """
+        Test d'une requête admise.
+
+        Vérifie le résultat et la libération de la place après la réponse
+        """
+        monkeypatch.setitem(app.config, 'ADMISSION_ENABLED', True)
+        response = client.post('/api/calculate', json={'expression': '2+3'})
+        assert response.get_json()['result'] == 5
+        assert app_module.admission_limiter.stats()['active'] == 0
+
+    def test_overload_returns_503(self, client, monkeypatch):
+        """
+        Test d'une surcharge.
+
+        Vérifie la réponse 503 avec Retry-After lorsque la limite est atteinte
+        """
+        monkeypatch.setitem(app.config, 'ADMISSION_ENABLED', True)
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=0)
+        monkeypatch.setattr(app_module, 'admission_limiter', limiter)
+        limiter.acquire()
+        response = client.post('/', data={'display': '1+1'})
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert client.get('/').status_code == 200  # la page n'est pas limitée
+
+    def test_rate_limit_returns_429(self, client, monkeypatch):
+        """
+        Test de la limite de débit.
+
+        Vérifie la réponse 429 et les compteurs de /api/stats
+        """
+        monkeypatch.setitem(app.config, 'ADMISSION_ENABLED', True)
+        monkeypatch.setattr(app_module, 'rate_limiter', TokenBuckets(rate=0.5, burst=1))
+        assert client.post('/api/calculate', json={'expression': '1+1'}).status_code == 200
+        response = client.post('/api/calculate', json={'expression': '1+1'})
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '2'
+        # Corps affichable par la page (évaluation côté client, repli fetch)
+        assert response.get_json()['display'] == "Error: " + response.get_json()['error']
+        admission = client.get('/api/stats').get_json()['admission']
+        assert admission['enabled'] is True
+        assert admission['rate_limit']['limited'] == 1
+        assert 'threads' in admission
+
+    def test_asgi_fast_path(self, monkeypatch):
+        """
+        Test du chemin rapide ASGI.
+
+        Vérifie la réponse 503 avec Retry-After du limiteur asynchrone
+        """
+        from asgi import CalculatorASGI
+        monkeypatch.setitem(app.config, 'ADMISSION_ENABLED', True)
+        scope = {'type': 'http', 'method': 'POST', 'path': '/api/calculate', 'headers': [],
+                 'client': ('127.0.0.1', 5000)}
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'{"expression": "1+1"}', 'more_body': False}
+
+        async def send(message):
+            sent.append(message)
+
+        async def scenario():
+            asgi_app.admission = AsyncConcurrencyLimiter(max_concurrent=1, max_queue=0)
+            await asgi_app.admission.acquire()
+            await asgi_app(scope, receive, send)
+
+        asgi_app = CalculatorASGI(app)
+        try:
+            asyncio.run(scenario())
+        finally:
+            asgi_app.shutdown()
+        assert sent[0]['status'] == 503
+        assert (b'retry-after', b'1') in sent[0]['headers']
+        assert json.loads(sent[1]['body'])['display'].startswith("Error: ")
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_admission.py
+    pytest.main([__file__, "-v"])
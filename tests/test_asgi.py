@@ -0,0 +1,193 @@
+"""
+Tests d'intégration pour le point d'entrée ASGI (asgi.py)
+
+Les requêtes sont envoyées directement à l'application ASGI avec asyncio,
+sans démarrer de serveur. Les réponses sont comparées à celles de
+l'application Flask (WSGI).
+
+Routes testées:
+    - GET / et POST / : servis par la boucle d'événements
+    - POST /api/calculate : évaluation JSON
+    - Autres routes : transmises à Flask via la passerelle WSGI
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app
+from asgi import CalculatorASGI
+
+
+async def _request(asgi_app, method, path, body=b'', headers=()):
+    """Envoie une requête HTTP à l'application ASGI et collecte la réponse."""
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'root_path': '',
+        'query_string': b'', 'http_version': '1.1', 'scheme': 'http',
+        'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in headers],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 1234),
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi_app(scope, receive, send)
+    start = sent[0]
+    content = b''.join(m.get('body', b'') for m in sent[1:])
+    return start['status'], dict(start['headers']), content
+
+
+def request(method, path, body=b'', headers=()):
+    """Exécute une requête sur une application ASGI neuve."""
+    asgi_app = CalculatorASGI(app)
+    try:
+        return asyncio.run(_request(asgi_app, method, path, body, headers))
+    finally:
+        asgi_app.shutdown()
+
+
+@pytest.fixture
+def client():
+    """Client de test Flask pour comparer les réponses WSGI."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestASGIIndex:
+    """
+    Tests de la page servie par la boucle d'événements
+    """
+
+    def test_get_matches_wsgi(self, client):
+        """
+        Test de GET / en ASGI.
+
+        Vérifie que la page est identique à celle de Flask et porte un ETag
+        """
+        status, headers, content = request('GET', '/')
+        assert status == 200
+        assert content == client.get('/').data
+        assert b'etag' in headers
+
+    def test_get_not_modified(self):
+        """
+        Test d'un GET conditionnel en ASGI.
+
+        Vérifie que l'ETag reçu permet d'obtenir 304
+        """
+        _, headers, _ = request('GET', '/')
+        etag = headers[b'etag'].decode()
+        status, _, content = request('GET', '/', headers=[('if-none-match', etag)])
+        assert status == 304
+        assert content == b''
+
+    def test_post_matches_wsgi(self, client):
+        """
+        Test de POST / en ASGI.
+
+        Vérifie que le résultat et les erreurs sont rendus comme avec Flask
+        """
+        for expression in ('5%2B3', '5%2F0', ''):
+            status, _, content = request(
+                'POST', '/', body=f'display={expression}'.encode(),
+                headers=[('content-type', 'application/x-www-form-urlencoded')])
+            assert status == 200
+            expected = client.post('/', data=f'display={expression}',
+                                   content_type='application/x-www-form-urlencoded').data
+            assert content == expected
+
+
+class TestASGIApi:
+    """
+    Tests des routes d'API en ASGI
+    """
+
+    def test_api_calculate(self):
+        """
+        Test de POST /api/calculate en ASGI.
+
+        Vérifie le résultat et la valeur affichée
+        """
+        status, _, content = request('POST', '/api/calculate', body=b'{"expression": "2*3"}')
+        assert status == 200
+        assert json.loads(content) == {'display': '8.0', 'result': 8.0}
+
+    def test_wsgi_fallback(self):
+        """
+        Test de la passerelle WSGI.
+
+        Vérifie qu'une route non accélérée (/api/batch) est servie par Flask
+        """
+        status, headers, content = request(
+            'POST', '/api/batch', body=b'["1+1", "5+3-2"]',
+            headers=[('content-type', 'application/json')])
+        assert status == 200
+        assert json.loads(content)['results'][1] == {'error': 'only one operator is allowed'}
+
+    @pytest.mark.parametrize('path', ['/api/calculate', '/api/binary', '/api/batch'])
+    def test_body_too_large(self, monkeypatch, path):
+        """
+        Test d'un corps trop volumineux.
+
+        Vérifie la réponse 413, que le corps soit annoncé par Content-Length
+        ou seulement reçu
+        """
+        monkeypatch.setitem(app.config, 'BATCH_MAX_BYTES', 16)
+        body = b'{"expression": "1+1"}'
+        status, _, content = request('POST', path, body=body)
+        assert status == 413
+        assert json.loads(content) == {'error': 'request body too large'}
+        status, _, _ = request('POST', path, headers=[('content-length', '4096')])
+        assert status == 413
+
+    def test_shell_cached_without_request_context(self, monkeypatch):
+        """
+        Test de la coquille en cache.
+
+        Vérifie qu'aucun contexte de requête Flask n'est créé une fois la
+        coquille rendue
+        """
+        request('GET', '/')
+        created = []
+        original = app.test_request_context
+        monkeypatch.setattr(app, 'test_request_context',
+                            lambda *a, **kw: created.append(a) or original(*a, **kw))
+        status, _, _ = request('POST', '/', body=b'display=1%2B1',
+                               headers=[('content-type', 'application/x-www-form-urlencoded')])
+        assert status == 200
+        assert created == []
+
+    def test_lifespan(self):
+        """
+        Test du cycle de vie ASGI.
+
+        Vérifie que le démarrage et l'arrêt sont acquittés
+        """
+        asgi_app = CalculatorASGI(app)
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(asgi_app({'type': 'lifespan'}, receive, send))
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_asgi.py
+    pytest.main([__file__, "-v"])
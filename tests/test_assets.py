@@ -0,0 +1,249 @@
+"""
+Tests unitaires pour le transfert des ressources (assets.py)
+
+Vérifie les URL statiques versionnées et leur cache immutable, la
+génération et le service des variantes précompressées, et la compression
+négociée des pages de index() (Flask et serveur ASGI).
+
+Fonctions testées:
+    - negotiate(accept_encoding, available): Choix du codage
+    - StaticAssets.version() / variant(): Empreintes et variantes
+    - build(folder): Variantes précompressées
+    - GET /static/<fichier> et index() : En-têtes de cache et compression
+"""
+
+import asyncio
+import gzip
+import re
+import shutil
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as app_module
+from app import app, page_renderer
+from assets import StaticAssets, build, negotiate
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    """Copie des fichiers statiques, avec leurs variantes précompressées."""
+    folder = tmp_path / 'static'
+    shutil.copytree(app.static_folder, folder, ignore=shutil.ignore_patterns('*.gz', '*.br'))
+    build(str(folder))
+    monkeypatch.setattr(app, 'static_folder', str(folder))
+    monkeypatch.setattr(app_module, 'static_assets', StaticAssets(str(folder)))
+    page_renderer.invalidate()
+    yield folder
+    page_renderer.invalidate()
+
+
+@pytest.fixture
+def client():
+    """Client de test Flask."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestNegotiate:
+    """
+    Tests du choix du codage de contenu
+    """
+
+    @pytest.mark.parametrize('header, expected', [
+        ('gzip, deflate, br', 'br'),
+        ('gzip', 'gzip'),
+        ('br;q=0, gzip', 'gzip'),
+        ('*', 'br'),
+        ('identity', None),
+        ('', None),
+        (None, None),
+    ])
+    def test_negotiate(self, header, expected):
+        """
+        Test de la négociation.
+
+        Vérifie l'ordre de préférence du serveur et le refus par q=0
+        """
+        assert negotiate(header, ('br', 'gzip')) == expected
+
+
+class TestStaticAssets:
+    """
+    Tests des empreintes et des variantes précompressées
+    """
+
+    def test_version_follows_content(self, tmp_path):
+        """
+        Test de l'empreinte.
+
+        Vérifie qu'elle change avec le contenu, et None pour un fichier absent
+        """
+        (tmp_path / 'a.css').write_text('body {}')
+        assets = StaticAssets(str(tmp_path))
+        first = assets.version('a.css')
+        assert re.fullmatch(r'[0-9a-f]{12}', first)
+        (tmp_path / 'a.css').write_text('body { color: red }')
+        assert assets.version('a.css') != first
+        assert assets.version('missing.css') is None
+
+    def test_build_and_variant(self, tmp_path):
+        """
+        Test de la génération des variantes.
+
+        Vérifie le fichier .gz, son choix selon Accept-Encoding, et que les
+        petits fichiers ne sont pas compressés
+        """
+        (tmp_path / 'big.css').write_text('.btn { color: red; }\n' * 100)
+        (tmp_path / 'small.css').write_text('a{}')
+        built = build(str(tmp_path))
+        assert [name for name, *_ in built] == ['big.css']
+        data = gzip.decompress((tmp_path / 'big.css.gz').read_bytes())
+        assert data == (tmp_path / 'big.css').read_bytes()
+        assets = StaticAssets(str(tmp_path))
+        assert assets.variant('big.css', 'gzip') == ('big.css.gz', 'gzip', True)
+        assert assets.variant('big.css', '') == ('big.css', None, True)
+        assert assets.variant('small.css', 'gzip') == ('small.css', None, False)
+
+    def test_stale_variant_ignored(self, tmp_path):
+        """
+        Test d'une variante plus ancienne que l'original.
+
+        Vérifie que l'original est servi
+        """
+        (tmp_path / 'big.css').write_text('.btn { color: red; }\n' * 100)
+        build(str(tmp_path))
+        stat = os.stat(tmp_path / 'big.css.gz')
+        os.utime(tmp_path / 'big.css', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert StaticAssets(str(tmp_path)).variant('big.css', 'gzip')[:2] == ('big.css', None)
+
+
+class TestStaticRoute:
+    """
+    Tests du service des fichiers statiques
+    """
+
+    def _style_url(self, client):
+        page = client.get('/').data
+        return re.search(rb'href="([^"]*style\.css[^"]*)"', page).group(1).decode()
+
+    def test_versioned_url_is_immutable(self, client, static_dir):
+        """
+        Test d'une URL versionnée.
+
+        Vérifie l'empreinte dans l'URL de la page et le cache immutable
+        """
+        url = self._style_url(client)
+        assert url == f"/static/style.css?v={app_module.static_assets.version('style.css')}"
+        response = client.get(url)
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == 31536000
+        assert response.data == (static_dir / 'style.css').read_bytes()
+
+    def test_stale_version_revalidated(self, client, static_dir):
+        """
+        Test d'une ancienne empreinte.
+
+        Vérifie que le fichier n'est pas mis en cache immutable
+        """
+        response = client.get('/static/style.css?v=000000000000')
+        assert not response.cache_control.immutable
+
+    def test_precompressed_variant(self, client, static_dir):
+        """
+        Test de la variante gzip.
+
+        Vérifie le codage, le type de contenu de l'original et Vary
+        """
+        response = client.get('/static/style.css', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.mimetype == 'text/css'
+        assert 'Accept-Encoding' in response.vary
+        assert gzip.decompress(response.data) == (static_dir / 'style.css').read_bytes()
+
+    def test_versioning_disabled(self, client, static_dir, monkeypatch):
+        """
+        Test de STATIC_VERSIONING désactivé.
+
+        Vérifie l'URL d'origine
+        """
+        monkeypatch.setitem(app.config, 'STATIC_VERSIONING', False)
+        assert self._style_url(client) == '/static/style.css'
+
+
+class TestPageCompression:
+    """
+    Tests de la compression des pages de index()
+    """
+
+    def test_post_compressed(self, client):
+        """
+        Test d'une page de résultat.
+
+        Vérifie la page compressée et identique à la page non compressée
+        """
+        plain = client.post('/', data={'display': '2+3'})
+        compressed = client.post('/', data={'display': '2+3'}, headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in plain.headers
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(compressed.data) == plain.data
+        assert 'Accept-Encoding' in compressed.vary
+
+    def test_get_etag_per_encoding(self, client):
+        """
+        Test de la page vide.
+
+        Vérifie un ETag distinct pour la version compressée et la réponse 304
+        """
+        headers = {'Accept-Encoding': 'gzip'}
+        plain = client.get('/')
+        compressed = client.get('/', headers=headers)
+        assert compressed.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+        revalidated = client.get('/', headers={**headers, 'If-None-Match': compressed.headers['ETag']})
+        assert revalidated.status_code == 304
+
+    def test_below_threshold(self, client, monkeypatch):
+        """
+        Test du seuil de taille.
+
+        Vérifie qu'une page plus petite que COMPRESS_MIN_SIZE n'est pas compressée
+        """
+        monkeypatch.setitem(app.config, 'COMPRESS_MIN_SIZE', 1 << 20)
+        response = client.post('/', data={'display': '2+3'}, headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_asgi_fast_path(self, client):
+        """
+        Test du chemin rapide ASGI.
+
+        Vérifie la page compressée et identique à celle de Flask
+        """
+        from asgi import CalculatorASGI
+        scope = {'type': 'http', 'method': 'POST', 'path': '/',
+                 'headers': [(b'content-type', b'application/x-www-form-urlencoded'),
+                             (b'accept-encoding', b'gzip')]}
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'display=2%2B3', 'more_body': False}
+
+        async def send(message):
+            sent.append(message)
+
+        asgi_app = CalculatorASGI(app)
+        try:
+            asyncio.run(asgi_app(scope, receive, send))
+        finally:
+            asgi_app.shutdown()
+        assert (b'content-encoding', b'gzip') in sent[0]['headers']
+        assert gzip.decompress(sent[1]['body']) == client.post('/', data={'display': '2+3'}).data
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_assets.py
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,166 @@
+"""
+Tests unitaires pour les backends numériques (backends.py)
+
+Vérifie la précision des backends 'decimal' et 'fraction', leurs chemins
+rapides, les messages d'erreur et le choix du backend par requête.
+
+Fonctions testées:
+    - calculate(expr, backend): Calcul avec un backend donné
+    - evaluate(expr, backend): Choix du backend par nom (routes)
+"""
+
+import decimal
+from fractions import Fraction
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, calculate, evaluate, BACKENDS
+from backends import DecimalBackend, FractionBackend
+
+
+class TestFractionBackend:
+    """
+    Tests du backend exact (entiers de taille arbitraire et fractions)
+    """
+
+    backend = FractionBackend()
+
+    def test_integer_fast_path(self):
+        """
+        Test du chemin rapide des opérandes entiers.
+
+        Vérifie que les entiers sont convertis en int, sans perte de précision
+        """
+        assert self.backend.parse("-12345678901234567890") == -12345678901234567890
+        assert calculate("12345678901234567891+1", self.backend) == 12345678901234567892
+
+    def test_exact_power(self):
+        """
+        Test de la puissance exacte.
+
+        Vérifie que "3*100" vaut exactement 3^100 (en float, 3.0**100 est arrondi)
+        """
+        assert calculate("3*100", self.backend) == 3 ** 100
+        assert self.backend.apply('*', 2, -2) == Fraction(1, 4)
+        assert calculate("2.5*2", self.backend) == Fraction(25, 4)
+
+    def test_exact_division(self):
+        """
+        Test de la division exacte.
+
+        Vérifie que le quotient est une Fraction, ou un int s'il est entier
+        """
+        assert calculate("1/3", self.backend) == Fraction(1, 3)
+        result = calculate("6/3", self.backend)
+        assert result == 2 and result.__class__ is int
+        assert calculate("0.1+0.2", self.backend) == Fraction(3, 10)
+
+    def test_non_integer_exponent(self):
+        """
+        Test d'un exposant non entier.
+
+        Vérifie le repli sur le calcul en float
+        """
+        assert calculate("4*0.5", self.backend) == 2.0
+
+    def test_errors(self):
+        """
+        Test des erreurs.
+
+        Vérifie les opérandes invalides et la division par zéro
+        """
+        with pytest.raises(ValueError, match="operands must be numbers"):
+            calculate("abc+1", self.backend)
+        with pytest.raises(ValueError, match="operands must be numbers"):
+            calculate("inf+1", self.backend)
+        with pytest.raises(ZeroDivisionError):
+            calculate("1/0", self.backend)
+        with pytest.raises(ZeroDivisionError):
+            self.backend.apply('*', 0, -1)
+
+
+class TestDecimalBackend:
+    """
+    Tests du backend décimal
+    """
+
+    def test_precision(self):
+        """
+        Test de la précision décimale.
+
+        Vérifie que "0.1+0.2" vaut exactement 0.3
+        """
+        assert calculate("0.1+0.2", BACKENDS['decimal']) == decimal.Decimal("0.3")
+
+    def test_configurable_context(self):
+        """
+        Test du contexte configurable.
+
+        Vérifie que la précision du contexte s'applique à la division
+        """
+        backend = DecimalBackend(decimal.Context(prec=5))
+        assert calculate("1/3", backend) == decimal.Decimal("0.33333")
+
+    def test_errors(self):
+        """
+        Test des erreurs.
+
+        Vérifie les messages de division par zéro et d'opérande invalide
+        """
+        backend = BACKENDS['decimal']
+        with pytest.raises(ZeroDivisionError, match="decimal division by zero"):
+            calculate("1/0", backend)
+        with pytest.raises(ValueError, match="operands must be numbers"):
+            calculate("1x+2", backend)
+        with pytest.raises(OverflowError):
+            calculate("10*1000000000", backend)
+
+
+class TestBackendSelection:
+    """
+    Tests du choix du backend par requête
+    """
+
+    def test_evaluate_by_name(self):
+        """
+        Test de evaluate() avec un nom de backend.
+
+        Vérifie que le cache ne mélange pas les résultats des backends
+        """
+        assert evaluate("1/4", "float") == 0.25
+        assert evaluate("1/4", "fraction") == Fraction(1, 4)
+        assert evaluate("1/4", "decimal") == decimal.Decimal("0.25")
+        with pytest.raises(ValueError, match="unknown backend"):
+            evaluate("1+1", "complex")
+
+    def test_api_calculate_backend(self):
+        """
+        Test du champ "backend" de /api/calculate.
+
+        Vérifie qu'un grand entier exact est renvoyé en JSON sans erreur
+        """
+        with app.test_client() as client:
+            response = client.post('/api/calculate', json={'expression': '2*100', 'backend': 'fraction'})
+        assert response.get_json() == {'result': 2 ** 100, 'display': str(2 ** 100)}
+
+    def test_batch_backend(self):
+        """
+        Test du champ "backend" de /api/batch.
+
+        Vérifie la sérialisation des Fraction et Decimal en chaîne
+        """
+        with app.test_client() as client:
+            response = client.post('/api/batch', json={'expressions': ['1/3'], 'backend': 'fraction'})
+            assert response.get_json() == {'results': [{'result': '1/3'}]}
+            response = client.post('/api/batch?backend=decimal', json=['0.1+0.2'])
+            assert response.get_json() == {'results': [{'result': '0.3'}]}
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_backends.py
+    pytest.main([__file__, "-v"])
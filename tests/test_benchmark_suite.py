@@ -0,0 +1,97 @@
+"""
+Tests unitaires pour la suite de benchmarks (benchmarks/suite.py)
+
+Vérifie les statistiques utilisées pour détecter les régressions de
+performance (test t de Welch) et la classification des cas, sans effectuer
+de mesures.
+
+Fonctions testées:
+    - student_t_sf(t, df): Loi de Student
+    - welch_t_test(a, b): Test t de Welch
+    - compare(baseline, current): Détection des régressions
+    - save(path, results) / load(path): Fichiers de référence JSON
+"""
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire benchmarks au path pour pouvoir importer suite
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from suite import compare, load, save, student_t_sf, welch_t_test
+
+
+def case(samples):
+    """Construit un cas de mesures à partir de ses échantillons."""
+    return {'samples': samples}
+
+
+class TestStatistics:
+    """
+    Tests des fonctions statistiques
+    """
+
+    def test_student_t_sf(self):
+        """
+        Test de la loi de Student.
+
+        Vérifie des valeurs de table : P(T > 2) à 10 degrés de liberté, P(T > 0)
+        """
+        assert student_t_sf(2.0, 10) == pytest.approx(0.036694, abs=1e-6)
+        assert student_t_sf(0.0, 5) == pytest.approx(0.5)
+
+    def test_welch_t_test(self):
+        """
+        Test du test de Welch.
+
+        Vérifie la statistique, les degrés de liberté et la p-valeur
+        """
+        t, df, p = welch_t_test([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+        assert t == pytest.approx(5.0)
+        assert df == pytest.approx(8.0)
+        assert p == pytest.approx(0.001053, abs=1e-6)
+
+
+class TestCompare:
+    """
+    Tests de la comparaison à une référence
+    """
+
+    def test_regression_detected(self):
+        """
+        Test d'un ralentissement significatif.
+
+        Vérifie qu'un cas 20 % plus lent est signalé comme régression
+        """
+        baseline = {'calc': case([1.00, 1.01, 0.99, 1.00, 1.02, 0.98])}
+        current = {'calc': case([1.20, 1.21, 1.19, 1.20, 1.22, 1.18])}
+        [row] = compare(baseline, current)
+        assert row['status'] == 'regression'
+        assert row['change'] == pytest.approx(0.2)
+
+    def test_noise_is_not_a_regression(self):
+        """
+        Test d'une différence non significative.
+
+        Vérifie que du bruit de mesure n'est pas signalé
+        """
+        baseline = {'calc': case([1.0, 1.4, 0.8, 1.2, 0.9, 1.1])}
+        current = {'calc': case([1.1, 1.5, 0.8, 1.3, 0.9, 1.2])}
+        assert compare(baseline, current)[0]['status'] == 'ok'
+
+    def test_baseline_round_trip(self, tmp_path):
+        """
+        Test de l'enregistrement d'une référence.
+
+        Vérifie que load() relit les mesures écrites par save()
+        """
+        path = str(tmp_path / 'baseline.json')
+        results = {'calc': {'samples': [1.0, 2.0], 'mean': 1.5, 'stdev': 0.7}}
+        save(path, results)
+        assert load(path) == results
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_benchmark_suite.py
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+"""
+Tests unitaires pour le module cache.py
+
+Ce fichier contient les tests du cache LRU/TTL placé devant calculate() :
+normalisation des clés, mise en cache des erreurs, éviction, expiration et
+compteurs.
+
+Classe testée:
+    - ResultCache: Cache borné des résultats de calcul
+"""
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import calculate
+from cache import ResultCache
+from tests import FakeClock
+
+
+def counting(func):
+    """Enveloppe func en comptant ses appels dans l'attribut calls."""
+    def wrapper(expr):
+        wrapper.calls += 1
+        return func(expr)
+    wrapper.calls = 0
+    return wrapper
+
+
+class TestResultCache:
+    """
+    Tests pour la classe ResultCache
+    """
+
+    def test_hit_on_normalized_expression(self):
+        """
+        Test de la normalisation des clés.
+
+        Vérifie que "5 + 3" réutilise le résultat mémorisé pour "5+3"
+        """
+        cache = ResultCache(maxsize=10)
+        func = counting(calculate)
+        assert cache.get_or_compute("5+3", func) == 8
+        assert cache.get_or_compute("5 + 3", func) == 8
+        assert func.calls == 1
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_errors_are_cached(self):
+        """
+        Test de la mise en cache des erreurs.
+
+        Vérifie qu'une expression invalide n'est analysée qu'une fois et que
+        la même exception est levée à chaque appel
+        """
+        cache = ResultCache(maxsize=10)
+        func = counting(calculate)
+        for _ in range(3):
+            with pytest.raises(ValueError, match="only one operator is allowed"):
+                cache.get_or_compute("5+3-2", func)
+        with pytest.raises(ZeroDivisionError):
+            cache.get_or_compute("5/0", func)
+        with pytest.raises(ZeroDivisionError):
+            cache.get_or_compute("5/0", func)
+        assert func.calls == 2
+
+    def test_lru_eviction(self):
+        """
+        Test de l'éviction LRU.
+
+        Vérifie que l'entrée la moins récemment utilisée est évincée
+        """
+        cache = ResultCache(maxsize=2)
+        func = counting(calculate)
+        cache.get_or_compute("1+1", func)
+        cache.get_or_compute("2+2", func)
+        cache.get_or_compute("1+1", func)
+        cache.get_or_compute("3+3", func)
+        assert cache.stats()['evictions'] == 1
+        cache.get_or_compute("1+1", func)
+        assert func.calls == 3, "1+1 should still be cached"
+        cache.get_or_compute("2+2", func)
+        assert func.calls == 4, "2+2 should have been evicted"
+
+    def test_ttl_expiration(self):
+        """
+        Test de l'expiration des entrées.
+
+        Vérifie qu'une entrée expirée est recalculée
+        """
+        clock = FakeClock()
+        cache = ResultCache(maxsize=10, ttl=5, clock=clock)
+        func = counting(calculate)
+        cache.get_or_compute("5+3", func)
+        clock.now = 4
+        cache.get_or_compute("5+3", func)
+        clock.now = 10
+        cache.get_or_compute("5+3", func)
+        assert func.calls == 2
+        assert cache.stats()['expirations'] == 1
+
+    def test_disabled_cache(self):
+        """
+        Test avec un cache de taille nulle.
+
+        Vérifie que chaque appel est recalculé
+        """
+        cache = ResultCache(maxsize=0)
+        func = counting(calculate)
+        cache.get_or_compute("5+3", func)
+        cache.get_or_compute("5+3", func)
+        assert func.calls == 2
+        assert len(cache) == 0
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_cache.py
+    pytest.main([__file__, "-v"])
@@ -128,6 +128,35 @@ class TestCalculateEdgeCases:
         result = calculate("5 + 3")
         assert result == 8, f"Expected 8, but got {result}"
 
+    def test_calculate_invalid_format(self):
+        """
+        Test avec un opérateur mal placé.
+
+        Vérifie que "+5", "5+" et "*5" lèvent ValueError (format invalide)
+        """
+        for expr in ("+5", "5+", "*5", "-", "   "):
+            with pytest.raises(ValueError, match="invalid expression format"):
+                calculate(expr)
+
+    def test_calculate_non_numeric_operands(self):
+        """
+        Test avec des opérandes non numériques.
+
+        Vérifie que "abc+5" et "+-5" lèvent ValueError (opérandes invalides)
+        """
+        for expr in ("abc+5", "+-5", "5.5.5+1"):
+            with pytest.raises(ValueError, match="operands must be numbers"):
+                calculate(expr)
+
+    def test_calculate_long_operands(self):
+        """
+        Test avec des opérandes très longs.
+
+        Vérifie que l'analyse reste correcte sur des milliers de chiffres
+        """
+        result = calculate("1" * 300 + "-" + "1" * 300)
+        assert result == 0, f"Expected 0, but got {result}"
+
 
 if __name__ == "__main__":
     # Permet d'exécuter les tests directement avec: python test_calculate.py
@@ -0,0 +1,178 @@
+"""
+Tests de conformité entre l'évaluation serveur et l'évaluation côté client
+
+Le fichier conformance.json contient des expressions et la valeur exacte que
+la page doit afficher. Ces cas, complétés par des expressions générées
+aléatoirement, sont vérifiés contre :
+    - le serveur : calculate() et la route POST /api/calculate
+    - le navigateur : static/calculator.js exécuté avec Node.js
+
+Côté client, une expression peut être déléguée au serveur (évaluation locale
+retournant null) ; lorsqu'elle est évaluée localement, la valeur affichée
+doit être identique à celle du serveur. Avec un autre moteur que 'single'
+ou un autre backend que 'float', toute expression doit être déléguée.
+"""
+
+import json
+import random
+import shutil
+import subprocess
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, calculate
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CASES_PATH = os.path.join(os.path.dirname(__file__), 'conformance.json')
+CALCULATOR_JS = os.path.join(ROOT, 'static', 'calculator.js')
+
+# Script Node.js : lit {"expressions": [...], "options": {...}} sur stdin,
+# écrit les valeurs locales
+NODE_RUNNER = """
+const Calculator = require(process.argv[1]);
+let input = "";
+process.stdin.on("data", (chunk) => { input += chunk; });
+process.stdin.on("end", () => {
+  const request = JSON.parse(input);
+  const values = request.expressions.map((expr) => Calculator.evaluateLocally(expr, request.options));
+  process.stdout.write(JSON.stringify(values));
+});
+"""
+
+
+def server_display(expr):
+    """Valeur affichée par la page pour expr (résultat ou message d'erreur)."""
+    try:
+        return str(calculate(expr))
+    except Exception as e:
+        return f"Error: {e}"
+
+
+def load_cases():
+    """Charge les cas partagés de conformance.json."""
+    with open(CASES_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def random_expressions(n, seed=0):
+    """Génère des expressions telles que saisies au clavier de la page."""
+    rng = random.Random(seed)
+    alphabet = '0123456789' * 3 + '+-*/.'
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))) for _ in range(n)]
+
+
+class TestServerConformance:
+    """
+    Vérifie que le serveur produit les valeurs attendues des cas partagés
+    """
+
+    def test_calculate_matches_cases(self):
+        """
+        Test de calculate() contre conformance.json.
+
+        Vérifie la valeur affichée pour chaque cas
+        """
+        for case in load_cases():
+            assert server_display(case['expression']) == case['display'], case
+
+    def test_api_calculate_matches_cases(self):
+        """
+        Test de POST /api/calculate contre conformance.json.
+
+        Vérifie le champ display retourné au mode client
+        """
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            for case in load_cases():
+                response = client.post('/api/calculate', json={'expression': case['expression']})
+                assert response.get_json()['display'] == case['display'], case
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="Node.js is required")
+class TestClientConformance:
+    """
+    Vérifie que static/calculator.js ne dérive pas du serveur
+    """
+
+    def _evaluate_locally(self, expressions, options=None):
+        """Évalue les expressions avec calculator.js sous Node.js."""
+        completed = subprocess.run(
+            ['node', '-e', NODE_RUNNER, CALCULATOR_JS],
+            input=json.dumps({'expressions': expressions, 'options': options}),
+            capture_output=True, text=True, check=True,
+        )
+        return json.loads(completed.stdout)
+
+    def test_shared_cases(self):
+        """
+        Test de calculator.js contre conformance.json.
+
+        Vérifie que chaque valeur calculée localement est celle du serveur
+        """
+        cases = load_cases()
+        local = self._evaluate_locally([case['expression'] for case in cases])
+        for case, value in zip(cases, local):
+            if value is not None:
+                assert value == case['display'], case
+        evaluated = sum(value is not None for value in local)
+        assert evaluated >= len(cases) // 2, "Most shared cases should be evaluated locally"
+
+    def test_random_keypad_expressions(self):
+        """
+        Test différentiel sur des expressions aléatoires.
+
+        Vérifie l'égalité avec le serveur pour toute expression évaluée localement
+        """
+        expressions = random_expressions(5000)
+        local = self._evaluate_locally(expressions)
+        for expr, value in zip(expressions, local):
+            if value is not None:
+                assert value == server_display(expr), expr
+
+    @pytest.mark.parametrize('options', [
+        {'engine': 'full', 'backend': 'float'},
+        {'engine': 'single', 'backend': 'decimal'},
+        {'engine': 'single', 'backend': 'fraction'},
+    ])
+    def test_other_engine_or_backend_is_delegated(self, options):
+        """
+        Test d'un moteur ou d'un backend que calculator.js ne reproduit pas.
+
+        Vérifie que toute expression est déléguée au serveur (ex: "1+2*3"
+        avec le moteur 'full', "1/3" avec le backend 'fraction')
+        """
+        expressions = ['1+2*3', '1/3', '0.1+0.2', '5+3', '']
+        assert self._evaluate_locally(expressions, options) == [None] * len(expressions)
+        single = self._evaluate_locally(['5+3'], {'engine': 'single', 'backend': 'float'})
+        assert single == ['8.0']
+
+
+class TestClientPage:
+    """
+    Vérifie que la page du mode client transmet le moteur et le backend
+    """
+
+    @pytest.mark.parametrize('engine, backend', [('single', 'float'), ('full', 'float'),
+                                                 ('single', 'fraction')])
+    def test_page_options(self, monkeypatch, engine, backend):
+        """
+        Test des attributs data-engine et data-backend.
+
+        Vérifie qu'ils suivent la configuration (coquille pré-rendue comprise)
+        """
+        monkeypatch.setitem(app.config, 'CLIENT_EVAL', True)
+        monkeypatch.setitem(app.config, 'EXPRESSION_ENGINE', engine)
+        monkeypatch.setitem(app.config, 'NUMERIC_BACKEND', backend)
+        with app.test_client() as client:
+            page = client.get('/').data.decode('utf-8')
+        assert f'data-engine="{engine}"' in page
+        assert f'data-backend="{backend}"' in page
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_conformance.py
+    pytest.main([__file__, "-v"])
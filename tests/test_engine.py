@@ -0,0 +1,140 @@
+"""
+Tests unitaires pour le moteur d'expressions (engine.py)
+
+Vérifie la priorité des opérateurs, la sémantique de operators.py, la
+compatibilité avec calculate() pour les expressions à un seul opérateur et
+la prise en charge des expressions très longues.
+
+Fonctions testées:
+    - evaluate_expression(expr, ops): Évaluation d'une expression complète
+    - compile_expression(text): Compilation en programme postfixé
+"""
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import OPS, app, calculate
+from engine import compile_expression, evaluate_expression
+
+
+def full(expr):
+    """Évalue expr avec le moteur complet et la table OPS."""
+    return evaluate_expression(expr, OPS)
+
+
+class TestEngineEvaluation:
+    """
+    Tests d'évaluation d'expressions à plusieurs opérateurs
+    """
+
+    def test_precedence(self):
+        """
+        Test de la priorité des opérateurs.
+
+        Vérifie que "1+2*3" vaut 1 + 2^3 = 9 ('*' est une puissance)
+        """
+        assert full("1+2*3") == 9
+
+    def test_left_associativity(self):
+        """
+        Test de l'associativité à gauche.
+
+        Vérifie que "10-4-3" vaut 3 et "2*3*2" vaut (2^3)^2 = 64
+        """
+        assert full("10-4-3") == 3
+        assert full("2*3*2") == 64
+        assert full("8/2/2") == 2
+
+    def test_leading_sign_and_spaces(self):
+        """
+        Test du signe initial et des espaces.
+
+        Vérifie que "-2*2 + 1" vaut (-2)^2 + 1 = 5, comme calculate("-2*2") = 4
+        """
+        assert full("-2*2 + 1") == 5
+
+    def test_matches_calculate_for_single_operator(self):
+        """
+        Test de compatibilité avec calculate().
+
+        Vérifie résultats et messages d'erreur sur des expressions simples
+        """
+        for expr in ("5+3", "10-4", "2*3", "10/3", "-5+10", "", "+5", "5+", "abc+5", "+-5"):
+            try:
+                expected = ('ok', calculate(expr))
+            except ValueError as e:
+                expected = ('error', str(e))
+            try:
+                actual = ('ok', full(expr))
+            except ValueError as e:
+                actual = ('error', str(e))
+            assert actual == expected, expr
+
+    def test_errors(self):
+        """
+        Test des erreurs d'évaluation.
+
+        Vérifie les opérateurs consécutifs et la division par zéro
+        """
+        with pytest.raises(ValueError, match="invalid expression format"):
+            full("5+*3")
+        with pytest.raises(ZeroDivisionError):
+            full("1+5/0")
+
+    def test_long_expression(self):
+        """
+        Test d'une expression de plusieurs milliers de jetons.
+
+        Vérifie l'absence de récursion profonde et le résultat
+        """
+        expr = "+".join(["1"] * 5000)
+        assert full(expr) == 5000
+
+
+class TestEngineCompilation:
+    """
+    Tests de la compilation et du cache des programmes
+    """
+
+    def test_postfix_program(self):
+        """
+        Test du programme produit.
+
+        Vérifie la forme postfixée de "1+2*3"
+        """
+        assert compile_expression("1+2*3") == (1.0, 2.0, 3.0, '*', '+')
+
+    def test_program_cache(self):
+        """
+        Test du cache des programmes compilés.
+
+        Vérifie qu'une même expression n'est compilée qu'une fois
+        """
+        compile_expression.cache_clear()
+        full("7+8*2")
+        full("7 + 8 * 2")
+        info = compile_expression.cache_info()
+        assert info.misses == 1 and info.hits == 1
+
+    def test_route_uses_full_engine(self):
+        """
+        Test de l'option EXPRESSION_ENGINE.
+
+        Vérifie que la page accepte plusieurs opérateurs en mode 'full'
+        """
+        app.config['EXPRESSION_ENGINE'] = 'full'
+        try:
+            with app.test_client() as client:
+                response = client.post('/', data={'display': '1+2*3'})
+        finally:
+            app.config['EXPRESSION_ENGINE'] = 'single'
+        assert b'value="9.0"' in response.data
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_engine.py
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+"""
+Tests unitaires pour les représentations compactes (expressions.py)
+
+Vérifie que les expressions analysées donnent les mêmes résultats que
+calculate(), que les colonnes sont exportées sans copie et que la
+sérialisation fait l'aller-retour à l'identique.
+
+Fonctions testées:
+    - ParsedExpression.parse(expr) / evaluate()
+    - ExpressionArray.parse(expressions) / evaluate() / memoryviews()
+    - ExpressionArray.to_bytes() / from_bytes(data)
+"""
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import OP_CODES, calculate, evaluate_batch
+from expressions import INVALID, ExpressionArray, ParsedExpression
+
+EXPRESSIONS = ["5+3", "-12.5*3", "10/4", "7-9", "abc+5", "5/0", "", "1e308*2", "2.5 * 0.5"]
+
+
+class TestParsedExpression:
+    """
+    Tests de l'expression analysée à __slots__
+    """
+
+    def test_parse_and_evaluate(self):
+        """
+        Test de l'analyse d'une expression.
+
+        Vérifie le code d'opérateur, les opérandes et le résultat
+        """
+        parsed = ParsedExpression.parse("10 / 4")
+        assert (parsed.op, parsed.left, parsed.right) == (OP_CODES['/'], 10.0, 4.0)
+        assert parsed.symbol == '/'
+        assert parsed.evaluate() == calculate("10/4")
+
+    def test_no_instance_dict(self):
+        """
+        Test de la compacité.
+
+        Vérifie que l'objet n'a pas de dictionnaire d'attributs
+        """
+        assert not hasattr(ParsedExpression.parse("1+1"), '__dict__')
+
+    def test_parse_error(self):
+        """
+        Test d'une expression invalide.
+
+        Vérifie que l'erreur de parse_expression() est levée
+        """
+        with pytest.raises(ValueError, match="operands must be numbers"):
+            ParsedExpression.parse("abc+5")
+
+
+class TestExpressionArray:
+    """
+    Tests du lot d'expressions en colonnes
+    """
+
+    def test_evaluate_matches_batch(self):
+        """
+        Test de l'évaluation d'un lot.
+
+        Vérifie que les résultats et erreurs sont ceux de evaluate_batch()
+        """
+        parsed = ExpressionArray.parse(EXPRESSIONS)
+        assert len(parsed) == len(EXPRESSIONS)
+        assert parsed.evaluate() == evaluate_batch(EXPRESSIONS)
+
+    def test_invalid_rows(self):
+        """
+        Test des lignes invalides.
+
+        Vérifie le code INVALID et la levée de l'erreur à l'accès
+        """
+        parsed = ExpressionArray.parse(["1+1", "abc+5"])
+        assert parsed.ops[1] == INVALID
+        assert parsed[0] == ParsedExpression(OP_CODES['+'], 1.0, 1.0)
+        with pytest.raises(ValueError, match="operands must be numbers"):
+            parsed[1]
+
+    def test_memoryviews_are_zero_copy(self):
+        """
+        Test de l'export des colonnes.
+
+        Vérifie les formats et que les vues partagent la mémoire des colonnes
+        """
+        parsed = ExpressionArray.parse(["5+3", "2*4"])
+        ops, left, right = parsed.memoryviews()
+        assert (ops.format, left.format, right.format) == ('b', 'd', 'd')
+        assert left.tolist() == [5.0, 2.0]
+        parsed.right[1] = 9.0
+        assert right[1] == 9.0
+
+    def test_round_trip(self):
+        """
+        Test de la sérialisation.
+
+        Vérifie que from_bytes(to_bytes()) reconstruit le même lot
+        """
+        parsed = ExpressionArray.parse(EXPRESSIONS)
+        data = parsed.to_bytes()
+        restored = ExpressionArray.from_bytes(data)
+        assert restored == parsed
+        assert restored.evaluate() == parsed.evaluate()
+        assert ExpressionArray.from_bytes(ExpressionArray().to_bytes()) == ExpressionArray()
+
+    def test_from_bytes_rejects_invalid_data(self):
+        """
+        Test de données invalides.
+
+        Vérifie que les données tronquées ou étrangères sont refusées
+        """
+        data = ExpressionArray.parse(EXPRESSIONS).to_bytes()
+        with pytest.raises(ValueError, match="truncated"):
+            ExpressionArray.from_bytes(data[:40])
+        with pytest.raises(ValueError, match="not an expression array"):
+            ExpressionArray.from_bytes(b'XXXX' + data[4:])
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_expressions.py
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,201 @@
+"""
+Tests unitaires pour les garde-fous de calcul (guard.py)
+
+Vérifie le modèle de coût de la puissance exacte et le budget de temps CPU
+des évaluations longues (lots, moteur à plusieurs opérateurs).
+
+Fonctions testées:
+    - power_bits(a, b): Estimation de la taille d'une puissance
+    - PowerGuard.check(a, b): Rejet des puissances trop grandes
+    - budget_scope(seconds) / check_budget(): Budget CPU d'une requête
+"""
+
+from fractions import Fraction
+
+import math
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, calculate, evaluate_batch, BACKENDS
+from backends import FractionBackend
+from guard import (BudgetExceeded, PowerGuard, ResultTooLarge, budget_scope,
+                   check_budget, power_bits)
+from tests import FakeClock
+
+
+class TestPowerGuard:
+    """
+    Tests du modèle de coût de la puissance
+    """
+
+    def test_power_bits(self):
+        """
+        Test de l'estimation logarithmique.
+
+        Vérifie la taille estimée de 2^100, (1/3)^10 et des bases triviales
+        """
+        assert power_bits(2, 100) == pytest.approx(100)
+        assert power_bits(Fraction(1, 3), -10) == pytest.approx(10 * 1.58496, rel=1e-4)
+        assert power_bits(1, 10 ** 100) == 0
+        assert power_bits(0, 10 ** 100) == 0
+
+    def test_fast_rejection(self):
+        """
+        Test du rejet avant calcul.
+
+        Vérifie que "9999999*99999999" est refusé par le backend exact
+        """
+        with pytest.raises(ResultTooLarge, match="result too large"):
+            calculate("9999999*99999999", BACKENDS['fraction'])
+
+    def test_within_limit(self):
+        """
+        Test d'une puissance sous la limite.
+
+        Vérifie que le calcul exact est effectué
+        """
+        guard = PowerGuard(max_bits=64)
+        guard.check(2, 63)
+        with pytest.raises(ResultTooLarge):
+            guard.check(2, 65)
+        assert calculate("2*1000", BACKENDS['fraction']) == 2 ** 1000
+
+    def test_scientific_operand(self):
+        """
+        Test d'un opérande en notation scientifique.
+
+        Vérifie que "1e1000000000" est refusé sans construire 10^1000000000
+        """
+        with pytest.raises(ResultTooLarge):
+            calculate("1e1000000000+1", BACKENDS['fraction'])
+
+    def test_huge_exponent(self, monkeypatch):
+        """
+        Test d'un exposant de plusieurs centaines de chiffres.
+
+        Vérifie le refus par le modèle de coût (et non une erreur de
+        conversion en float), y compris par la page
+        """
+        expression = "2*" + "9" * 400
+        assert power_bits(2, int("9" * 400)) == math.inf
+        with pytest.raises(ResultTooLarge):
+            calculate(expression, BACKENDS['fraction'])
+        monkeypatch.setitem(app.config, 'RESULT_CACHE_ENABLED', False)
+        with app.test_client() as client:
+            response = client.post('/', data={'display': expression, 'backend': 'fraction'})
+            assert b'Error: result too large' in response.data
+
+    @pytest.mark.parametrize('expression', [
+        "9" * 4300 + "+" + "9" * 4300,
+        "1" + "0" * 5000 + ".5+1",
+        "1/" + "3" * 4300,
+    ])
+    def test_operand_size(self, expression):
+        """
+        Test de la taille des opérandes exacts.
+
+        Vérifie que les opérandes trop longs pour être affichés sont refusés
+        """
+        with pytest.raises(ResultTooLarge):
+            calculate(expression, BACKENDS['fraction'])
+
+    def test_result_size(self):
+        """
+        Test de la taille des résultats exacts.
+
+        Vérifie qu'une somme d'opérandes acceptés dépassant la limite est refusée
+        """
+        backend = FractionBackend(PowerGuard(max_bits=64))
+        assert backend.apply('+', 2 ** 62, 2 ** 62) == 2 ** 63
+        with pytest.raises(ResultTooLarge):
+            backend.apply('+', 2 ** 63, 2 ** 63)
+        with pytest.raises(ResultTooLarge):
+            backend.apply('/', 1, 2 ** 64 + 1)
+
+    def test_unbounded_result_is_an_error_item(self, monkeypatch):
+        """
+        Test d'un résultat trop long pour être affiché, sans limite du garde.
+
+        Vérifie une erreur par élément (lot, /api/calculate, page), pas une 500
+        """
+        monkeypatch.setitem(app.config, 'RESULT_CACHE_ENABLED', False)
+        monkeypatch.setattr(BACKENDS['fraction'], 'guard', None)
+        expression = "9" * 4300 + "+" + "9" * 4300
+        with app.test_client() as client:
+            response = client.post('/api/batch?backend=fraction', json=[expression, '1+1'])
+            first, second = response.get_json()['results']
+            assert 'error' in first and second == {'result': 2}
+            response = client.post('/api/calculate', json={'expression': expression, 'backend': 'fraction'})
+            assert 'error' in response.get_json()
+            response = client.post('/', data={'display': expression, 'backend': 'fraction'})
+            assert response.status_code == 200 and b'Error: Exceeds the limit' in response.data
+
+
+class TestCpuBudget:
+    """
+    Tests du budget de temps CPU
+    """
+
+    def test_budget_exceeded(self):
+        """
+        Test de l'épuisement du budget.
+
+        Vérifie que check_budget() lève BudgetExceeded après l'échéance
+        """
+        clock = FakeClock()
+        with budget_scope(1.0, clock):
+            check_budget()
+            clock.now = 2.0
+            with pytest.raises(BudgetExceeded, match="evaluation budget exceeded"):
+                check_budget()
+        # Hors du bloc, aucun budget n'est actif
+        check_budget()
+
+    def test_nested_scope_keeps_outer_budget(self):
+        """
+        Test des budgets imbriqués.
+
+        Vérifie que le budget de la requête entière est conservé
+        """
+        with budget_scope(1.0, FakeClock()) as outer:
+            with budget_scope(5.0) as inner:
+                assert inner is outer
+
+    def test_batch_stops_when_budget_exhausted(self):
+        """
+        Test d'un lot dont le budget est épuisé.
+
+        Vérifie que les expressions restantes sont rapportées en erreur
+        """
+        app.config['EVAL_CPU_BUDGET'] = 1e-9
+        try:
+            rows = evaluate_batch([f"{i}+1" for i in range(20000)])
+        finally:
+            app.config['EVAL_CPU_BUDGET'] = 2.0
+        assert rows[-1] == (None, "evaluation budget exceeded")
+
+    def test_full_engine_budget(self):
+        """
+        Test du budget du moteur à plusieurs opérateurs.
+
+        Vérifie qu'une très longue expression est interrompue
+        """
+        app.config['EXPRESSION_ENGINE'] = 'full'
+        app.config['EVAL_CPU_BUDGET'] = 1e-9
+        try:
+            with app.test_client() as client:
+                response = client.post('/api/calculate', json={'expression': '+'.join(['1'] * 20000)})
+        finally:
+            app.config['EXPRESSION_ENGINE'] = 'single'
+            app.config['EVAL_CPU_BUDGET'] = 2.0
+        assert response.get_json()['error'] == "evaluation budget exceeded"
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_guard.py
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+"""
+Tests unitaires pour le générateur de charge (benchmarks/loadtest.py)
+
+Vérifie que le mélange d'expressions est reproductible, que chaque forme
+produit bien le comportement attendu de calculate(), et le résumé d'une
+courte exécution dans le processus.
+
+Fonctions testées:
+    - generate_expressions(count, mix, seed): Mélange reproductible
+    - parse_mix(text): Mélange en ligne de commande
+    - run_inprocess(concurrency, total, bodies): Charge sur l'application WSGI
+"""
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent (app) et benchmarks (loadtest) au path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from app import app, calculate
+from loadtest import (SHAPES, VALID_SHAPES, encode_bodies, generate_expressions,
+                      parse_mix, run_inprocess)
+
+
+class TestGenerator:
+    """
+    Tests du générateur d'expressions
+    """
+
+    def test_reproducible(self):
+        """
+        Test de la reproductibilité.
+
+        Vérifie qu'une même graine produit le même mélange
+        """
+        assert generate_expressions(500, seed=3) == generate_expressions(500, seed=3)
+        assert generate_expressions(500, seed=3) != generate_expressions(500, seed=4)
+
+    @pytest.mark.parametrize('shape', [name for name in SHAPES if name not in VALID_SHAPES])
+    def test_invalid_shapes_are_rejected(self, shape):
+        """
+        Test des formes d'erreur.
+
+        Vérifie que calculate() refuse chaque expression de ces formes
+        """
+        for _, expr in generate_expressions(50, {shape: 1.0}):
+            with pytest.raises((ValueError, ArithmeticError)):
+                calculate(expr)
+
+    def test_valid_shapes_parse(self):
+        """
+        Test des formes valides.
+
+        Vérifie que les expressions sont bien formées (seules des erreurs de
+        calcul restent possibles, ex: division par zéro)
+        """
+        for _, expr in generate_expressions(200, {name: 1.0 for name in VALID_SHAPES}):
+            try:
+                calculate(expr)
+            except ArithmeticError:
+                pass
+
+    def test_parse_mix(self):
+        """
+        Test du mélange en ligne de commande.
+
+        Vérifie l'analyse et le refus d'une forme inconnue
+        """
+        assert parse_mix("binary=0.9, empty=0.1") == {'binary': 0.9, 'empty': 0.1}
+        with pytest.raises(ValueError, match="unknown shape"):
+            parse_mix("unknown=1")
+
+
+class TestInProcess:
+    """
+    Tests de la charge dans le processus
+    """
+
+    def test_summary(self):
+        """
+        Test d'une courte exécution.
+
+        Vérifie le nombre de requêtes, les percentiles et le taux d'erreurs
+        applicatives (ici toutes les expressions sont vides)
+        """
+        bodies = encode_bodies(generate_expressions(40, {'empty': 1.0}))
+        stats = run_inprocess(4, 40, bodies, app)
+        assert stats['requests'] == 40
+        assert stats['http_errors'] == 0
+        assert stats['app_error_rate'] == 1.0
+        assert stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms'] <= stats['p999_ms']
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_loadtest.py
+    pytest.main([__file__, "-v"])
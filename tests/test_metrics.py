@@ -0,0 +1,126 @@
+"""
+Tests unitaires pour l'instrumentation (metrics.py) et la route /metrics
+
+Vérifie le format d'exposition Prometheus, la limite du nombre de séries
+et les mesures produites par les routes lorsque METRICS_ENABLED est actif.
+
+Fonctions testées:
+    - Counter.inc / Histogram.observe / Registry.render
+    - Route /metrics (GET)
+"""
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, metrics_registry, result_cache, ERRORS, EVAL_SECONDS, PARSE_SECONDS, REQUEST_SECONDS
+from metrics import Registry
+
+
+@pytest.fixture
+def client():
+    """
+    Fixture pytest : client de test avec les métriques activées et remises à zéro.
+    """
+    app.config['TESTING'] = True
+    app.config['METRICS_ENABLED'] = True
+    metrics_registry.clear()
+    result_cache.clear()
+    try:
+        with app.test_client() as client:
+            yield client
+    finally:
+        app.config['METRICS_ENABLED'] = False
+
+
+class TestRegistry:
+    """
+    Tests du registre et du format d'exposition
+    """
+
+    def test_histogram_exposition(self):
+        """
+        Test du rendu d'un histogramme.
+
+        Vérifie les intervalles cumulatifs, la somme et le nombre
+        """
+        registry = Registry()
+        histogram = registry.histogram('demo_seconds', "Démo", labels=('op',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, '+')
+        histogram.observe(0.5, '+')
+        histogram.observe(5.0, '+')
+        text = registry.render()
+        assert '# TYPE demo_seconds histogram' in text
+        assert 'demo_seconds_bucket{op="+",le="0.1"} 1' in text
+        assert 'demo_seconds_bucket{op="+",le="1.0"} 2' in text
+        assert 'demo_seconds_bucket{op="+",le="+Inf"} 3' in text
+        assert 'demo_seconds_sum{op="+"} 5.55' in text
+        assert 'demo_seconds_count{op="+"} 3' in text
+
+    def test_counter_escaping_and_series_limit(self):
+        """
+        Test de l'échappement et de la limite de séries.
+
+        Vérifie que les guillemets sont échappés et que les valeurs au-delà
+        de max_series sont regroupées sous "other"
+        """
+        registry = Registry()
+        counter = registry.counter('demo_total', "Démo", labels=('message',), max_series=2)
+        counter.inc('say "hi"')
+        counter.inc('b')
+        counter.inc('c')
+        counter.inc('d')
+        text = registry.render()
+        assert 'demo_total{message="say \\"hi\\""} 1' in text
+        assert counter.value('other') == 2
+
+
+class TestMetricsRoute:
+    """
+    Tests de la route /metrics et de l'instrumentation des routes
+    """
+
+    def test_disabled_by_default(self):
+        """
+        Test de la route désactivée.
+
+        Vérifie que /metrics répond 404 lorsque METRICS_ENABLED est faux
+        """
+        with app.test_client() as client:
+            assert client.get('/metrics').status_code == 404
+
+    def test_request_instrumentation(self, client):
+        """
+        Test des mesures d'une requête POST.
+
+        Vérifie l'analyse, l'opérateur, la latence et le compte d'erreurs
+        """
+        client.post('/', data={'display': '5+3'})
+        client.post('/', data={'display': '5+'})
+        assert PARSE_SECONDS.count() == 1
+        assert EVAL_SECONDS.count('+') == 1
+        assert REQUEST_SECONDS.count('index', 'POST') == 2
+        assert ERRORS.value('ValueError', 'invalid expression format') == 1
+
+    def test_exposition(self, client):
+        """
+        Test du contenu de /metrics.
+
+        Vérifie le type de contenu et la présence des compteurs du cache
+        """
+        client.post('/api/calculate', json={'expression': '2*3'})
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        text = response.get_data(as_text=True)
+        assert 'calculator_eval_seconds_count{op="*"} 1' in text
+        assert 'calculator_cache_misses 1' in text
+        assert 'calculator_render_seconds' in text
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_metrics.py
+    pytest.main([__file__, "-v"])
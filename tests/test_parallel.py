@@ -0,0 +1,113 @@
+"""
+Tests unitaires pour l'évaluateur parallèle (parallel.py)
+
+Vérifie l'encodage compact des blocs, l'équivalence des résultats avec
+evaluate_batch() (ordre, erreurs) et la taille adaptative des blocs.
+
+Éléments testés:
+    - pack(expressions) / unpack(lengths, data): Encodage des blocs
+    - ParallelEvaluator: Pool de processus et réassemblage ordonné
+"""
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import calculate
+from parallel import ParallelEvaluator, pack, unpack
+
+EXPRESSIONS = ["5+3", "10/0", "héllo+1", "2*3", "", "-8*0.5", "5+3-2", "1e3/7"]
+
+
+def reference(expressions):
+    """Résultats attendus (résultat, erreur) calculés avec calculate()."""
+    rows = []
+    for expr in expressions:
+        try:
+            rows.append((calculate(expr), None))
+        except Exception as e:
+            rows.append((None, str(e)))
+    return rows
+
+
+class TestPacking:
+    """
+    Tests de l'encodage compact des blocs
+    """
+
+    def test_round_trip(self):
+        """
+        Test aller-retour pack/unpack.
+
+        Vérifie que les expressions (y compris non ASCII) sont restituées
+        """
+        assert unpack(*pack(EXPRESSIONS)) == EXPRESSIONS
+
+    def test_non_string_items(self):
+        """
+        Test des éléments qui ne sont pas des chaînes.
+
+        Vérifie qu'ils sont encodés comme des expressions vides
+        """
+        assert unpack(*pack([None, 5, "1+1"])) == ["", "", "1+1"]
+
+    def test_lone_surrogate(self):
+        """
+        Test d'un surrogate isolé (possible dans un corps JSON).
+
+        Vérifie l'aller-retour, et l'erreur par élément identique à calculate()
+        """
+        expressions = ["1+1", "\ud800+1"]
+        assert unpack(*pack(expressions)) == expressions
+        assert ParallelEvaluator().evaluate(expressions) == reference(expressions)
+        with ParallelEvaluator(workers=1, min_chunk=1, inline_below=0) as evaluator:
+            assert evaluator.evaluate(expressions) == reference(expressions)
+
+
+class TestParallelEvaluator:
+    """
+    Tests de la classe ParallelEvaluator
+    """
+
+    def test_matches_reference_in_order(self):
+        """
+        Test de l'équivalence avec calculate() sur plusieurs blocs.
+
+        Vérifie l'ordre, les valeurs et les messages d'erreur
+        """
+        expressions = EXPRESSIONS * 50
+        with ParallelEvaluator(workers=2, min_chunk=16, inline_below=0) as evaluator:
+            rows = evaluator.evaluate(expressions)
+            assert evaluator.item_cost is not None
+        assert rows == reference(expressions)
+
+    def test_inline_small_batch(self):
+        """
+        Test d'un petit lot évalué sans pool.
+
+        Vérifie que le résultat est identique et qu'aucun processus n'est créé
+        """
+        evaluator = ParallelEvaluator(workers=2)
+        assert evaluator.evaluate(EXPRESSIONS) == reference(EXPRESSIONS)
+        assert evaluator._pool is None
+
+    def test_adaptive_chunk_size(self):
+        """
+        Test de la taille adaptative des blocs.
+
+        Vérifie les bornes et la prise en compte du coût mesuré
+        """
+        evaluator = ParallelEvaluator(workers=4, min_chunk=100, max_chunk=10000,
+                                      target_chunk_seconds=0.01)
+        assert evaluator.chunk_size(1000) == 100
+        assert evaluator.chunk_size(10_000_000) == 10000
+        evaluator.item_cost = 1e-5
+        assert evaluator.chunk_size(10_000_000) == 1000
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_parallel.py
+    pytest.main([__file__, "-v"])
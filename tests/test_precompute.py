@@ -0,0 +1,161 @@
+"""
+Tests unitaires pour la table précalculée (precompute.py)
+
+Vérifie que chaque résultat de la table est identique à celui de
+calculate(), que les expressions hors domaine ou en erreur sont évaluées
+normalement, que l'en-tête est vérifié et que index() utilise la table.
+
+Fonctions testées:
+    - build(path, low, high): Construction de la table
+    - PrecomputedTable.lookup(expr): Recherche par mmap
+    - load_precomputed(path): Activation de la table dans app.py
+"""
+
+import struct
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import OP_SYMBOLS, app, calculate, load_precomputed, result_cache
+from precompute import HEADER, MAGIC, RECORD, PrecomputedTable, build
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    """Fixture pytest : table des opérandes de -5 à 5."""
+    path = str(tmp_path / 'results.table')
+    build(path, -5, 5)
+    return path
+
+
+class TestPrecomputedTable:
+    """
+    Tests de la construction et de la lecture de la table
+    """
+
+    def test_matches_calculate(self, table_path):
+        """
+        Test de conformité avec calculate().
+
+        Vérifie toutes les expressions du domaine : même résultat, ou None
+        (évaluation normale) lorsque calculate() lève une erreur
+        """
+        table = PrecomputedTable(table_path)
+        try:
+            for op in OP_SYMBOLS:
+                for a in range(-5, 6):
+                    for b in range(0, 6):
+                        expr = f"{a}{op}{b}"
+                        try:
+                            expected = calculate(expr)
+                        except (ValueError, ArithmeticError):
+                            expected = None
+                        assert table.lookup(expr) == expected, expr
+        finally:
+            table.close()
+
+    def test_out_of_domain(self, table_path):
+        """
+        Test des expressions hors domaine.
+
+        Vérifie que les opérandes trop grands, décimaux ou "-0" ne sont pas servis
+        """
+        table = PrecomputedTable(table_path)
+        try:
+            assert table.lookup(" 3 + 4 ") == 7.0
+            assert table.lookup("6+1") is None
+            assert table.lookup("1.5+1") is None
+            assert table.lookup("-0*3") is None
+            assert table.lookup("5+3-2") is None
+        finally:
+            table.close()
+
+    def test_operator_subset(self, tmp_path):
+        """
+        Test d'une table construite pour une partie des opérateurs.
+
+        Vérifie la lecture de l'en-tête, et qu'un opérateur absent de la
+        table est évalué normalement
+        """
+        path = str(tmp_path / 'subset.table')
+        build(path, -2, 2, ops='+-')
+        table = PrecomputedTable(path)
+        try:
+            assert table.ops == '+-'
+            assert table.lookup("2-1") == calculate("2-1")
+            assert table.lookup("2*1") is None
+            assert os.path.getsize(path) == HEADER.size + 2 * 5 * 3 * RECORD.size
+        finally:
+            table.close()
+
+    def test_negative_bounds(self, tmp_path):
+        """
+        Test d'une table dont les opérandes sont tous négatifs.
+
+        Vérifie qu'elle ne contient aucun enregistrement et ne sert rien
+        """
+        path = str(tmp_path / 'negative.table')
+        assert build(path, -3, -1) == 0
+        table = PrecomputedTable(path)
+        try:
+            assert table.lookup("-2+1") is None
+        finally:
+            table.close()
+
+    def test_rejects_other_version(self, tmp_path):
+        """
+        Test de l'en-tête versionné.
+
+        Vérifie qu'une table d'une autre version du format est refusée
+        """
+        path = str(tmp_path / 'old.table')
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, 999, 9, 0, 0, b'+-*/'))
+        with pytest.raises(ValueError, match="unsupported table version"):
+            PrecomputedTable(path)
+
+
+class TestIndexUsesTable:
+    """
+    Tests de l'utilisation de la table par index()
+    """
+
+    def test_post_served_from_table(self, table_path):
+        """
+        Test d'une requête servie par la table.
+
+        Vérifie le résultat affiché et que le cache des résultats n'est pas sollicité
+        """
+        load_precomputed(table_path)
+        result_cache.clear()
+        try:
+            with app.test_client() as client:
+                response = client.post('/', data={'display': '2*3'})
+                assert b'value="8.0"' in response.data
+                assert result_cache.stats()['misses'] == 0
+                # Hors domaine : évaluation normale
+                response = client.post('/', data={'display': '20*2'})
+                assert b'value="400.0"' in response.data
+                assert result_cache.stats()['misses'] == 1
+        finally:
+            load_precomputed(None)
+
+    def test_invalid_table_is_ignored(self, tmp_path):
+        """
+        Test d'un fichier invalide.
+
+        Vérifie que l'application continue sans table
+        """
+        path = str(tmp_path / 'bad.table')
+        with open(path, 'wb') as f:
+            f.write(b'not a table' + bytes(struct.calcsize('<8sHHii4s')))
+        assert load_precomputed(path) is None
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_precompute.py
+    pytest.main([__file__, "-v"])
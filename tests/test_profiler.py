@@ -0,0 +1,122 @@
+"""
+Tests unitaires pour le profileur par échantillonnage (profiler.py)
+
+Vérifie le format collapsed stacks, la limite du nombre de piles, le
+déclenchement du profilage par en-tête et la route /api/profile.
+
+Fonctions testées:
+    - SamplingProfiler.profile(label) / sample() / collapsed() / reset()
+    - Route /api/profile (GET)
+"""
+
+import threading
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, profiler
+from profiler import SamplingProfiler, TRUNCATED
+
+
+class TestSamplingProfiler:
+    """
+    Tests du profileur
+    """
+
+    def test_collapsed_stack(self):
+        """
+        Test d'un échantillon relevé pendant un profilage.
+
+        Vérifie que la pile part du libellé et se termine par la fonction
+        courante (ici sample(), appelée depuis le thread profilé)
+        """
+        sampler = SamplingProfiler(interval=10.0)
+        with sampler.profile('demo'):
+            sampler.sample()
+        [line] = sampler.collapsed().splitlines()
+        stack, count = line.rsplit(' ', 1)
+        assert stack.startswith('demo;')
+        assert stack.endswith('test_profiler.py:test_collapsed_stack;profiler.py:sample')
+        assert count == '1'
+
+    def test_only_profiled_threads_are_sampled(self):
+        """
+        Test hors profilage.
+
+        Vérifie qu'aucune pile n'est relevée pour un thread non profilé
+        """
+        sampler = SamplingProfiler(interval=10.0)
+        sampler.sample()
+        assert sampler.samples == 0 and sampler.collapsed() == ''
+
+    def test_background_sampling(self):
+        """
+        Test du thread d'échantillonnage.
+
+        Vérifie que des échantillons sont relevés pendant un calcul long
+        """
+        sampler = SamplingProfiler(interval=0.0005)
+        done = threading.Event()
+        with sampler.profile('busy'):
+            while sampler.samples < 3 and not done.wait(0.001):
+                sum(i * i for i in range(10000))
+        assert sampler.samples >= 3
+
+    def test_max_stacks(self):
+        """
+        Test de la limite de piles distinctes.
+
+        Vérifie que les piles en surplus sont regroupées sous "[truncated]"
+        """
+        sampler = SamplingProfiler(interval=10.0, max_stacks=1)
+        with sampler.profile('a'):
+            sampler.sample()
+        with sampler.profile('b'):
+            sampler.sample()
+        assert f"b;{TRUNCATED} 1" in sampler.collapsed()
+
+
+class TestProfileRoute:
+    """
+    Tests du déclenchement par requête et de /api/profile
+    """
+
+    def test_disabled_by_default(self):
+        """
+        Test de la route désactivée.
+
+        Vérifie que /api/profile répond 404 lorsque PROFILING_ENABLED est faux
+        """
+        with app.test_client() as client:
+            assert client.get('/api/profile').status_code == 404
+
+    def test_header_triggers_profiling(self):
+        """
+        Test de l'en-tête X-Profile.
+
+        Vérifie que seule la requête portant l'en-tête est profilée et que
+        /api/profile retourne du texte puis efface les piles avec ?reset=1
+        """
+        app.config['PROFILING_ENABLED'] = True
+        profiler.reset()
+        try:
+            with app.test_client() as client:
+                client.post('/', data={'display': '5+3'})
+                assert profiler.profiled == 0
+                client.post('/', data={'display': '5+3'}, headers={'X-Profile': '1'})
+                assert profiler.profiled == 1
+                response = client.get('/api/profile?reset=1')
+                assert response.status_code == 200
+                assert response.content_type.startswith('text/plain')
+                assert profiler.profiled == 0
+        finally:
+            app.config['PROFILING_ENABLED'] = False
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_profiler.py
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,173 @@
+"""
+Tests unitaires pour le format binaire (protocol.py et /api/binary)
+
+Vérifie que chaque enregistrement donne le résultat et l'erreur de
+calculate() sur l'expression équivalente, et le traitement des corps
+invalides par la route Flask et par le serveur ASGI.
+
+Fonctions testées:
+    - evaluate_records(data, funcs): Calcul des enregistrements
+    - encode_requests / decode_responses: Encodage côté client
+    - POST /api/binary : Route Flask et chemin rapide ASGI
+"""
+
+import asyncio
+import math
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import OP_CODES, OP_FUNCS, app, calculate
+from protocol import (REQUEST, RESPONSE, STATUS_INVALID_OPERATOR, STATUS_NOT_REAL, STATUS_OK,
+                      STATUS_OVERFLOW, STATUS_ZERO_DIVISION, decode_responses, encode_requests,
+                      evaluate_records)
+
+
+@pytest.fixture
+def client():
+    """Client de test Flask."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def _expected(a, op_char, b):
+    """Résultat et statut attendus, d'après calculate()."""
+    try:
+        value = calculate(f"{a!r}{op_char}{b!r}")
+    except ZeroDivisionError:
+        return None, STATUS_ZERO_DIVISION
+    except OverflowError:
+        return None, STATUS_OVERFLOW
+    if isinstance(value, complex):
+        return None, STATUS_NOT_REAL
+    return value, STATUS_OK
+
+
+class TestEvaluateRecords:
+    """
+    Tests du calcul des enregistrements
+    """
+
+    @pytest.mark.parametrize('a, op_char, b', [
+        (12.5, '+', 7.25), (3.0, '-', 10.0), (2.0, '*', 10.0), (7.0, '/', 2.0),
+        (7.0, '/', 0.0), (999.0, '*', 999.0), (-8.0, '*', 0.5),
+    ])
+    def test_matches_calculate(self, a, op_char, b):
+        """
+        Test de l'équivalence avec calculate().
+
+        Vérifie le résultat et le statut de chaque forme (division par zéro,
+        dépassement, résultat complexe)
+        """
+        data = evaluate_records(encode_requests([(OP_CODES[op_char], a, b)]), OP_FUNCS)
+        [(value, status)] = decode_responses(data)
+        expected_value, expected_status = _expected(a, op_char, b)
+        assert status == expected_status
+        if expected_value is None:
+            assert math.isnan(value)
+        else:
+            assert value == expected_value
+
+    def test_power_of_zero(self):
+        """
+        Test de zéro élevé à une puissance négative.
+
+        Vérifie que la ZeroDivisionError de multiply() donne STATUS_ZERO_DIVISION
+        """
+        data = evaluate_records(encode_requests([(OP_CODES['*'], 0.0, -1.0)]), OP_FUNCS)
+        assert decode_responses(data)[0][1] == STATUS_ZERO_DIVISION
+
+    def test_invalid_operator(self):
+        """
+        Test d'un code d'opérateur inconnu.
+
+        Vérifie le statut STATUS_INVALID_OPERATOR
+        """
+        data = evaluate_records(encode_requests([(len(OP_FUNCS), 1.0, 2.0)]), OP_FUNCS)
+        assert decode_responses(data)[0][1] == STATUS_INVALID_OPERATOR
+
+    def test_record_sizes(self):
+        """
+        Test des tailles d'enregistrements.
+
+        Vérifie 24 octets par requête et 16 par réponse, dans l'ordre
+        """
+        body = encode_requests([(OP_CODES['+'], i, 1.0) for i in range(5)])
+        assert len(body) == 5 * REQUEST.size == 120
+        data = evaluate_records(body, OP_FUNCS)
+        assert len(data) == 5 * RESPONSE.size
+        assert [value for value, _ in decode_responses(data)] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+class TestBinaryRoute:
+    """
+    Tests de la route POST /api/binary
+    """
+
+    def test_flask_route(self, client):
+        """
+        Test de la route Flask.
+
+        Vérifie le type de contenu et les résultats
+        """
+        body = encode_requests([(OP_CODES['+'], 5.0, 3.0), (OP_CODES['/'], 1.0, 0.0)])
+        response = client.post('/api/binary', data=body, content_type='application/octet-stream')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/octet-stream'
+        [(value, status), (_, error)] = decode_responses(response.data)
+        assert (value, status, error) == (8.0, STATUS_OK, STATUS_ZERO_DIVISION)
+
+    def test_truncated_body(self, client):
+        """
+        Test d'un corps tronqué.
+
+        Vérifie la réponse 400
+        """
+        response = client.post('/api/binary', data=b'\x00' * 23)
+        assert response.status_code == 400
+
+    def test_too_many_records(self, client, monkeypatch):
+        """
+        Test de la limite du nombre d'enregistrements.
+
+        Vérifie la réponse 413
+        """
+        monkeypatch.setitem(app.config, 'BATCH_MAX_ITEMS', 2)
+        body = encode_requests([(OP_CODES['+'], 1.0, 1.0)] * 3)
+        assert client.post('/api/binary', data=body).status_code == 413
+
+    def test_asgi_fast_path(self, client):
+        """
+        Test du chemin rapide ASGI.
+
+        Vérifie que la réponse est identique à celle de Flask
+        """
+        from asgi import CalculatorASGI
+        body = encode_requests([(OP_CODES['*'], 2.0, 8.0), (7, 1.0, 1.0)])
+        scope = {'type': 'http', 'method': 'POST', 'path': '/api/binary', 'headers': []}
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        async def send(message):
+            sent.append(message)
+
+        asgi_app = CalculatorASGI(app)
+        try:
+            asyncio.run(asgi_app(scope, receive, send))
+        finally:
+            asgi_app.shutdown()
+        assert sent[0]['status'] == 200
+        assert (b'content-type', b'application/octet-stream') in sent[0]['headers']
+        assert sent[1]['body'] == client.post('/api/binary', data=body).data
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_protocol.py
+    pytest.main([__file__, "-v"])
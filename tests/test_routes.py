@@ -8,8 +8,11 @@ et le rendu des templates.
 Routes testées:
     - GET / : Affichage du formulaire vide
     - POST / : Soumission d'expressions et affichage des résultats
+    - POST /api/batch : Évaluation d'un lot d'expressions (JSON et NDJSON)
+    - GET /api/stats : Compteurs internes
 """
 
+import json
 import pytest
 import sys
 import os
@@ -192,6 +195,146 @@ class TestIndexRoutePOST:
         assert b'5' in response.data, "Expected result '5' in response"
 
 
+class TestIndexRendering:
+    """
+    Tests des modes de rendu de la route /
+
+    Vérifie que la coquille pré-rendue produit le même HTML que Jinja2 et
+    que les GET conditionnels sont servis en 304.
+    """
+
+    def _render(self, client, mode, **kwargs):
+        """Effectue une requête sur / avec le mode de rendu donné."""
+        previous = app.config['RENDER_MODE']
+        app.config['RENDER_MODE'] = mode
+        try:
+            if 'data' in kwargs:
+                return client.post('/', **kwargs)
+            return client.get('/', **kwargs)
+        finally:
+            app.config['RENDER_MODE'] = previous
+
+    def test_static_mode_matches_jinja(self, client):
+        """
+        Test de l'équivalence des deux modes de rendu.
+
+        Vérifie que le HTML est identique, y compris l'échappement du résultat
+        """
+        for data in ({'display': '5+3'}, {'display': '<b>+1'}, {'display': ''}):
+            static = self._render(client, 'static', data=data)
+            jinja = self._render(client, 'jinja', data=data)
+            assert static.data == jinja.data
+        assert self._render(client, 'static').data == self._render(client, 'jinja').data
+
+    def test_get_not_modified(self, client):
+        """
+        Test d'un GET conditionnel.
+
+        Vérifie qu'un GET avec l'ETag reçu précédemment obtient 304
+        """
+        first = self._render(client, 'static')
+        etag = first.headers['ETag']
+        assert first.headers.get('Last-Modified')
+        second = self._render(client, 'static', headers={'If-None-Match': etag})
+        assert second.status_code == 304
+        assert second.data == b''
+
+    def test_client_eval_mode(self, client):
+        """
+        Test du mode d'évaluation côté client.
+
+        Vérifie que le script d'évaluation n'est inclus que si CLIENT_EVAL est actif
+        """
+        assert b'calculator.js' not in self._render(client, 'static').data
+        app.config['CLIENT_EVAL'] = True
+        try:
+            static = self._render(client, 'static').data
+            jinja = self._render(client, 'jinja').data
+        finally:
+            app.config['CLIENT_EVAL'] = False
+        assert b'calculator.js' in static
+        assert b'data-endpoint="/api/calculate"' in static
+        assert static == jinja
+
+
+class TestBatchRoute:
+    """
+    Tests pour la route POST /api/batch
+
+    Vérifie que les lots sont évalués dans l'ordre, que les erreurs sont
+    rapportées par élément et que les limites sont respectées.
+    """
+
+    def test_batch_json_results_in_order(self, client):
+        """
+        Test d'un lot JSON mélangeant résultats et erreurs.
+
+        Vérifie que chaque expression obtient son résultat ou son erreur,
+        dans l'ordre de la requête
+        """
+        response = client.post('/api/batch', json={'expressions': ['5+3', '5/0', '2*3', '5+3-2']})
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert results[0] == {'result': 8}
+        assert 'error' in results[1]
+        assert results[2] == {'result': 8}
+        assert results[3] == {'error': 'only one operator is allowed'}
+
+    def test_batch_ndjson(self, client):
+        """
+        Test d'un lot NDJSON.
+
+        Vérifie qu'une requête NDJSON reçoit une ligne JSON par expression
+        """
+        body = '"10-4"\n{"expression": "abc+5"}\n'
+        response = client.post('/api/batch', data=body, content_type='application/x-ndjson')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert lines == [{'result': 6}, {'error': 'operands must be numbers'}]
+
+    def test_batch_too_many_items(self, client):
+        """
+        Test du dépassement de BATCH_MAX_ITEMS.
+
+        Vérifie qu'un lot trop grand est refusé avec 413
+        """
+        max_items = app.config['BATCH_MAX_ITEMS']
+        app.config['BATCH_MAX_ITEMS'] = 2
+        try:
+            response = client.post('/api/batch', json=['1+1', '2+2', '3+3'])
+        finally:
+            app.config['BATCH_MAX_ITEMS'] = max_items
+        assert response.status_code == 413
+
+    def test_batch_invalid_json(self, client):
+        """
+        Test avec un corps JSON invalide.
+
+        Vérifie que la requête est refusée avec 400
+        """
+        response = client.post('/api/batch', data='[1+', content_type='application/json')
+        assert response.status_code == 400
+
+class TestStatsRoute:
+    """
+    Tests pour la route GET /api/stats
+    """
+
+    def test_stats_reports_cache_hits(self, client):
+        """
+        Test des compteurs du cache des résultats.
+
+        Vérifie qu'une expression soumise deux fois compte un hit
+        """
+        from app import result_cache
+        result_cache.clear()
+        client.post('/', data={'display': '7+1'})
+        client.post('/', data={'display': '7 + 1'})
+        cache = client.get('/api/stats').get_json()['cache']
+        assert cache['hits'] == 1
+        assert cache['misses'] == 1
+
 
 if __name__ == "__main__":
     # Permet d'exécuter les tests directement avec: python test_routes.py
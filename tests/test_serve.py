@@ -0,0 +1,96 @@
+"""
+Tests unitaires pour le lanceur de production (serve.py)
+
+Vérifie la construction de la configuration gunicorn à partir des valeurs
+par défaut, de l'environnement et de la ligne de commande, ainsi que le
+préchargement de l'application avant le fork.
+
+Fonctions testées:
+    - build_options(args, environ): Configuration du serveur
+    - preload(): Préparation de l'application dans le processus maître
+"""
+
+import argparse
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer serve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from serve import build_options, preload
+
+
+class TestBuildOptions:
+    """
+    Tests pour la fonction build_options()
+    """
+
+    def test_defaults(self):
+        """
+        Test des valeurs par défaut.
+
+        Vérifie un worker par cœur, le préchargement et le recyclage des workers
+        """
+        options = build_options(environ={})
+        assert options['workers'] == (os.cpu_count() or 1)
+        assert options['preload_app'] is True
+        assert options['worker_class'] == 'sync'
+        assert options['max_requests'] > 0
+
+    def test_environment_and_arguments(self):
+        """
+        Test de la priorité des sources de configuration.
+
+        Vérifie que la ligne de commande l'emporte sur l'environnement
+        """
+        environ = {'CALC_WORKERS': '3', 'CALC_THREADS': '8', 'CALC_BACKLOG': '64'}
+        args = argparse.Namespace(workers=5)
+        options = build_options(args, environ)
+        assert options['workers'] == 5
+        assert options['threads'] == 8
+        assert options['backlog'] == 64
+        assert options['worker_class'] == 'gthread'
+
+    @pytest.mark.parametrize('value, expected', [('0', False), ('no', False), ('1', True), ('TRUE', True)])
+    def test_preload_optional(self, value, expected):
+        """
+        Test de la désactivation du préchargement.
+
+        Vérifie CALC_PRELOAD, et que --preload l'emporte sur l'environnement
+        """
+        assert build_options(environ={'CALC_PRELOAD': value})['preload_app'] is expected
+        args = argparse.Namespace(preload=True)
+        assert build_options(args, {'CALC_PRELOAD': '0'})['preload_app'] is True
+
+    def test_invalid_flag(self):
+        """
+        Test d'une valeur booléenne invalide.
+
+        Vérifie le refus de la valeur
+        """
+        with pytest.raises(ValueError):
+            build_options(environ={'CALC_PRELOAD': 'maybe'})
+
+
+class TestPreload:
+    """
+    Tests pour la fonction preload()
+    """
+
+    def test_preload_renders_shell(self):
+        """
+        Test du préchargement.
+
+        Vérifie que l'application est retournée avec sa coquille déjà rendue
+        """
+        from app import page_renderer
+        page_renderer.invalidate()
+        application = preload()
+        assert application.name == 'app'
+        assert page_renderer._shells, "the page shell should be rendered before forking"
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_serve.py
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,164 @@
+"""
+Tests unitaires pour le mode session (sessions.py et /api/session)
+
+Vérifie le magasin borné des accumulateurs (éviction LRU, expiration
+d'inactivité) et le calcul incrémental par la route /api/session.
+
+Fonctions testées:
+    - SessionStore.create / get / set / apply / delete
+    - POST /api/session : Démarrage et opérations incrémentales
+    - DELETE /api/session : Suppression de la session
+"""
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, calculate, session_store
+from operators import add, divide
+from sessions import SessionExpired, SessionStore
+from tests import FakeClock
+
+
+@pytest.fixture
+def client():
+    """Client de test Flask avec un magasin de sessions vide."""
+    app.config['TESTING'] = True
+    session_store.clear()
+    with app.test_client() as client:
+        yield client
+    session_store.clear()
+
+
+class TestSessionStore:
+    """
+    Tests du magasin des accumulateurs
+    """
+
+    def test_apply_is_incremental(self):
+        """
+        Test du calcul incrémental.
+
+        Vérifie que chaque opération s'applique au résultat précédent
+        """
+        store = SessionStore()
+        session_id = store.create(10.0)
+        assert store.apply(session_id, add, 5.0) == 15.0
+        assert store.apply(session_id, divide, 3.0) == 5.0
+        assert store.get(session_id) == 5.0
+
+    def test_error_keeps_accumulator(self):
+        """
+        Test d'une opération en erreur.
+
+        Vérifie que l'accumulateur n'est pas modifié
+        """
+        store = SessionStore()
+        session_id = store.create(8.0)
+        with pytest.raises(ZeroDivisionError):
+            store.apply(session_id, divide, 0.0)
+        assert store.get(session_id) == 8.0
+
+    def test_lru_eviction(self):
+        """
+        Test de la limite du nombre de sessions.
+
+        Vérifie que la session la moins récemment utilisée est évincée
+        """
+        store = SessionStore(max_sessions=2)
+        first, second = store.create(1.0), store.create(2.0)
+        store.get(first)
+        third = store.create(3.0)
+        assert len(store) == 2
+        assert store.get(first) == 1.0 and store.get(third) == 3.0
+        with pytest.raises(SessionExpired):
+            store.get(second)
+        assert store.stats()['evictions'] == 1
+
+    def test_idle_expiry(self):
+        """
+        Test de l'expiration d'inactivité.
+
+        Vérifie qu'une session utilisée reste valide et qu'une session
+        inactive expire
+        """
+        clock = FakeClock()
+        store = SessionStore(idle_ttl=10.0, clock=clock)
+        active, idle = store.create(1.0), store.create(2.0)
+        clock.now = 8.0
+        store.get(active)
+        clock.now = 12.0
+        assert store.get(active) == 1.0
+        with pytest.raises(SessionExpired):
+            store.get(idle)
+        assert store.stats()['expirations'] == 1
+
+
+class TestSessionRoute:
+    """
+    Tests de la route /api/session
+    """
+
+    def test_incremental_chain(self, client):
+        """
+        Test d'une chaîne de calculs.
+
+        Vérifie que les résultats sont ceux de calculate() sur l'expression complète
+        """
+        response = client.post('/api/session', json={'value': '12'})
+        assert response.get_json() == {'result': 12.0, 'display': '12.0'}
+        assert app.config['SESSION_COOKIE'] in response.headers['Set-Cookie']
+        data = client.post('/api/session', json={'op': '+', 'operand': '3'}).get_json()
+        assert data['result'] == calculate("12+3")
+        data = client.post('/api/session', json={'op': '/', 'operand': 4}).get_json()
+        assert data['display'] == str(calculate("15/4"))
+
+    def test_error_reports_display(self, client):
+        """
+        Test d'une opération en erreur.
+
+        Vérifie le message affiché et l'accumulateur conservé
+        """
+        client.post('/api/session', json={'value': '5'})
+        data = client.post('/api/session', json={'op': '/', 'operand': '0'}).get_json()
+        assert data['display'].startswith("Error: ")
+        data = client.post('/api/session', json={'op': '-', 'operand': 'abc'}).get_json()
+        assert data['error'] == "operands must be numbers"
+        assert client.post('/api/session', json={'op': '+', 'operand': '1'}).get_json()['result'] == 6.0
+
+    def test_unknown_session_conflict(self, client):
+        """
+        Test d'une opération sans session.
+
+        Vérifie la réponse 409 (le client redémarre avec la valeur affichée)
+        """
+        response = client.post('/api/session', json={'op': '+', 'operand': '1'})
+        assert response.status_code == 409
+
+    def test_invalid_body(self, client):
+        """
+        Test de corps invalides.
+
+        Vérifie la réponse 400
+        """
+        assert client.post('/api/session', data='x').status_code == 400
+        assert client.post('/api/session', json={'op': '%', 'operand': '1'}).status_code == 400
+
+    def test_delete(self, client):
+        """
+        Test de DELETE /api/session.
+
+        Vérifie que la session est supprimée
+        """
+        client.post('/api/session', json={'value': '1'})
+        assert client.delete('/api/session').status_code == 204
+        assert len(session_store) == 0
+        assert client.get('/api/stats').get_json()['sessions']['created'] == 1
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_sessions.py
+    pytest.main([__file__, "-v"])
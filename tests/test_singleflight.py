@@ -0,0 +1,235 @@
+"""
+Tests unitaires pour le regroupement des calculs simultanés (singleflight.py)
+
+Vérifie que des appels simultanés sur la même clé partagent un seul calcul
+et reçoivent le même résultat ou la même erreur, avec des threads comme avec
+des coroutines, ainsi que l'intégration dans evaluate() et /api/stats.
+
+Fonctions testées:
+    - SingleFlight.do(key, func, *args): Appelants multi-thread
+    - AsyncSingleFlight.do(key, func, *args): Coroutines
+    - evaluate(expr): Regroupement dans le chemin d'évaluation
+"""
+
+import asyncio
+import threading
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, evaluate, result_cache, single_flight
+from singleflight import AsyncSingleFlight, SingleFlight
+
+
+def _start_callers(flight, key, func, count):
+    """Lance count threads appelant flight.do(key, func) ; retourne (threads, résultats)."""
+    outcomes = []
+
+    def call():
+        try:
+            outcomes.append(('ok', flight.do(key, func)))
+        except Exception as e:
+            outcomes.append(('error', e))
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def _wait_for_waiters(flight, count):
+    """Attend que count appelants soient en attente du calcul en cours."""
+    for _ in range(1000):
+        if flight.coalesced >= count:
+            return
+        threading.Event().wait(0.005)
+    raise AssertionError("callers were not coalesced")
+
+
+class TestSingleFlight:
+    """
+    Tests du regroupement multi-thread
+    """
+
+    def test_concurrent_calls_share_result(self):
+        """
+        Test d'appels simultanés sur la même clé.
+
+        Vérifie qu'un seul calcul est fait et que tous reçoivent son résultat
+        """
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return 42.0
+
+        threads, outcomes = _start_callers(flight, 'k', compute, 5)
+        _wait_for_waiters(flight, 4)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert outcomes == [('ok', 42.0)] * 5
+        assert flight.stats() == {'leaders': 1, 'coalesced': 4, 'inflight': 0}
+
+    def test_concurrent_calls_share_error(self):
+        """
+        Test d'une erreur partagée.
+
+        Vérifie que chaque appelant reçoit la même erreur, dans sa propre instance
+        """
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def compute():
+            release.wait(5)
+            raise ZeroDivisionError("division by zero")
+
+        threads, outcomes = _start_callers(flight, 'k', compute, 3)
+        _wait_for_waiters(flight, 2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        errors = [error for kind, error in outcomes]
+        assert all(kind == 'error' for kind, _ in outcomes)
+        assert all(isinstance(e, ZeroDivisionError) and str(e) == "division by zero" for e in errors)
+        assert len({id(e) for e in errors}) == 3
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """
+        Test d'appels successifs.
+
+        Vérifie qu'un calcul terminé n'est pas réutilisé (ce n'est pas un cache)
+        """
+        flight = SingleFlight()
+        assert flight.do('k', lambda: 1) == 1
+        assert flight.do('k', lambda: 2) == 2
+        assert flight.stats() == {'leaders': 2, 'coalesced': 0, 'inflight': 0}
+
+
+class TestAsyncSingleFlight:
+    """
+    Tests du regroupement entre coroutines
+    """
+
+    def test_concurrent_coroutines_share_result(self):
+        """
+        Test de coroutines simultanées sur la même clé.
+
+        Vérifie qu'un seul calcul est attendu et que toutes reçoivent son résultat
+        """
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def compute(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        async def main():
+            return await asyncio.gather(*(flight.do('k', compute, 8.0) for _ in range(4)))
+
+        assert asyncio.run(main()) == [8.0] * 4
+        assert calls == [8.0]
+        assert flight.stats() == {'leaders': 1, 'coalesced': 3, 'inflight': 0}
+
+    def test_concurrent_coroutines_share_error(self):
+        """
+        Test d'une erreur partagée entre coroutines.
+
+        Vérifie que chaque coroutine reçoit la même erreur
+        """
+        flight = AsyncSingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("invalid expression format")
+
+        async def main():
+            return await asyncio.gather(*(flight.do('k', compute) for _ in range(3)),
+                                        return_exceptions=True)
+
+        errors = asyncio.run(main())
+        assert all(isinstance(e, ValueError) and str(e) == "invalid expression format" for e in errors)
+
+    def test_cancelled_waiter_does_not_cancel_leader(self):
+        """
+        Test de l'annulation d'un appelant en attente.
+
+        Vérifie que le calcul partagé continue pour les autres appelants
+        """
+        flight = AsyncSingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.02)
+            return 1.0
+
+        async def main():
+            leader = asyncio.ensure_future(flight.do('k', compute))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(flight.do('k', compute))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            return await leader
+
+        assert asyncio.run(main()) == 1.0
+
+
+class TestEvaluateSingleFlight:
+    """
+    Tests de l'intégration dans evaluate() et /api/stats
+    """
+
+    @pytest.mark.parametrize('cache_enabled', [True, False])
+    def test_identical_expressions_are_coalesced(self, cache_enabled, monkeypatch):
+        """
+        Test de evaluate() appelé simultanément sur la même expression normalisée.
+
+        Vérifie qu'un seul calcul est fait, avec ou sans cache des résultats
+        """
+        import app as app_module
+        release = threading.Event()
+        calls = []
+
+        def slow_calculate(expr):
+            calls.append(expr)
+            release.wait(5)
+            return 8.0
+
+        monkeypatch.setitem(app_module.CALCULATORS, 'float', slow_calculate)
+        monkeypatch.setitem(app.config, 'RESULT_CACHE_ENABLED', cache_enabled)
+        result_cache.clear()
+        single_flight.reset()
+
+        results = []
+        threads = [threading.Thread(target=lambda e=e: results.append(evaluate(e)))
+                   for e in ("5+3", "5 + 3", " 5+3 ")]
+        for thread in threads:
+            thread.start()
+        _wait_for_waiters(single_flight, 2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        result_cache.clear()
+
+        assert results == [8.0] * 3
+        assert len(calls) == 1
+
+        with app.test_client() as client:
+            counters = client.get('/api/stats').get_json()['singleflight']['threads']
+        assert counters['coalesced'] == 2
+        assert counters['inflight'] == 0
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_singleflight.py
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,59 @@
+"""
+Tests unitaires pour le démarrage rapide de l'application
+
+Vérifie le préchauffage (warm_up) et le cache de bytecode Jinja2
+(CALC_TEMPLATE_CACHE), ce dernier dans un processus séparé puisqu'il est
+configuré à l'import de app.py.
+
+Fonctions testées:
+    - warm_up(): Préparation de l'application au démarrage
+"""
+
+import glob
+import subprocess
+
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, page_renderer, page_variant, result_cache, warm_up
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestWarmUp:
+    """
+    Tests du préchauffage
+    """
+
+    def test_warm_up_prepares_page(self):
+        """
+        Test de warm_up().
+
+        Vérifie que la coquille de la page est prête et que le cache des
+        résultats est laissé vide
+        """
+        page_renderer.invalidate()
+        warm_up()
+        assert page_renderer.cached(page_variant('')) is not None
+        assert result_cache.stats()['size'] == 0
+        assert result_cache.stats()['misses'] == 0
+
+    def test_bytecode_cache(self, tmp_path):
+        """
+        Test du cache de bytecode Jinja2.
+
+        Vérifie qu'un processus démarré avec CALC_TEMPLATE_CACHE et
+        CALC_WARMUP=1 écrit le bytecode de index.html dans le répertoire
+        """
+        environ = dict(os.environ, CALC_TEMPLATE_CACHE=str(tmp_path), CALC_WARMUP='1')
+        subprocess.run([sys.executable, '-c', 'import app'], cwd=ROOT, env=environ, check=True)
+        assert glob.glob(os.path.join(str(tmp_path), '__jinja2_*.cache'))
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_startup.py
+    pytest.main([__file__, "-v"])
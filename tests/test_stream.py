@@ -0,0 +1,160 @@
+"""
+Tests unitaires pour l'évaluation en flux (stream.py)
+
+Vérifie la lecture incrémentale avec positions en octets, l'évaluation par
+blocs avec enregistrements d'erreur, les formats de sortie et la reprise
+d'un traitement interrompu.
+
+Fonctions testées:
+    - read_expressions(stream, offset): Lecture des lignes et positions
+    - evaluate_stream(records, chunk_size): Évaluation par blocs
+    - write_ndjson / write_csv: Formats de sortie
+    - main(argv): Interface en ligne de commande avec --checkpoint
+"""
+
+import io
+import json
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer stream
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from stream import evaluate_stream, main, read_expressions, write_csv, write_ndjson
+
+INPUT = b"5+3\n10/0\r\nabc+5\n2*3"
+
+
+class TestReadExpressions:
+    """
+    Tests pour la fonction read_expressions()
+    """
+
+    def test_offsets(self):
+        """
+        Test des positions en octets.
+
+        Vérifie le début de chaque ligne et la position de la suivante
+        """
+        records = list(read_expressions(io.BytesIO(INPUT)))
+        assert [r[0] for r in records] == [0, 4, 10, 16]
+        assert [r[2] for r in records] == ["5+3", "10/0", "abc+5", "2*3"]
+        assert records[-1][3] == len(INPUT)
+
+    def test_resume_from_offset(self):
+        """
+        Test de la reprise à une position donnée.
+
+        Vérifie que la lecture reprend à la ligne commençant à l'offset
+        """
+        records = list(read_expressions(io.BytesIO(INPUT), offset=10))
+        assert [r[2] for r in records] == ["abc+5", "2*3"]
+
+
+class TestEvaluateStream:
+    """
+    Tests pour evaluate_stream() et les formats de sortie
+    """
+
+    def test_results_and_error_records(self):
+        """
+        Test des enregistrements produits.
+
+        Vérifie les résultats et les messages d'erreur de calculate()
+        """
+        results = list(evaluate_stream(read_expressions(io.BytesIO(INPUT)), chunk_size=3))
+        assert results[0]['result'] == 8.0
+        assert results[1]['error'] == "float division by zero"
+        assert results[2]['error'] == "operands must be numbers"
+        assert results[3] == {'line': 4, 'offset': 16, 'expression': '2*3', 'result': 8.0}
+
+    def test_on_chunk_reports_resume_position(self):
+        """
+        Test des positions de reprise par bloc.
+
+        Vérifie la position signalée après chaque bloc
+        """
+        positions = []
+        records = read_expressions(io.BytesIO(INPUT))
+        list(evaluate_stream(records, chunk_size=2, on_chunk=lambda o, l: positions.append((o, l))))
+        assert positions == [(10, 3), (len(INPUT), 5)]
+
+    def test_writers(self):
+        """
+        Test des formats NDJSON et CSV.
+
+        Vérifie une ligne par enregistrement (plus l'en-tête CSV)
+        """
+        results = list(evaluate_stream(read_expressions(io.BytesIO(INPUT))))
+        ndjson = io.StringIO()
+        assert write_ndjson(results, ndjson) == 4
+        assert json.loads(ndjson.getvalue().splitlines()[1])['line'] == 2
+        out = io.StringIO()
+        write_csv(results, out)
+        lines = out.getvalue().splitlines()
+        assert lines[0] == 'line,offset,expression,result,error'
+        assert lines[1] == '1,0,5+3,8.0,'
+
+
+class TestCommandLine:
+    """
+    Tests de l'interface en ligne de commande
+    """
+
+    def test_checkpoint_resume(self, tmp_path):
+        """
+        Test de la reprise avec --checkpoint.
+
+        Vérifie qu'une seconde exécution ne traite que les nouvelles lignes
+        """
+        source = tmp_path / 'input.txt'
+        output = tmp_path / 'out.ndjson'
+        checkpoint = tmp_path / 'input.offset'
+        source.write_bytes(b"1+1\n2+2\n")
+        main([str(source), '-o', str(output), '--checkpoint', str(checkpoint), '--chunk-size', '1'])
+        with open(source, 'ab') as f:
+            f.write(b"3+3\n")
+        main([str(source), '-o', str(output), '--checkpoint', str(checkpoint)])
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [r['result'] for r in records] == [2.0, 4.0, 6.0]
+        assert [r['line'] for r in records] == [1, 2, 3]
+
+    def test_resume_truncates_interrupted_chunk(self, tmp_path):
+        """
+        Test de la reprise après une interruption au milieu d'un bloc.
+
+        Vérifie que les enregistrements écrits après le point de reprise
+        (dont une ligne incomplète) ne sont pas dupliqués
+        """
+        source = tmp_path / 'input.txt'
+        output = tmp_path / 'out.ndjson'
+        checkpoint = tmp_path / 'input.offset'
+        source.write_bytes(b"1+1\n2+2\n3+3\n")
+        main([str(source), '-o', str(output), '--checkpoint', str(checkpoint), '--chunk-size', '1'])
+        complete = output.read_bytes()
+        # Simule un arrêt après le premier bloc : point de reprise du bloc 1,
+        # puis un enregistrement complet et un autre partiel du bloc suivant
+        first = complete.split(b'\n')[0] + b'\n'
+        checkpoint.write_text(f"4 2 {len(first)}\n")
+        output.write_bytes(first + complete.split(b'\n')[1] + b'\n{"line": 3, "off')
+        main([str(source), '-o', str(output), '--checkpoint', str(checkpoint), '--chunk-size', '1'])
+        assert output.read_bytes() == complete
+
+    def test_offset_with_first_line(self, tmp_path):
+        """
+        Test de --offset avec --first-line.
+
+        Vérifie la numérotation des lignes reprises
+        """
+        source = tmp_path / 'input.txt'
+        output = tmp_path / 'out.ndjson'
+        source.write_bytes(b"1+1\n2+2\n3+3\n")
+        main([str(source), '-o', str(output), '--offset', '8', '--first-line', '3'])
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [(r['line'], r['offset'], r['result']) for r in records] == [(3, 8, 6.0)]
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_stream.py
+    pytest.main([__file__, "-v"])
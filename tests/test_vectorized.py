@@ -0,0 +1,95 @@
+"""
+Tests unitaires pour le module vectorized.py
+
+Ce fichier vérifie que le moteur en colonnes produit, ligne par ligne, les
+mêmes résultats et les mêmes erreurs que calculate().
+
+Fonctions testées:
+    - evaluate_vectorized(expressions): Analyse et évaluation en colonnes
+    - evaluate_columns(left, ops, right): Évaluation de colonnes déjà analysées
+"""
+
+import math
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour pouvoir importer app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+np = pytest.importorskip("numpy")
+
+from app import calculate, OP_CODES
+from vectorized import evaluate_vectorized, evaluate_columns
+
+
+EXPRESSIONS = [
+    "5+3", "10-4", "2*3", "10/3", "-5+10", "5 + 3", "1.5*2.5",
+    "5/0", "0/0", "0*-1", "", "5+3-2", "+5", "abc+5", "5+",
+    "-8*0.5", "10*400", "inf-inf", "1e3/7", "-2*3",
+    ".2*2", "31*20", "400*.40092",
+]
+
+
+def _scalar(expr):
+    """Résultat de référence (valeur, type d'exception, message) via calculate()."""
+    try:
+        return calculate(expr), None, None
+    except Exception as e:
+        return None, type(e), str(e)
+
+
+class TestEvaluateVectorized:
+    """
+    Tests de conformité du moteur en colonnes avec calculate()
+    """
+
+    def test_matches_scalar_path(self):
+        """
+        Test de conformité ligne par ligne.
+
+        Vérifie que valeurs, types d'exception et messages sont identiques
+        """
+        result = evaluate_vectorized(EXPRESSIONS)
+        for i, expr in enumerate(EXPRESSIONS):
+            expected, exc_type, message = _scalar(expr)
+            if exc_type is not None:
+                assert not result.ok[i], f"Expected error for {expr!r}"
+                assert type(result.errors[i]) is exc_type
+                assert str(result.errors[i]) == message
+            else:
+                assert result.ok[i], f"Unexpected error for {expr!r}: {result.errors[i]}"
+                value = result.objects.get(i, result.values[i])
+                if isinstance(expected, float) and math.isnan(expected):
+                    assert math.isnan(value)
+                else:
+                    assert value == expected, f"{expr!r}: expected {expected}, got {value}"
+
+    def test_to_list_matches_evaluate_batch_format(self):
+        """
+        Test de la conversion en liste.
+
+        Vérifie le format (résultat, erreur) par ligne
+        """
+        rows = evaluate_vectorized(["5+3", "5+3-2"]).to_list()
+        assert rows == [(8.0, None), (None, "only one operator is allowed")]
+
+    def test_evaluate_columns_directly(self):
+        """
+        Test de l'évaluation de colonnes construites à la main.
+
+        Vérifie que les opérations sont regroupées correctement par code
+        """
+        left = np.array([2.0, 9.0, 1.0])
+        ops = np.array([OP_CODES['*'], OP_CODES['-'], OP_CODES['/']], dtype=np.int8)
+        right = np.array([10.0, 4.0, 0.0])
+        result = evaluate_columns(left, ops, right)
+        assert result.values[0] == 1024.0
+        assert result.values[1] == 5.0
+        assert not result.ok[2]
+        assert isinstance(result.errors[2], ZeroDivisionError)
+
+
+if __name__ == "__main__":
+    # Permet d'exécuter les tests directement avec: python test_vectorized.py
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,161 @@
+"""
+Module vectorized - Moteur d'évaluation en colonnes basé sur NumPy
+
+Ce module évalue de grands lots d'expressions "nombre opérateur nombre" en
+les représentant en colonnes : un tableau d'opérandes gauches, un tableau de
+codes d'opérateurs (voir OP_CODES dans app.py) et un tableau d'opérandes
+droits. L'analyse de chaque expression est faite une seule fois, puis chaque
+opération est appliquée par groupe d'opérateur avec une ufunc NumPy.
+
+Les résultats sont identiques à ceux de calculate() : les lignes dont le
+résultat ne peut pas être obtenu directement par NumPy (division par zéro,
+dépassement de capacité, etc.) sont réévaluées avec les fonctions scalaires
+de operators.py afin de reproduire exactement la valeur ou l'exception du
+chemin scalaire. La puissance ('*') est toujours calculée ainsi : np.power
+n'est pas identique bit à bit à float.__pow__ (ex: 0.2 ** 2 diffère d'un
+ULP).
+
+Dépendance:
+    numpy (optionnelle pour le reste de l'application)
+"""
+
+import numpy as np
+
+from app import OPS, OP_CODES, OP_SYMBOLS
+from expressions import ExpressionArray
+
+# Ufuncs NumPy équivalentes aux fonctions de operators.py, indexées par code
+# (sans la puissance, évaluée ligne par ligne avec operators.multiply)
+_UFUNCS = {
+    OP_CODES['+']: np.add,
+    OP_CODES['-']: np.subtract,
+    OP_CODES['/']: np.true_divide,
+}
+
+
+class VectorResult:
+    """
+    Résultat de l'évaluation d'un lot en colonnes.
+
+    Attributs:
+        values (ndarray): Résultats en float64 (NaN pour les lignes en erreur)
+        ok (ndarray): Masque booléen des lignes évaluées sans erreur
+        errors (list): Exception levée pour chaque ligne (None si ok)
+        objects (dict): Résultats non représentables en float64 (ex: nombre
+                        complexe issu d'une puissance), indexés par ligne
+    """
+
+    __slots__ = ('values', 'ok', 'errors', 'objects')
+
+    def __init__(self, values, ok, errors, objects):
+        self.values = values
+        self.ok = ok
+        self.errors = errors
+        self.objects = objects
+
+    def __len__(self):
+        return len(self.values)
+
+    def to_list(self):
+        """
+        Convertit le résultat en liste de tuples (résultat, erreur).
+
+        Sorties:
+            list: Même format que app.evaluate_batch(), erreurs en chaînes
+        """
+        rows = []
+        values = self.values.tolist()
+        for i, error in enumerate(self.errors):
+            if error is not None:
+                rows.append((None, str(error)))
+            else:
+                rows.append((self.objects.get(i, values[i]), None))
+        return rows
+
+
+def parse_columns(expressions):
+    """
+    Analyse un lot d'expressions en colonnes.
+
+    Entrées:
+        expressions (sequence): Les expressions à analyser
+
+    Sorties:
+        tuple: (left, ops, right, errors) où left et right sont des tableaux
+               float64, ops un tableau int8 de codes d'opérateurs (-1 pour
+               une ligne invalide) et errors la liste des exceptions
+               d'analyse (None pour une ligne valide)
+    """
+    # Analyse en colonnes compactes (array), exposées à NumPy sans copie
+    parsed = ExpressionArray.parse(expressions)
+    ops_view, left_view, right_view = parsed.memoryviews()
+    left = np.frombuffer(left_view, dtype=np.float64)
+    right = np.frombuffer(right_view, dtype=np.float64)
+    ops = np.frombuffer(ops_view, dtype=np.int8)
+    errors = [None] * len(parsed)
+    for i, error in parsed.errors.items():
+        errors[i] = error
+    return left, ops, right, errors
+
+
+def evaluate_columns(left, ops, right, errors=None):
+    """
+    Évalue des expressions déjà représentées en colonnes.
+
+    Entrées:
+        left (ndarray): Opérandes gauches (float64)
+        ops (ndarray): Codes d'opérateurs (int8, -1 pour une ligne invalide)
+        right (ndarray): Opérandes droits (float64)
+        errors (list): Erreurs d'analyse déjà connues, ou None
+
+    Sorties:
+        VectorResult: Les valeurs, le masque de succès et les erreurs par ligne
+    """
+    n = len(ops)
+    errors = list(errors) if errors is not None else [None] * n
+    ok = ops >= 0
+    values = np.full(n, np.nan, dtype=np.float64)
+    objects = {}
+
+    with np.errstate(all='ignore'):
+        for code, ufunc in _UFUNCS.items():
+            mask = ops == code
+            if mask.any():
+                values[mask] = ufunc(left[mask], right[mask])
+
+        # Lignes calculées par le chemin scalaire : toutes les puissances, et
+        # celles dont le résultat NumPy peut différer (résultat non fini,
+        # division par zéro)
+        suspect = ops == OP_CODES['*']
+        suspect |= (ops >= 0) & ~np.isfinite(values)
+        suspect |= (ops == OP_CODES['/']) & (right == 0)
+
+    for i in np.flatnonzero(suspect).tolist():
+        func = OPS[OP_SYMBOLS[ops[i]]]
+        try:
+            value = func(float(left[i]), float(right[i]))
+        except Exception as e:
+            errors[i] = e
+            ok[i] = False
+            values[i] = np.nan
+            continue
+        if isinstance(value, float):
+            values[i] = value
+        else:
+            objects[i] = value
+
+    return VectorResult(values, ok, errors, objects)
+
+
+def evaluate_vectorized(expressions):
+    """
+    Analyse puis évalue un lot d'expressions en colonnes.
+
+    Entrées:
+        expressions (sequence): Les expressions à évaluer
+
+    Sorties:
+        VectorResult: Résultats identiques à ceux de calculate() ligne par ligne
+    """
+    left, ops, right, errors = parse_columns(expressions)
+    return evaluate_columns(left, ops, right, errors)